@@ -0,0 +1,54 @@
+"""Time the parsing of a callback by each gateway adapter.
+
+    python -m benchmarks.gateways -n 100000
+"""
+
+import argparse
+import json
+import timeit
+
+from mobilex.gateways import FormGateway, JsonGateway, SoapGateway
+
+FORM = (
+    b"sessionId=ATU1&serviceCode=%2A384%2A1%23&phoneNumber=%2B254712345678&text=1%2A2"
+)
+JSON = json.dumps(
+    {
+        "sessionId": 101,
+        "serviceCode": "*384*1#",
+        "msisdn": "0712345678",
+        "ussdString": "1*2",
+        "extra": {"x": 1},
+    }
+).encode()
+SOAP = (
+    b'<?xml version="1.0"?><soapenv:Envelope><soapenv:Body><ns1:ussdRequest>'
+    b"<ns1:sessionId>S1</ns1:sessionId><ns1:serviceCode>*384*1#</ns1:serviceCode>"
+    b"<ns1:msisdn>254712345678</ns1:msisdn><ns1:ussdString>1*2</ns1:ussdString>"
+    b"</ns1:ussdRequest></soapenv:Body></soapenv:Envelope>"
+)
+
+GATEWAYS = [
+    (FormGateway(), FORM),
+    (JsonGateway(region="KE"), JSON),
+    (SoapGateway(), SOAP),
+]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--number", type=int, default=10_000)
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+    for gateway, body in GATEWAYS:
+        gateway.parse(body)
+        best = min(
+            timeit.repeat(
+                lambda: gateway.parse(body), number=args.number, repeat=args.repeat
+            )
+        )
+        print(f"{type(gateway).__name__:<12} {best / args.number * 1e6:8.2f}us")
+
+
+if __name__ == "__main__":
+    main()
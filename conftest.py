@@ -27,15 +27,20 @@ def fake_redis(request: pytest.FixtureRequest):
 def app_config(request: pytest.FixtureRequest):
     res, vars = {}, [
         "max_page_length",
+        "max_redirects",
         "session_class",
         "session_key_prefix",
         "session_backend",
         "session_manager",
         "session_ttl",
+        "session_ttl_policy",
         "history_class",
         "history_backend",
         "history_key_prefix",
         "history_ttl",
+        "cache_backend",
+        "cache_key_prefix",
+        "cache_ttl",
     ]
     for key in vars:
         try:
@@ -54,7 +59,7 @@ async def app(app_config: dict):
 
     yield app
 
-    for back in (app.session_backend, app.history_backend):
+    for back in (app.session_backend, app.history_backend, app.cache):
         for key in await back.keys():
             await back.delete(key)
 
@@ -2,6 +2,8 @@ import sys
 from dataclasses import dataclass, field
 from random import choice
 
+from mobilex.loaders import loader
+
 NL = "\r\n" if sys.platform == "win32" else "\n"
 
 
@@ -46,10 +48,20 @@ def all_products() -> list[Product]:
     return [*_products.values()]
 
 
+def list_products(offset: int = 0, limit: int = None) -> list[Product]:
+    stop = None if limit is None else offset + limit
+    return [*_products.values()][offset:stop]
+
+
 def get_product(id: int) -> Product | None:
     return _products.get(id)
 
 
+@loader(ttl=60)
+async def load_products(ids: list[int]) -> list[Product | None]:
+    return [*map(_products.get, ids)]
+
+
 @dataclass(frozen=True)
 class CartItem:
     product_id: int
@@ -2,9 +2,9 @@ import typing as t
 
 from mobilex import App, Request
 from mobilex.responses import redirect
-from mobilex.screens import Action, Screen
+from mobilex.screens import Action, ListScreen, Screen
 
-from .models import Cart, CartItem, Product, all_products, get_product
+from .models import Cart, CartItem, Product, list_products, load_products
 
 app = App(f"shopping_cart")
 
@@ -27,20 +27,17 @@ class HomeScreen(Screen):
 
 
 @app.screen("catalog")
-class CatalogScreen(Screen):
-    def get_actions(self):
-        if not (menu := self.state.get("product_menu")):
-            products = all_products()
-            menu = [
-                Action(
-                    f"{item.name:<10}- {item.price:.2f}/Kg",
-                    screen="product",
-                    kwargs={"product_id": item.id},
-                )
-                for item in products
-            ]
-            self.state.product_menu = menu
-        return menu
+class CatalogScreen(ListScreen[Product]):
+    async def fetch(self, offset: int, limit: int):
+        return list_products(offset, limit)
+
+    def get_item_action(self, item: Product, key: int):
+        return Action(
+            f"{item.name:<10}- {item.price:.2f}/Kg",
+            screen="product",
+            kwargs={"product_id": item.id},
+            key=key,
+        )
 
     async def render(self):
         self.print(f"Select a product.")
@@ -53,15 +50,14 @@ class ProductScreen(Screen):
         *Screen.nav_actions,
     ]
 
-    @property
-    def product(self):
-        return get_product(self.state.product_id)
+    def get_product(self):
+        return self.loader(load_products).load(self.state.product_id)
 
     def add_to_cart(self, *a):
-        return redirect("add_to_cart", product_id=self.product.id)
+        return redirect("add_to_cart", product_id=self.state.product_id)
 
     async def render(self):
-        product = self.product
+        product = await self.get_product()
         self.print(f"#{product.id} {product.name}")
         self.print(f"Price per Kg: {product.price:.2f}/=")
         self.print(f"Details:")
@@ -72,22 +68,21 @@ class ProductScreen(Screen):
 
 @app.screen("add_to_cart")
 class AddToCartScreen(Screen):
-    @property
-    def product(self):
-        return get_product(self.state.product_id)
+    def get_product(self):
+        return self.loader(load_products).load(self.state.product_id)
 
     async def handle(self, qty: str):
         qty = round(float(qty.lower().replace("kg", "").strip()), 3)
         if qty >= 0.001:
-            cart = self.session["cart"]
-            cart[self.product.id] = qty
+            cart, product = self.session["cart"], await self.get_product()
+            cart[product.id] = qty
             # await self.request.history.pop()
-            return redirect("cart", added=self.product.id)
+            return redirect("cart", added=product.id)
         self.print("Invalid value!")
         self.print("Must be between 0.001 and 1000")
 
     async def render(self):
-        product = self.product
+        product = await self.get_product()
         self.print(f"How much {product.name} in Kgs do what.")
         self.print(f"Eg. 0.5 for 0.5Kg, 3 for 3Kg.")
         self.print(f"Price per Kg: {product.price:.2f}/=")
@@ -102,9 +97,10 @@ class CartScreen(Screen):
         Action("Remove items", screen="catalog"),
     ]
 
-    def get_cart_products(self):
+    async def get_cart_products(self):
         cart = self.session["cart"]
-        return {get_product(id): qty for id, qty in cart.items()}
+        products = await self.loader(load_products).load_many(cart)
+        return dict(zip(products, cart.values()))
 
     # async def handle(self, inpt: str):
     #     inpt = round(float(inpt.lower().replace("kg", "").strip()), 3)
@@ -113,7 +109,7 @@ class CartScreen(Screen):
     #     self.print("Invalid value!")
 
     async def render(self):
-        cart = self.get_cart_products()
+        cart = await self.get_cart_products()
         total = sum(prod.price * qty for prod, qty in cart.items())
         self.print("Your shopping cart")
         self.print(f"{len(cart)} items. Total price: {total:.2f} /=")
@@ -133,9 +129,10 @@ class CheckoutScreen(Screen):
         Action("Remove items", screen="catalog"),
     ]
 
-    def get_cart_products(self):
+    async def get_cart_products(self):
         cart = self.session["cart"]
-        return {get_product(id): qty for id, qty in cart.items()}
+        products = await self.loader(load_products).load_many(cart)
+        return dict(zip(products, cart.values()))
 
     async def handle(self, inpt: str):
         inpt = round(float(inpt.lower().replace("kg", "").strip()), 3)
@@ -144,7 +141,7 @@ class CheckoutScreen(Screen):
         self.print("Invalid value!")
 
     async def render(self):
-        cart = self.get_cart_products()
+        cart = await self.get_cart_products()
         total = sum(prod.price * qty for prod, qty in cart.items())
         self.print("Your shopping cart")
         self.print(f"{len(cart)} items. Total price: {total:.2f} /=")
@@ -1,7 +1,11 @@
-from .core import App, AppConfig, ConfigDict, Request
-from .responses import RedirectBackResponse, RedirectResponse, Response
-from .router import Router
-from .screens import CON, END, Action, ActionSet, Screen
+import typing as t
+from importlib import import_module
+
+if t.TYPE_CHECKING:
+    from .core import App, AppConfig, ConfigDict, Request
+    from .responses import RedirectBackResponse, RedirectResponse, Response
+    from .router import Router
+    from .screens import CON, END, Action, ActionSet, Screen
 
 __all__ = [
     "App",
@@ -18,3 +22,30 @@ __all__ = [
     "ActionSet",
     "Screen",
 ]
+
+_exports = {
+    "App": ".core",
+    "AppConfig": ".core",
+    "ConfigDict": ".core",
+    "Request": ".core",
+    "Response": ".responses",
+    "RedirectBackResponse": ".responses",
+    "RedirectResponse": ".responses",
+    "Router": ".router",
+    "CON": ".screens",
+    "END": ".screens",
+    "Action": ".screens",
+    "ActionSet": ".screens",
+    "Screen": ".screens",
+}
+
+
+def __getattr__(name: str):
+    if mod := _exports.get(name):
+        rv = globals()[name] = getattr(import_module(mod, __name__), name)
+        return rv
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return [*globals(), *__all__]
@@ -0,0 +1,37 @@
+import typing as t
+from functools import cache
+
+from mobilex.utils import import_string
+
+if t.TYPE_CHECKING:
+    from .base import BaseCache
+
+ENTRY_POINT_GROUP = "mobilex.cache"
+
+BACKENDS = {
+    "dict": "mobilex.cache.dict:DictCache",
+    "redis": "mobilex.cache.redis:RedisCache",
+    "resilient": "mobilex.cache.resilient:ResilientCache",
+    "shm": "mobilex.cache.shm:SharedMemoryCache",
+    "sqlite": "mobilex.cache.sqlite:SQLiteCache",
+}
+
+
+@cache
+def _load_backend(name: str) -> type["BaseCache"]:
+    if path := BACKENDS.get(name):
+        return import_string(path)
+    elif "." in name or ":" in name:
+        return import_string(name)
+
+    from importlib.metadata import entry_points
+
+    if ep := entry_points(group=ENTRY_POINT_GROUP, name=name):
+        return next(iter(ep)).load()
+    raise LookupError(f"unknown cache backend {name!r}")
+
+
+def get_backend(backend: type["BaseCache"] | str) -> type["BaseCache"]:
+    """Resolve a cache backend class from an alias (e.g. `"redis"`), an
+    installed `mobilex.cache` entry point or an import path."""
+    return _load_backend(backend) if isinstance(backend, str) else backend
@@ -60,6 +60,10 @@ class BaseCache:
     def loads(self, obj):  # pragma: no cover
         return self.serializer.loads(obj)
 
+    async def ping(self) -> bool:
+        """Check that the backend is reachable."""
+        return True
+
     async def add(self, key, value):
         """
         Set a value in the cache if the key does not already exist. If
@@ -77,6 +81,39 @@ class BaseCache:
             "subclasses of BaseCache must provide a keys() method"
         )
 
+    async def scan(self, pattern="*", *, count: int = 1000):
+        """
+        Iterate over the keys matching `pattern`, as returned by `keys()`, in
+        batches of up to `count` keys.
+        """
+        keys = await self.keys(pattern)
+        for i in range(0, len(keys), count):
+            yield keys[i : i + count]
+
+    async def get_raw_many(
+        self, keys: abc.Iterable[bytes]
+    ) -> list[tuple[bytes | None, float | None]]:
+        """
+        Fetch the serialized values of several keys, as returned by `keys()`,
+        along with their remaining ttl in seconds. Missing keys give
+        `(None, None)` and keys without an expiry a ttl of `None`.
+        """
+        raise NotImplementedError(
+            "subclasses of BaseCache must provide a get_raw_many() method"
+        )
+
+    async def set_raw_many(
+        self, items: abc.Iterable[tuple[bytes, bytes, float | None]]
+    ) -> int:
+        """
+        Store several `(key, serialized value, ttl)` items as is. Keys are
+        not prefixed and a ttl of `None` uses the default cache timeout.
+        Return the number of items stored.
+        """
+        raise NotImplementedError(
+            "subclasses of BaseCache must provide a set_raw_many() method"
+        )
+
     async def get(self, key):
         """
         Fetch a given key from the cache. If the key does not exist, return
@@ -84,13 +121,29 @@ class BaseCache:
         """
         raise NotImplementedError("subclasses of BaseCache must provide a get() method")
 
-    async def set(self, key, value):
+    async def set(self, key, value, ttl: Timeout = None):
         """
         Set a value in the cache. If timeout is given, use that timeout for the
         key; otherwise use the default cache timeout.
         """
         raise NotImplementedError("subclasses of BaseCache must provide a set() method")
 
+    async def touch(self, key, ttl: Timeout = None) -> bool:
+        """
+        Reset the timeout of `key` to `ttl` (or the default cache timeout)
+        without rewriting its value. Return True if the key exists.
+        """
+        return not not await self.expire_many((key,), ttl)
+
+    async def expire_many(self, keys: abc.Iterable, ttl: Timeout = None) -> int:
+        """
+        Reset the timeout of several keys at once. Return the number of keys
+        that exist.
+        """
+        raise NotImplementedError(
+            "subclasses of BaseCache must provide an expire_many() method"
+        )
+
     async def delete(self, key):
         """
         Delete a key from the cache, failing silently.
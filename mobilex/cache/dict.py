@@ -1,63 +1,222 @@
-import asyncio
 import re
+import time
 import typing as t
-from datetime import timedelta
+from bisect import bisect_left
+from collections import Counter, OrderedDict
+from copy import deepcopy
+from heapq import heapify, heappop, heappush, merge
+from itertools import groupby
 
-try:
-    from cachetools import TTLCache
-except ImportError:  # pragma: no cover
-    raise ImportError(
-        f"{__name__!r} requires 'cachetools' installed. `pip install cachetools`"
-    )
+from mobilex.utils import to_timedelta
 
-from .base import BaseCache
+from .base import BaseCache, Timeout
 
 if t.TYPE_CHECKING:
     from mobilex import App
 
 
+class _Entry:
+    __slots__ = "value", "expires_at", "size"
+
+    def __init__(self, value, expires_at: float, size: int):
+        self.value, self.expires_at, self.size = value, expires_at, size
+
+
 class DictCache(BaseCache):
-    store: TTLCache
+    """An in-process cache.
+
+    Entries are evicted in least-recently-used order once either `max_entries`
+    or `max_bytes` is exceeded, and expire through a heap ordered by expiry
+    time. With `serialize=False` values are stored by reference and, unless
+    `copy=False`, deep-copied on `get()` so callers cannot mutate the stored
+    object in place. Their size is then that of their serialized form, which
+    is only computed when `max_bytes` is set.
+    """
 
-    def __init__(self, app: "App", location=None, **options):
+    store: OrderedDict[bytes, _Entry]
+    stats: Counter[str]
+    nbytes: int
+
+    def __init__(
+        self,
+        app: "App",
+        location=None,
+        *,
+        max_entries: int = 65536,
+        max_bytes: int = None,
+        serialize: bool = True,
+        copy: bool = True,
+        **options,
+    ):
         super().__init__(app, **options)
-        self.store = TTLCache(1024, self.ttl.total_seconds())
+        self.max_entries, self.max_bytes = max_entries, max_bytes
+        self.serialize, self.copy = serialize, copy
+        self.store, self.stats, self.nbytes = OrderedDict(), Counter(), 0
+        self._heap: list[tuple[float, bytes]] = []
+        self._sorted: list[bytes] | None = None
+        self._new_keys: list[bytes] = []
+
+    def _encode(self, value) -> tuple[t.Any, int]:
+        if self.serialize:
+            return (rv := self.dumps(value)), len(rv)
+        return value, len(self.dumps(value)) if self.max_bytes else 0
+
+    def _decode(self, value):
+        if self.serialize:
+            return self.loads(value)
+        return deepcopy(value) if self.copy else value
+
+    def _get_entry(self, key: bytes, now: float) -> _Entry | None:
+        if (e := self.store.get(key)) is not None and e.expires_at <= now:
+            self._remove(key)
+            self.stats["expirations"] += 1
+            e = None
+        return e
+
+    def _remove(self, key: bytes) -> _Entry | None:
+        # Removed keys are left in the sorted index and skipped by `keys()`.
+        if (e := self.store.pop(key, None)) is not None:
+            self.nbytes -= e.size
+        return e
+
+    def _expire(self, now: float):
+        heap, store = self._heap, self.store
+        while heap and heap[0][0] <= now:
+            exp, key = heappop(heap)
+            if (e := store.get(key)) is not None and e.expires_at == exp:
+                self._remove(key)
+                self.stats["expirations"] += 1
+        if len(heap) > 2 * len(store) + 64:
+            heap[:] = [(e.expires_at, k) for k, e in store.items()]
+            heapify(heap)
+
+    def _evict(self):
+        store, mx, mb = self.store, self.max_entries, self.max_bytes
+        while store and ((mx and len(store) > mx) or (mb and self.nbytes > mb)):
+            self._remove(next(iter(store)))
+            self.stats["evictions"] += 1
+
+    def _ttl(self, ttl: Timeout = None) -> float:
+        return (self.ttl if ttl is None else to_timedelta(ttl)).total_seconds()
 
     async def get(self, key) -> t.Any:
         """
         Fetch a given key from the cache. If the key does not exist, return
         default, which itself defaults to None.
         """
-        if (rv := self.store.get(self.make_key(key))) is not None:
-            rv = self.loads(rv)
-        return rv
+        key = self.make_key(key)
+        if (e := self._get_entry(key, time.monotonic())) is None:
+            self.stats["misses"] += 1
+            return None
+        self.store.move_to_end(key)
+        self.stats["hits"] += 1
+        return self._decode(e.value)
 
-    async def set(self, key, value) -> bool:
+    async def set(self, key, value, ttl: Timeout = None) -> bool:
         """
         Set a value in the cache. If timeout is given, use that timeout for the
         key; otherwise use the default cache timeout.
         """
-        self.store[self.make_key(key)] = self.dumps(value)
+        self._expire(now := time.monotonic())
+        self._put(self.make_key(key), *self._encode(value), now + self._ttl(ttl))
+        self._evict()
         return True
 
+    def _put(self, key: bytes, value, size: int, exp: float):
+        if (old := self.store.pop(key, None)) is not None:
+            self.nbytes -= old.size
+        elif self._sorted is not None:
+            self._new_keys.append(key)
+        self.store[key] = _Entry(value, exp, size)
+        self.nbytes += size
+        heappush(self._heap, (exp, key))
+
+    async def add(self, key, value, ttl: Timeout = None) -> bool:
+        if self._get_entry(self.make_key(key), time.monotonic()) is None:
+            return await self.set(key, value, ttl)
+        return False
+
+    async def get_raw_many(self, keys) -> list[tuple[bytes | None, float | None]]:
+        """
+        Fetch the serialized values of several keys along with their
+        remaining ttl.
+        """
+        rv, now = [], time.monotonic()
+        for key in keys:
+            if (e := self._get_entry(key, now)) is None:
+                rv.append((None, None))
+            else:
+                val = e.value if self.serialize else self.dumps(e.value)
+                rv.append((val, e.expires_at - now))
+        return rv
+
+    async def set_raw_many(self, items) -> int:
+        """
+        Store several serialized values as is.
+        """
+        self._expire(now := time.monotonic())
+        rv = 0
+        for key, value, ttl in items:
+            size = len(value)
+            self.serialize or (value := self.loads(value))
+            self._put(key, value, size, now + self._ttl(ttl))
+            rv += 1
+        self._evict()
+        return rv
+
+    async def expire_many(self, keys, ttl: Timeout = None) -> int:
+        """
+        Reset the timeout of several keys at once. Return the number of keys
+        that exist.
+        """
+        now, rv = time.monotonic(), 0
+        exp = now + self._ttl(ttl)
+        for key in map(self.make_key, keys):
+            if (e := self._get_entry(key, now)) is not None:
+                e.expires_at, rv = exp, rv + 1
+                heappush(self._heap, (exp, key))
+        return rv
+
     async def delete(self, key) -> int:
         """
         Delete a key from the cache, failing silently.
         """
-        return +(not self.store.pop(self.make_key(key), None) is None)
+        return +(self._remove(self.make_key(key)) is not None)
 
-    async def keys(self, key="*"):
+    async def keys(self, pattern="*") -> list[bytes]:
         """
-        Delete a key from the cache, failing silently.
+        Return the keys matching the glob-style `pattern`.
         """
-        key = b".*".join(re.escape(p) for p in self.make_key(key).split(b"*") if p)
-        p_re = key and re.compile(key)
-        return [k for k in self.store.keys() if not p_re or p_re.search(k)]
+        self._expire(now := time.monotonic())
+        pattern = self.make_key(pattern)
+        prefix, *rest = pattern.split(b"*", 1)
+        if not rest:
+            return [pattern] if self._get_entry(pattern, now) else []
+        index, new = self._sorted, self._new_keys
+        if index is None or len(index) + len(new) > 2 * len(self.store) + 64:
+            index = self._sorted = sorted(self.store)
+            new.clear()
+        elif new:
+            new.sort()
+            index = self._sorted = [k for k, _ in groupby(merge(index, new))]
+            new.clear()
+
+        p_re = rest and re.compile(b".*".join(map(re.escape, pattern.split(b"*"))))
+        rv, store = [], self.store
+        for i in range(bisect_left(index, prefix), len(index)):
+            if not (k := index[i]).startswith(prefix):
+                break
+            elif (e := store.get(k)) is not None and e.expires_at > now:
+                (not p_re or p_re.fullmatch(k)) and rv.append(k)
+        return rv
 
-    # async def clear(self):
-    #     """Remove *all* values from the cache at once."""
-    #     self.store.clear()
+    async def clear(self):
+        """Remove *all* values from the cache at once."""
+        self.store.clear()
+        self._heap.clear()
+        self._sorted, self.nbytes = None, 0
+        self._new_keys.clear()
 
-    # async def close(self, **kwargs):
-    #     """Close the cache connection"""
-    #     self.clear()
+    async def close(self, **kwargs):
+        """Close the cache connection"""
+        await self.clear()
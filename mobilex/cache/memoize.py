@@ -0,0 +1,158 @@
+import asyncio
+import time
+import typing as t
+from collections import OrderedDict, abc
+from datetime import timedelta
+from functools import update_wrapper
+from hashlib import md5
+from inspect import isawaitable
+from logging import getLogger
+
+from mobilex.utils import to_timedelta
+
+from ..screens import Screen
+
+if t.TYPE_CHECKING:
+    from .base import BaseCache
+
+logger = getLogger(__name__)
+
+_T = t.TypeVar("_T")
+
+
+class MemoEntry(t.NamedTuple):
+    value: t.Any
+    stale_at: float
+    expires_at: float
+
+
+class Memoized(t.Generic[_T]):
+    """An async callable caching the results of `func` by its arguments.
+
+    Results are kept in an in-process LRU and, when available, in a
+    `BaseCache` backend shared with other workers. An entry older than
+    `stale_ttl` is still served but refreshed in the background. Concurrent
+    calls for a key that is being computed wait for the same computation.
+    """
+
+    func: abc.Callable[..., _T | abc.Awaitable[_T]]
+    backend: t.Optional["BaseCache"]
+
+    def __init__(
+        self,
+        func: abc.Callable[..., _T | abc.Awaitable[_T]],
+        *,
+        ttl: float | timedelta = 300,
+        stale_ttl: float | timedelta = None,
+        maxsize: int = 128,
+        backend: "BaseCache" = None,
+    ):
+        self.func, self.backend, self.maxsize = func, backend, maxsize
+        self.ttl = to_timedelta(ttl).total_seconds()
+        self.stale_ttl = to_timedelta(stale_ttl or ttl).total_seconds()
+        self.name = f"{func.__module__}.{func.__qualname__}"
+        self._local, self._inflight, self._tasks = OrderedDict(), {}, set()
+        update_wrapper(self, func)
+
+    def __get__(self, obj, typ=None):
+        return self if obj is None else _BoundMemoized(self, obj)
+
+    def make_key(self, args: tuple, kwargs: dict) -> str:
+        return md5(
+            f"{self.name}:{args!r}:{sorted(kwargs.items())!r}".encode()
+        ).hexdigest()
+
+    def get_backend(self, args: tuple) -> t.Optional["BaseCache"]:
+        if (rv := self.backend) is None and args and isinstance(args[0], Screen):
+            rv = args[0].app.cache
+        return rv
+
+    def cache_clear(self):
+        self._local.clear()
+
+    async def __call__(self, *args, **kwargs) -> _T:
+        bound = args[1:] if args and isinstance(args[0], Screen) else args
+        key, now = self.make_key(bound, kwargs), time.time()
+        if (entry := self._local.get(key)) is None or entry.expires_at <= now:
+            if backend := self.get_backend(args):
+                if (entry := await backend.get(key)) is not None:
+                    self._set_local(key, entry)
+
+        if entry is None or entry.expires_at <= now:
+            return await self._single_flight(key, args, kwargs)
+
+        self._local.move_to_end(key)
+        if entry.stale_at <= now and key not in self._inflight:
+            task = asyncio.ensure_future(self._single_flight(key, args, kwargs))
+            self._tasks.add(task)
+            task.add_done_callback(self._refreshed)
+        return entry.value
+
+    def _refreshed(self, task: asyncio.Task):
+        self._tasks.discard(task)
+        if not task.cancelled() and (e := task.exception()):
+            logger.warning(f"refreshing {self.name!r} failed: {e!r}")
+
+    def _single_flight(self, key: str, args: tuple, kwargs: dict):
+        if (fut := self._inflight.get(key)) is None:
+            fut = self._inflight[key] = asyncio.ensure_future(
+                self._compute(key, args, kwargs)
+            )
+            fut.add_done_callback(lambda f: self._inflight.pop(key, None))
+        return asyncio.shield(fut)
+
+    async def _compute(self, key: str, args: tuple, kwargs: dict):
+        if isawaitable(rv := self.func(*args, **kwargs)):
+            rv = await rv
+        now = time.time()
+        entry = MemoEntry(rv, now + self.stale_ttl, now + self.ttl)
+        self._set_local(key, entry)
+        if backend := self.get_backend(args):
+            await backend.set(key, entry)
+        return rv
+
+    def _set_local(self, key: str, entry: MemoEntry):
+        local = self._local
+        local[key] = entry
+        local.move_to_end(key)
+        while len(local) > self.maxsize:
+            local.popitem(last=False)
+
+
+class _BoundMemoized:
+    __slots__ = "__func__", "__self__"
+
+    def __init__(self, func: Memoized, obj):
+        self.__func__, self.__self__ = func, obj
+
+    def __call__(self, *args, **kwargs):
+        return self.__func__(self.__self__, *args, **kwargs)
+
+
+@t.overload
+def memoize(func: abc.Callable[..., _T], /) -> Memoized[_T]:
+    ...
+
+
+@t.overload
+def memoize(
+    *,
+    ttl: float | timedelta = 300,
+    stale_ttl: float | timedelta = None,
+    maxsize: int = 128,
+    backend: "BaseCache" = None,
+) -> abc.Callable[[abc.Callable[..., _T]], Memoized[_T]]:
+    ...
+
+
+def memoize(func=None, /, **options):
+    """Cache the results of a function across requests.
+
+    When decorating `Screen` methods, the screen instance is left out of the
+    cache key and `App.cache` is used as the shared backend.
+    """
+
+    def decorator(fn):
+        return Memoized(fn, **options)
+
+    return decorator if func is None else decorator(func)
@@ -0,0 +1,235 @@
+"""Copy live entries, e.g. sessions, from one cache backend to another.
+
+Keys are scanned from the source in batches, decoded with the source's
+serializer, re-encoded with the target's and written to the target in
+batches, keeping their remaining ttl. Use it to move sessions to another
+Redis cluster without dropping them:
+
+    python -m mobilex.cache.migrate \\
+        --source redis --source-location redis://old --source-prefix myapp \\
+        --target redis --target-location redis://new --target-prefix myapp \\
+        --rate 20000
+
+Sessions are pickled `Session` objects, so they must keep a serializer that
+handles them. A serializer such as `json` only suits plain values, anything
+else is counted as failed.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+import typing as t
+from collections import abc
+from contextlib import suppress
+from importlib import import_module
+
+from mobilex.ratelimit import TokenBucket
+from mobilex.utils import import_string
+
+from . import get_backend
+from .base import BaseCache
+
+logger = logging.getLogger(__name__)
+
+
+class MigrationStats:
+    """Counts of the keys seen by a `Migration`."""
+
+    __slots__ = ("scanned", "copied", "skipped", "failed", "started_at")
+
+    def __init__(self):
+        self.scanned = self.copied = self.skipped = self.failed = 0
+        self.started_at = time.monotonic()
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    @property
+    def rate(self) -> float:
+        """Scanned keys per second."""
+        return self.scanned / (self.elapsed or 1e-9)
+
+    def __str__(self):
+        return (
+            f"scanned {self.scanned}, copied {self.copied}, "
+            f"skipped {self.skipped}, failed {self.failed} "
+            f"in {self.elapsed:.1f}s ({self.rate:.0f} keys/s)"
+        )
+
+
+class Migration:
+    """Copies the keys matching `pattern` from `source` to `target`.
+
+    Keys are read and written `batch_size` at a time, with the write of a
+    batch overlapping the read of the next. `rate` caps the number of keys
+    per second. `progress` is called with the stats every
+    `progress_interval` seconds and once at the end. Keys that expired
+    before they were read are skipped, and values that cannot be converted
+    are logged and counted as failed. With `dry_run`, nothing is written.
+    """
+
+    source: BaseCache
+    target: BaseCache
+    stats: MigrationStats
+
+    def __init__(
+        self,
+        source: BaseCache,
+        target: BaseCache,
+        *,
+        pattern: str = "*",
+        batch_size: int = 1000,
+        rate: float = None,
+        progress: abc.Callable[[MigrationStats], t.Any] = None,
+        progress_interval: float = 1.0,
+        dry_run: bool = False,
+    ):
+        self.source, self.target, self.pattern = source, target, pattern
+        self.batch_size, self.dry_run = batch_size, dry_run
+        self.progress, self.progress_interval = progress, progress_interval
+        self._bucket = rate and TokenBucket(rate, max(rate, batch_size))
+        self._src_prefix = source.make_key(b"")
+        self._dst_prefix = target.make_key(b"")
+        self._reencode = source.serializer is not target.serializer
+
+    def convert_key(self, key: bytes) -> bytes:
+        if key.startswith(prefix := self._src_prefix):
+            key = self._dst_prefix + key[len(prefix) :]
+        return key
+
+    def convert_value(self, value: bytes) -> bytes:
+        return self.target.dumps(self.source.loads(value)) if self._reencode else value
+
+    async def _read(self, keys: list[bytes]):
+        items, stats = [], self.stats
+        for key, (value, ttl) in zip(keys, await self.source.get_raw_many(keys)):
+            if value is None or (ttl is not None and ttl <= 0):
+                stats.skipped += 1
+                continue
+            try:
+                items.append((self.convert_key(key), self.convert_value(value), ttl))
+            except Exception as e:
+                stats.failed += 1
+                logger.warning(f"cannot convert {key!r}: {e!r}")
+        return items
+
+    async def _write(self, items: list[tuple[bytes, bytes, float | None]]):
+        n = len(items) if self.dry_run else await self.target.set_raw_many(items)
+        self.stats.copied += n
+        self.stats.failed += len(items) - n
+
+    async def run(self) -> MigrationStats:
+        self.stats = stats = MigrationStats()
+        writing, reported_at = None, stats.started_at
+        try:
+            async for keys in self.source.scan(self.pattern, count=self.batch_size):
+                self._bucket and await self._bucket.acquire(len(keys))
+                stats.scanned += len(keys)
+                items = await self._read(keys)
+                writing and await writing
+                writing = asyncio.ensure_future(self._write(items))
+                if self.progress and (
+                    time.monotonic() - reported_at >= self.progress_interval
+                ):
+                    reported_at = time.monotonic()
+                    self.progress(stats)
+            writing and await writing
+        finally:
+            writing and not writing.done() and writing.cancel()
+        self.progress and self.progress(stats)
+        return stats
+
+
+async def migrate(source: BaseCache, target: BaseCache, **options) -> MigrationStats:
+    """Copy the keys matching `pattern` from `source` to `target`. See
+    `Migration` for the options."""
+    return await Migration(source, target, **options).run()
+
+
+def _option(s: str) -> tuple[str, t.Any]:
+    key, sep, val = s.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"expected KEY=VALUE, got {s!r}")
+    with suppress(ValueError):
+        val = json.loads(val)
+    return key, val
+
+
+def _make_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m mobilex.cache.migrate",
+        description="Copy entries between mobilex cache backends.",
+    )
+    for side in ("source", "target"):
+        parser.add_argument(
+            f"--{side}", default="redis", help="backend alias or import path"
+        )
+        parser.add_argument(f"--{side}-location", help="e.g. a Redis URL")
+        parser.add_argument(f"--{side}-prefix", help="key prefix, e.g. the app's name")
+        parser.add_argument(
+            f"--{side}-serializer",
+            default="pickle",
+            help="serializer module or import path, e.g. pickle or json",
+        )
+        parser.add_argument(
+            f"--{side}-option",
+            type=_option,
+            action="append",
+            default=[],
+            metavar="KEY=VALUE",
+            help="extra backend option, VALUE is parsed as JSON if possible",
+        )
+    parser.add_argument("--pattern", default="*", help="glob pattern of the keys")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--rate", type=float, help="maximum keys per second")
+    parser.add_argument("--progress-interval", type=float, default=1.0)
+    parser.add_argument("--dry-run", action="store_true")
+    return parser
+
+
+def _make_backend(args, side: str) -> BaseCache:
+    ser = getattr(args, f"{side}_serializer")
+    return get_backend(getattr(args, side))(
+        None,
+        getattr(args, f"{side}_location"),
+        key_prefix=getattr(args, f"{side}_prefix"),
+        serializer=import_string(ser) if ":" in ser else import_module(ser),
+        **dict(getattr(args, f"{side}_option")),
+    )
+
+
+async def _close(*backends: BaseCache):
+    for backend in backends:
+        with suppress(NotImplementedError):
+            await backend.close()
+
+
+async def _main(args) -> MigrationStats:
+    source, target = _make_backend(args, "source"), _make_backend(args, "target")
+    try:
+        return await migrate(
+            source,
+            target,
+            pattern=args.pattern,
+            batch_size=args.batch_size,
+            rate=args.rate,
+            progress=lambda stats: print(stats, file=sys.stderr),
+            progress_interval=args.progress_interval,
+            dry_run=args.dry_run,
+        )
+    finally:
+        await _close(source, target)
+
+
+def main(argv: abc.Sequence[str] = None) -> int:
+    logging.basicConfig(level=logging.WARNING)
+    stats = asyncio.run(_main(_make_parser().parse_args(argv)))
+    return 1 if stats.failed else 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -17,6 +17,9 @@ class RedisCache(BaseCache):
         super().__init__(app, **options)
         self.store = redis.from_url(location or "redis://localhost")
 
+    async def ping(self) -> bool:
+        return await self.store.ping()
+
     async def get(self, key) -> t.Any:
         """
         Fetch a given key from the cache. If the key does not exist, return
@@ -34,6 +37,17 @@ class RedisCache(BaseCache):
         ttl = self.ttl if ttl is None else to_timedelta(ttl)
         return await self.store.set(self.make_key(key), self.dumps(value), px=ttl)
 
+    async def expire_many(self, keys, ttl=None) -> int:
+        """
+        Reset the timeout of several keys at once. Return the number of keys
+        that exist.
+        """
+        ttl = self.ttl if ttl is None else to_timedelta(ttl)
+        async with self.store.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.pexpire(self.make_key(key), ttl)
+            return sum(await pipe.execute())
+
     async def delete(self, key) -> int:
         """
         Delete a key from the cache, failing silently.
@@ -46,6 +60,38 @@ class RedisCache(BaseCache):
         """
         return await self.store.keys(self.make_key(pattern))
 
+    async def scan(self, pattern="*", *, count: int = 1000):
+        """
+        Iterate over the keys matching `pattern` with a `SCAN` cursor, in
+        batches of about `count` keys. Keys may be seen more than once.
+        """
+        cursor, match = None, self.make_key(pattern)
+        while cursor != 0:
+            cursor, keys = await self.store.scan(cursor or 0, match, count)
+            if keys:
+                yield keys
+
+    async def get_raw_many(self, keys) -> list[tuple[bytes | None, float | None]]:
+        """
+        Fetch the serialized values and remaining ttl of several keys in a
+        single round trip.
+        """
+        async with self.store.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.get(key).pttl(key)
+            rv = await pipe.execute()
+        return [(v, None if ms < 0 else ms / 1000) for v, ms in zip(*[iter(rv)] * 2)]
+
+    async def set_raw_many(self, items) -> int:
+        """
+        Store several serialized values in a single round trip.
+        """
+        async with self.store.pipeline(transaction=False) as pipe:
+            for key, value, ttl in items:
+                ms = self.ttl if ttl is None else max(1, round(ttl * 1000))
+                pipe.set(key, value, px=ms)
+            return sum(map(bool, await pipe.execute()))
+
     # async def clear(self):
     #     """Remove *all* values from the cache at once."""
     #     raise NotImplementedError(
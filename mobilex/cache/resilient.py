@@ -0,0 +1,243 @@
+import asyncio
+import logging
+import time
+import typing as t
+from collections import Counter, abc
+
+from . import get_backend
+from .base import BaseCache, Timeout
+from .dict import DictCache
+
+if t.TYPE_CHECKING:
+    from mobilex import App
+
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """Stops calling a failing service for a while.
+
+    The breaker opens after `failure_threshold` consecutive failures. Once
+    `reset_timeout` seconds have passed, a single trial call is let through:
+    its success closes the breaker and its failure opens it again.
+    """
+
+    CLOSED: t.Final = "closed"
+    OPEN: t.Final = "open"
+    HALF_OPEN: t.Final = "half-open"
+
+    __slots__ = (
+        "failure_threshold",
+        "reset_timeout",
+        "failures",
+        "_opened_at",
+        "_trial",
+    )
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold, self.reset_timeout = failure_threshold, reset_timeout
+        self.failures, self._opened_at, self._trial = 0, None, False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        elif self._trial or time.monotonic() - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allow(self) -> bool:
+        """Whether a call may be made now. In the half-open state only the
+        first caller is let through, as the trial call."""
+        if self._opened_at is None:
+            return True
+        elif self._trial or time.monotonic() - self._opened_at < self.reset_timeout:
+            return False
+        self._trial = True
+        return True
+
+    def record_success(self):
+        self.failures, self._opened_at, self._trial = 0, None, False
+
+    def record_failure(self) -> bool:
+        """Record a failed call and return whether it opened the breaker."""
+        self.failures += 1
+        if self._trial or (
+            self._opened_at is None and self.failures >= self.failure_threshold
+        ):
+            self._opened_at, self._trial = time.monotonic(), False
+            return True
+        return False
+
+
+class ResilientCache(BaseCache):
+    """Wraps a backend with per-operation timeouts, a circuit breaker and an
+    in-process fallback.
+
+    Operations on the wrapped `backend` that fail or take longer than
+    `timeout` seconds are served by a `DictCache` instead, and the breaker
+    keeps requests away from the backend while it is failing. Sessions thus
+    carry on, on the current worker, until the backend recovers. Values
+    written to the fallback take precedence over the backend's, and are
+    still read from it after the recovery, until they are overwritten in
+    the backend or expire. The fallback uses the backend's serializer.
+
+    Counts of timeouts, errors and fallback operations are kept in `stats`.
+    """
+
+    backend: BaseCache
+    fallback: DictCache
+    breaker: CircuitBreaker
+    stats: Counter[str]
+
+    def __init__(
+        self,
+        app: "App",
+        location=None,
+        *,
+        backend: type[BaseCache] | str = "redis",
+        backend_options: abc.Mapping[str, t.Any] = None,
+        fallback_options: abc.Mapping[str, t.Any] = None,
+        timeout: float = 0.25,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        **options,
+    ):
+        super().__init__(app, **options)
+        self.backend = get_backend(backend)(
+            app, location, **options, **backend_options or {}
+        )
+        fallback_options = (
+            options | {"serializer": self.backend.serializer} | (fallback_options or {})
+        )
+        self.fallback = DictCache(app, **fallback_options)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.timeout, self.stats = timeout, Counter()
+
+    def make_key(self, key: t.Any):
+        return self.backend.make_key(key)
+
+    @property
+    def is_degraded(self) -> bool:
+        return self.breaker.state != CircuitBreaker.CLOSED
+
+    async def _call(self, name: str, *args, **kwds) -> tuple[bool, t.Any]:
+        """Call `name` on the backend. Returns `(True, result)` on success and
+        `(False, None)` if the fallback should be used instead."""
+        if not self.breaker.allow():
+            self.stats["fallback"] += 1
+            return False, None
+        try:
+            rv = await asyncio.wait_for(
+                getattr(self.backend, name)(*args, **kwds), self.timeout
+            )
+        except Exception as e:
+            self._on_failure(name, e)
+            return False, None
+        self.breaker.state == CircuitBreaker.CLOSED or logger.warning(
+            "cache backend %r recovered", type(self.backend).__name__
+        )
+        self.breaker.record_success()
+        return True, rv
+
+    def _on_failure(self, name: str, e: Exception):
+        kind = "timeouts" if isinstance(e, asyncio.TimeoutError) else "errors"
+        self.stats[kind] += 1
+        self.stats["fallback"] += 1
+        if self.breaker.record_failure():
+            self.stats["opened"] += 1
+            logger.warning(
+                "cache backend %r failing (%s on %s), using the in-process "
+                "fallback for %ss",
+                type(self.backend).__name__,
+                type(e).__name__,
+                name,
+                self.breaker.reset_timeout,
+            )
+        else:
+            logger.debug("cache backend %s() failed: %r", name, e)
+
+    async def ping(self) -> bool:
+        ok, rv = await self._call("ping")
+        return ok and rv
+
+    async def get(self, key):
+        if self.fallback.store and (rv := await self.fallback.get(key)) is not None:
+            return rv
+        return (await self._call("get", key))[1]
+
+    async def set(self, key, value, ttl: Timeout = None):
+        ok, rv = await self._call("set", key, value, ttl)
+        if not ok:
+            return await self.fallback.set(key, value, ttl)
+        self.fallback.store and await self.fallback.delete(key)
+        return rv
+
+    async def add(self, key, value, ttl: Timeout = None):
+        ok, rv = await self._call("add", key, value, ttl)
+        return rv if ok else await self.fallback.add(key, value, ttl)
+
+    async def touch(self, key, ttl: Timeout = None) -> bool:
+        ok, rv = await self._call("touch", key, ttl)
+        if self.fallback.store:
+            rv = await self.fallback.touch(key, ttl) or rv
+        return rv
+
+    async def expire_many(self, keys: abc.Iterable, ttl: Timeout = None) -> int:
+        keys = list(keys)
+        ok, rv = await self._call("expire_many", keys, ttl)
+        if self.fallback.store:
+            rv = (rv or 0) + await self.fallback.expire_many(keys, ttl)
+        return rv or 0
+
+    async def delete(self, key):
+        ok, rv = await self._call("delete", key)
+        if self.fallback.store:
+            rv = await self.fallback.delete(key) or rv
+        return rv
+
+    async def keys(self, pattern="*") -> list[bytes]:
+        ok, rv = await self._call("keys", pattern)
+        if self.fallback.store:
+            rv = sorted({*(rv or ()), *await self.fallback.keys(pattern)})
+        return rv or []
+
+    async def scan(self, pattern="*", *, count: int = 1000):
+        """
+        Iterate over the keys in the fallback, then over those in the
+        backend. Failures of the backend are raised, not masked, so that
+        a scan is never silently incomplete.
+        """
+        async for keys in self.fallback.scan(pattern, count=count):
+            yield keys
+        async for keys in self.backend.scan(pattern, count=count):
+            yield keys
+
+    async def get_raw_many(self, keys) -> list[tuple[bytes | None, float | None]]:
+        keys = list(keys)
+        ok, rv = await self._call("get_raw_many", keys)
+        rv = rv if ok else [(None, None)] * len(keys)
+        if self.fallback.store:
+            found = await self.fallback.get_raw_many(keys)
+            rv = [b if b[0] is not None else a for a, b in zip(rv, found)]
+        return rv
+
+    async def set_raw_many(self, items) -> int:
+        items = list(items)
+        ok, rv = await self._call("set_raw_many", items)
+        if not ok:
+            return await self.fallback.set_raw_many(items)
+        if self.fallback.store:
+            for key, *_ in items:
+                self.fallback._remove(key)
+        return rv
+
+    async def clear(self):
+        await self._call("clear")
+        await self.fallback.clear()
+
+    async def close(self, **kwargs):
+        await asyncio.gather(
+            self.backend.close(**kwargs), self.fallback.close(**kwargs)
+        )
@@ -0,0 +1,276 @@
+import mmap
+import os
+import re
+import struct
+import sys
+import tempfile
+import time
+import typing as t
+from contextlib import contextmanager
+from hashlib import blake2b
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+from mobilex.utils import to_timedelta
+
+from .base import BaseCache, Timeout
+
+if t.TYPE_CHECKING:
+    from mobilex import App
+
+
+_MAGIC = b"MXSHM001"
+_HEAD = struct.Struct("<8sII")
+_HEAD_SIZE = 64
+_SLOT = struct.Struct("<IQdHI")
+_SLOT_HEAD = 32
+_SEQ = struct.Struct("<I")
+_EXP = struct.Struct("<d")
+_EXP_OFFSET = 12
+
+_EMPTY, _DELETED = 0, 0xFFFF
+_MAX_SPINS = 10000
+
+
+class SharedMemoryCache(BaseCache):
+    """A cache in a memory-mapped file shared by the processes on one host.
+
+    The file holds a fixed number of fixed-size slots forming an open-addressing
+    hash table. Each slot is guarded by a sequence lock, so readers never block
+    and retry only if they race with a writer. Writers are serialized across
+    processes with an `fcntl` lock on the file. Values larger than a slot are
+    rejected and, when a key's probe window is full, the entry expiring first
+    is replaced.
+    """
+
+    location: str
+    slots: int
+    slot_size: int
+
+    def __init__(
+        self,
+        app: "App",
+        location: str = None,
+        *,
+        slots: int = 8192,
+        slot_size: int = 4096,
+        max_probe: int = 32,
+        **options,
+    ):
+        if fcntl is None:  # pragma: no cover
+            raise ImportError(f"{__name__!r} is not supported on {sys.platform!r}")
+        super().__init__(app, **options)
+        if location is None:
+            name = (self.key_prefix or b"mobilex").rstrip(b"|").replace(b"|", b".")
+            base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+            location = os.path.join(base, f"mobilex-{name.decode()}.cache")
+        self.location = location
+        self._fd = os.open(location, os.O_RDWR | os.O_CREAT, 0o600)
+        self._lock_depth = 0
+        with self._lock():
+            if os.fstat(self._fd).st_size < _HEAD_SIZE:
+                os.ftruncate(self._fd, _HEAD_SIZE + slots * slot_size)
+                os.pwrite(self._fd, _HEAD.pack(_MAGIC, slots, slot_size), 0)
+            magic, slots, slot_size = _HEAD.unpack(os.pread(self._fd, _HEAD.size, 0))
+            assert magic == _MAGIC, f"{location!r} is not a mobilex cache file"
+        # Clamp against the file's slot count, which wins over `slots`.
+        self.slots, self.slot_size = slots, slot_size
+        self.max_probe = min(max_probe, slots)
+        self._mm = mmap.mmap(self._fd, _HEAD_SIZE + slots * slot_size)
+
+    @contextmanager
+    def _lock(self):
+        # fcntl locks do not nest within a process, so only the outermost
+        # holder takes and releases it, e.g. when `_repair()` runs mid-write.
+        if not (depth := self._lock_depth):
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, 1, 0)
+        self._lock_depth = depth + 1
+        try:
+            yield
+        finally:
+            self._lock_depth = depth
+            depth or fcntl.lockf(self._fd, fcntl.LOCK_UN, 1, 0)
+
+    def _hash(self, key: bytes) -> int:
+        return int.from_bytes(blake2b(key, digest_size=8).digest(), "little")
+
+    def _offset(self, i: int) -> int:
+        return _HEAD_SIZE + i * self.slot_size
+
+    def _read(self, i: int):
+        mm, off, spins = self._mm, self._offset(i), 0
+        while True:
+            seq = _SEQ.unpack_from(mm, off)[0]
+            if seq & 1:
+                if (spins := spins + 1) > _MAX_SPINS:
+                    self._repair(i)
+                continue
+            _, h, exp, klen, vlen = _SLOT.unpack_from(mm, off)
+            data = mm[off + _SLOT_HEAD : off + _SLOT_HEAD + klen + vlen]
+            if klen in (_EMPTY, _DELETED):
+                data = b""
+            if _SEQ.unpack_from(mm, off)[0] == seq:
+                return h, exp, klen, data[:klen], data[klen:]
+
+    def _repair(self, i: int):
+        # A writer died while holding the slot: drop the torn entry.
+        with self._lock():
+            if (seq := _SEQ.unpack_from(self._mm, off := self._offset(i))[0]) & 1:
+                _SEQ.pack_into(self._mm, off, seq + 1)
+                self._write(i, 0, 0, b"", b"", _DELETED)
+
+    def _write(self, i: int, h: int, exp: float, key: bytes, value: bytes, klen=None):
+        mm, off = self._mm, self._offset(i)
+        seq = _SEQ.unpack_from(mm, off)[0]
+        _SEQ.pack_into(mm, off, seq + 1)
+        _SLOT.pack_into(
+            mm, off, seq + 1, h, exp, len(key) if klen is None else klen, len(value)
+        )
+        mm[off + _SLOT_HEAD : off + _SLOT_HEAD + len(key) + len(value)] = key + value
+        _SEQ.pack_into(mm, off, seq + 2)
+
+    def _touch(self, i: int, exp: float):
+        mm, off = self._mm, self._offset(i)
+        seq = _SEQ.unpack_from(mm, off)[0]
+        _SEQ.pack_into(mm, off, seq + 1)
+        _EXP.pack_into(mm, off + _EXP_OFFSET, exp)
+        _SEQ.pack_into(mm, off, seq + 2)
+
+    def _probe(self, h: int):
+        start, n = h % self.slots, self.slots
+        return ((start + j) % n for j in range(self.max_probe))
+
+    def _find(self, key: bytes, h: int, now: float):
+        for i in self._probe(h):
+            sh, exp, klen, k, v = self._read(i)
+            if klen == _EMPTY:
+                break
+            elif klen != _DELETED and sh == h and k == key:
+                return (i, v) if exp > now else (None, None)
+        return None, None
+
+    def _ttl(self, ttl: Timeout = None) -> float:
+        return (self.ttl if ttl is None else to_timedelta(ttl)).total_seconds()
+
+    async def get(self, key) -> t.Any:
+        """
+        Fetch a given key from the cache. If the key does not exist, return
+        default, which itself defaults to None.
+        """
+        key = self.make_key(key)
+        _, rv = self._find(key, self._hash(key), time.time())
+        return None if rv is None else self.loads(rv)
+
+    async def set(self, key, value, ttl: Timeout = None) -> bool:
+        """
+        Set a value in the cache. If timeout is given, use that timeout for the
+        key; otherwise use the default cache timeout.
+        """
+        key, value = self.make_key(key), self.dumps(value)
+        if len(key) + len(value) > self.slot_size - _SLOT_HEAD:
+            raise ValueError(
+                f"value for {key!r} exceeds the slot size of {self.slot_size} bytes"
+            )
+        h, now = self._hash(key), time.time()
+        with self._lock():
+            self._write(
+                self._slot_for(key, h, now), h, now + self._ttl(ttl), key, value
+            )
+        return True
+
+    async def get_raw_many(self, keys) -> list[tuple[bytes | None, float | None]]:
+        """
+        Fetch the serialized values of several keys along with their
+        remaining ttl.
+        """
+        rv, now = [], time.time()
+        for key in keys:
+            i, val = self._find(key, self._hash(key), now)
+            if i is None:
+                rv.append((None, None))
+            else:
+                exp = _EXP.unpack_from(self._mm, self._offset(i) + _EXP_OFFSET)[0]
+                rv.append((val, exp - now))
+        return rv
+
+    async def set_raw_many(self, items) -> int:
+        """
+        Store several serialized values as is. Values larger than a slot are
+        skipped.
+        """
+        rv, now, size = 0, time.time(), self.slot_size - _SLOT_HEAD
+        with self._lock():
+            for key, value, ttl in items:
+                if len(key) + len(value) <= size:
+                    h = self._hash(key)
+                    i = self._slot_for(key, h, now)
+                    self._write(i, h, now + self._ttl(ttl), key, value)
+                    rv += 1
+        return rv
+
+    def _slot_for(self, key: bytes, h: int, now: float) -> int:
+        free = victim = None
+        for i in self._probe(h):
+            sh, exp, klen, k, _ = self._read(i)
+            if klen == _EMPTY:
+                return i if free is None else free
+            elif klen != _DELETED and sh == h and k == key:
+                return i
+            elif free is None and (klen == _DELETED or exp <= now):
+                free = i
+            elif victim is None or exp < victim[1]:
+                victim = i, exp
+        return victim[0] if free is None else free
+
+    async def expire_many(self, keys, ttl: Timeout = None) -> int:
+        """
+        Reset the timeout of several keys at once. Return the number of keys
+        that exist.
+        """
+        now, rv = time.time(), 0
+        exp = now + self._ttl(ttl)
+        with self._lock():
+            for key in map(self.make_key, keys):
+                if (i := self._find(key, self._hash(key), now)[0]) is not None:
+                    self._touch(i, exp)
+                    rv += 1
+        return rv
+
+    async def delete(self, key) -> int:
+        """
+        Delete a key from the cache, failing silently.
+        """
+        key = self.make_key(key)
+        h = self._hash(key)
+        with self._lock():
+            if (i := self._find(key, h, time.time())[0]) is not None:
+                self._write(i, 0, 0, b"", b"", _DELETED)
+                return 1
+        return 0
+
+    async def keys(self, pattern="*") -> list[bytes]:
+        """
+        Return the keys matching the glob-style `pattern`.
+        """
+        pattern = self.make_key(pattern)
+        p_re = re.compile(b".*".join(map(re.escape, pattern.split(b"*"))))
+        rv, now = [], time.time()
+        for i in range(self.slots):
+            _, exp, klen, k, _ = self._read(i)
+            if klen not in (_EMPTY, _DELETED) and exp > now and p_re.fullmatch(k):
+                rv.append(k)
+        return rv
+
+    async def clear(self):
+        """Remove *all* values from the cache at once."""
+        with self._lock():
+            for i in range(self.slots):
+                self._write(i, 0, 0, b"", b"", _EMPTY)
+
+    async def close(self, **kwargs):
+        """Close the cache connection"""
+        self._mm.close()
+        os.close(self._fd)
@@ -0,0 +1,271 @@
+import asyncio
+import os
+import re
+import sqlite3
+import tempfile
+import time
+import typing as t
+from concurrent.futures import ThreadPoolExecutor
+from logging import getLogger
+
+from mobilex.utils import to_timedelta
+
+from .base import BaseCache, Timeout
+
+if t.TYPE_CHECKING:
+    from mobilex import App
+
+logger = getLogger(__name__)
+
+_Pending = dict[bytes, tuple[bytes | None, float]]
+
+
+class SQLiteCache(BaseCache):
+    """A persistent cache in an embedded SQLite database.
+
+    The database runs in WAL mode on a dedicated thread. Writes from
+    concurrent requests are queued and committed together in a single
+    transaction (group commit), and reads see queued writes immediately.
+    Expired rows are swept in the background and on startup, so entries
+    outlive process restarts but not their TTL.
+    """
+
+    location: str
+
+    #: Keys per `IN (...)` query, below `SQLITE_MAX_VARIABLE_NUMBER` (999
+    #: before SQLite 3.32) with room for the other parameters.
+    max_variables: t.ClassVar[int] = 900
+
+    def __init__(
+        self,
+        app: "App",
+        location: str = None,
+        *,
+        sweep_interval: float = 60,
+        commit_delay: float = 0,
+        **options,
+    ):
+        super().__init__(app, **options)
+        if location is None:
+            name = (self.key_prefix or b"mobilex").rstrip(b"|").replace(b"|", b".")
+            location = os.path.join(
+                tempfile.gettempdir(), f"mobilex-{name.decode()}.sqlite3"
+            )
+        self.location, self.sweep_interval = location, sweep_interval
+        self.commit_delay = commit_delay
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix="mobilex-sqlite")
+        self._conn = self._executor.submit(self._connect).result()
+        self._pending: _Pending = {}
+        self._committing: _Pending = {}
+        self._waiters: list[asyncio.Future] = []
+        self._flusher: asyncio.Task | None = None
+        self._sweeper: asyncio.Task | None = None
+
+    def _connect(self):
+        conn = sqlite3.connect(
+            self.location, isolation_level=None, check_same_thread=False
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache "
+            "(key BLOB PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+            " WITHOUT ROWID"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS cache_expiry ON cache (expires_at)")
+        self._sweep(conn)
+        return conn
+
+    def _sweep(self, conn: sqlite3.Connection = None):
+        (conn or self._conn).execute(
+            "DELETE FROM cache WHERE expires_at <= ?", (time.time(),)
+        )
+
+    def _commit(self, items: list[tuple[bytes, tuple[bytes | None, float]]]):
+        conn = self._conn
+        conn.execute("BEGIN")
+        try:
+            conn.executemany(
+                "INSERT OR REPLACE INTO cache VALUES (?, ?, ?)",
+                [(k, v, e) for k, (v, e) in items if v is not None],
+            )
+            conn.executemany(
+                "DELETE FROM cache WHERE key = ?",
+                [(k,) for k, (v, _) in items if v is None],
+            )
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _expire(self, keys: list[bytes], expires_at: float, now: float) -> int:
+        conn, rv = self._conn, 0
+        conn.execute("BEGIN")
+        try:
+            for key in keys:
+                rv += conn.execute(
+                    "UPDATE cache SET expires_at = ? WHERE key = ? AND expires_at > ?",
+                    (expires_at, key, now),
+                ).rowcount
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        return rv
+
+    def _select(self, sql: str, *args):
+        return self._conn.execute(sql, args).fetchall()
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    def _ttl(self, ttl: Timeout = None) -> float:
+        return (self.ttl if ttl is None else to_timedelta(ttl)).total_seconds()
+
+    def _enqueue(self, key: bytes, value: bytes | None, expires_at: float):
+        loop = asyncio.get_running_loop()
+        self._pending[key] = value, expires_at
+        self._waiters.append(fut := loop.create_future())
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.ensure_future(self._flush())
+        if self.sweep_interval and (self._sweeper is None or self._sweeper.done()):
+            self._sweeper = asyncio.ensure_future(self._sweep_periodically())
+        return fut
+
+    async def _flush(self):
+        await asyncio.sleep(self.commit_delay)
+        while self._pending:
+            self._committing, waiters = self._pending, self._waiters
+            self._pending, self._waiters = {}, []
+            try:
+                await self._run(self._commit, [*self._committing.items()])
+            except Exception as e:
+                for fut in waiters:
+                    fut.done() or fut.set_exception(e)
+            else:
+                for fut in waiters:
+                    fut.done() or fut.set_result(True)
+            finally:
+                self._committing = {}
+
+    async def _sweep_periodically(self):
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                await self._run(self._sweep)
+            except Exception as e:  # pragma: no cover
+                logger.warning(f"sweeping {self.location!r} failed: {e!r}")
+
+    def _get_pending(self, key: bytes):
+        for src in (self._pending, self._committing):
+            if (it := src.get(key)) is not None:
+                return it
+        return None
+
+    async def get(self, key) -> t.Any:
+        """
+        Fetch a given key from the cache. If the key does not exist, return
+        default, which itself defaults to None.
+        """
+        key, now = self.make_key(key), time.time()
+        if (it := self._get_pending(key)) is not None:
+            val, exp = it
+            return None if val is None or exp <= now else self.loads(val)
+        sql = "SELECT value FROM cache WHERE key = ? AND expires_at > ?"
+        if rows := await self._run(self._select, sql, key, now):
+            return self.loads(rows[0][0])
+        return None
+
+    async def set(self, key, value, ttl: Timeout = None) -> bool:
+        """
+        Set a value in the cache. If timeout is given, use that timeout for the
+        key; otherwise use the default cache timeout.
+        """
+        exp = time.time() + self._ttl(ttl)
+        return await self._enqueue(self.make_key(key), self.dumps(value), exp)
+
+    async def get_raw_many(self, keys) -> list[tuple[bytes | None, float | None]]:
+        """
+        Fetch the serialized values of several keys along with their
+        remaining ttl, in a query per `max_variables` keys.
+        """
+        keys, now = list(keys), time.time()
+        found = {k: it for k in keys if (it := self._get_pending(k)) is not None}
+        rest, size = [k for k in keys if k not in found], self.max_variables
+        for i in range(0, len(rest), size):
+            chunk = rest[i : i + size]
+            sql = "SELECT key, value, expires_at FROM cache WHERE expires_at > ?"
+            sql += f" AND key IN ({', '.join('?' * len(chunk))})"
+            rows = await self._run(self._select, sql, now, *chunk)
+            found.update((k, (v, e)) for k, v, e in rows)
+        rv = []
+        for key in keys:
+            val, exp = found.get(key, (None, 0))
+            rv.append(
+                (val, exp - now) if val is not None and exp > now else (None, None)
+            )
+        return rv
+
+    async def set_raw_many(self, items) -> int:
+        """
+        Store several serialized values as is, in a single transaction.
+        """
+        now = time.time()
+        futs = [self._enqueue(k, v, now + self._ttl(ttl)) for k, v, ttl in items]
+        rv = await asyncio.gather(*futs, return_exceptions=True)
+        return sum(r is True for r in rv)
+
+    async def expire_many(self, keys, ttl: Timeout = None) -> int:
+        """
+        Reset the timeout of several keys at once. Return the number of keys
+        that exist.
+        """
+        if self._flusher is not None:
+            await asyncio.shield(self._flusher)
+        now = time.time()
+        keys, exp = [*map(self.make_key, keys)], now + self._ttl(ttl)
+        return await self._run(self._expire, keys, exp, now)
+
+    async def delete(self, key) -> int:
+        """
+        Delete a key from the cache, failing silently.
+        """
+        key, now = self.make_key(key), time.time()
+        if (it := self._get_pending(key)) is not None:
+            exists = it[0] is not None and it[1] > now
+        else:
+            sql = "SELECT 1 FROM cache WHERE key = ? AND expires_at > ?"
+            exists = not not await self._run(self._select, sql, key, now)
+        exists and await self._enqueue(key, None, 0)
+        return +exists
+
+    async def keys(self, pattern="*") -> list[bytes]:
+        """
+        Return the keys matching the glob-style `pattern`.
+        """
+        if self._flusher is not None:
+            await asyncio.shield(self._flusher)
+        pattern = self.make_key(pattern)
+        prefix = pattern.split(b"*", 1)[0]
+        p_re = re.compile(b".*".join(map(re.escape, pattern.split(b"*"))))
+        sql, args = "SELECT key FROM cache WHERE expires_at > ?", [time.time()]
+        if prefix:
+            sql += " AND key >= ? AND key < ?"
+            args += prefix, prefix + b"\xff" * 8
+        rows = await self._run(self._select, sql, *args)
+        return [k for (k,) in rows if k.startswith(prefix) and p_re.fullmatch(k)]
+
+    async def clear(self):
+        """Remove *all* values from the cache at once."""
+        if self._flusher is not None:
+            await asyncio.shield(self._flusher)
+        await self._run(self._select, "DELETE FROM cache")
+
+    async def close(self, **kwargs):
+        """Close the cache connection"""
+        self._sweeper is None or self._sweeper.cancel()
+        if self._flusher is not None:
+            await asyncio.shield(self._flusher)
+        await self._run(self._conn.close)
+        self._executor.shutdown(wait=False)
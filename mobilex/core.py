@@ -1,59 +1,141 @@
+import asyncio
+import logging
+import time
 import typing as t
 from collections import abc
+from contextlib import suppress
 from datetime import timedelta
 from functools import cached_property
+from inspect import isawaitable
 
 from mobilex.utils.types import FrozenNamespaceDict
 
+from .cache import get_backend
 from .router import Router
 from .screens import Screen
-from .sessions import History, Session, SessionManager
+from .sessions import History, Session, SessionManager, TTLPolicy
 from .utils import ArgumentVector, to_timedelta
+from .utils.phone import coerce_msisdn
 
 if t.TYPE_CHECKING:
     from .cache.base import BaseCache
+    from .i18n import Translations
+    from .loaders import BatchFn, DataLoader, Loader
+    from .ratelimit import LoadShedder, RateLimiter
     from .responses import Response
+    from .sms import BaseProvider, DeliveryReport, InboundSms, Outbox, SmsRouter
+    from .subscribers import Subscriber, SubscriberService
+
+logger = logging.getLogger(__package__)
 
 
 class ConfigDict(t.TypedDict, total=False):
     max_page_length: int
+    max_redirects: int
+    transliterate: bool
+    normalize_msisdns: bool
+    msisdn_region: str
+    rate_limits: abc.Mapping[str, tuple[float, float] | float]
+    rate_limit_shared: bool
+    max_inflight: int
+    max_latency: float
+    busy_response: str
+    default_language: str
+    languages: abc.Mapping[str, abc.Mapping[str, str] | str]
+    language_page_lengths: abc.Mapping[str, int]
     session_class: type[Session]
     session_key_prefix: str
-    session_backend: type["BaseCache"]
+    session_backend: type["BaseCache"] | str
+    session_backend_options: abc.Mapping[str, t.Any]
     session_manager: SessionManager | abc.Callable[..., SessionManager]
     session_ttl: float | timedelta
+    session_ttl_policy: TTLPolicy | abc.Callable[..., TTLPolicy]
 
     history_class: type[History]
-    history_backend: type["BaseCache"]
+    history_backend: type["BaseCache"] | str
+    history_backend_options: abc.Mapping[str, t.Any]
     history_key_prefix: type["BaseCache"]
     history_ttl: float | timedelta
 
+    cache_backend: type["BaseCache"] | str
+    cache_backend_options: abc.Mapping[str, t.Any]
+    cache_key_prefix: str
+    cache_ttl: float | timedelta
+
+    subscriber_service: "SubscriberService | abc.Callable[..., SubscriberService]"
+    subscriber_ttl: float | timedelta
+    subscriber_languages: abc.Mapping[str, str]
+
+    sms_provider: type["BaseProvider"] | str
+    sms_provider_options: abc.Mapping[str, t.Any]
+    sms_sender: str
+    sms_batch_size: int
+    sms_flush_interval: float
+    sms_rate: float
+    sms_max_retries: int
+    sms_report_ttl: float | timedelta
+
 
 class AppConfig(FrozenNamespaceDict):
     __slots__ = ()
 
     max_page_length: int
+    max_redirects: int
+    transliterate: bool
+    normalize_msisdns: bool
+    msisdn_region: str
+    rate_limits: abc.Mapping[str, tuple[float, float] | float]
+    rate_limit_shared: bool
+    max_inflight: int
+    max_latency: float
+    busy_response: str
+    default_language: str
+    languages: abc.Mapping[str, abc.Mapping[str, str] | str]
+    language_page_lengths: abc.Mapping[str, int]
 
     session_class: type[Session]
     session_key_prefix: str
-    session_backend: type["BaseCache"]
+    session_backend: type["BaseCache"] | str
+    session_backend_options: abc.Mapping[str, t.Any]
     session_manager: SessionManager | abc.Callable[..., SessionManager]
     session_ttl: float | timedelta
+    session_ttl_policy: TTLPolicy | abc.Callable[..., TTLPolicy]
 
     history_class: type[History]
-    history_backend: type["BaseCache"]
+    history_backend: type["BaseCache"] | str
+    history_backend_options: abc.Mapping[str, t.Any]
     history_key_prefix: type["BaseCache"]
     history_ttl: float | timedelta
 
+    cache_backend: type["BaseCache"] | str
+    cache_backend_options: abc.Mapping[str, t.Any]
+    cache_key_prefix: str
+    cache_ttl: float | timedelta
+
+    subscriber_service: "SubscriberService | abc.Callable[..., SubscriberService]"
+    subscriber_ttl: float | timedelta
+    subscriber_languages: abc.Mapping[str, str]
+
+    sms_provider: type["BaseProvider"] | str
+    sms_provider_options: abc.Mapping[str, t.Any]
+    sms_sender: str
+    sms_batch_size: int
+    sms_flush_interval: float
+    sms_rate: float
+    sms_max_retries: int
+    sms_report_ttl: float | timedelta
+
 
 class Request:
     args: ArgumentVector
     app: "App"
     session: "Session"
+    session_data: tuple[bytes, float | None] = None
     history: "History"
 
     msisdn: str
     session_id: t.Union[str, int] = None
+    subscriber: "Subscriber" = None
 
     service_code: str = None
     initial_code: str = None
@@ -78,16 +160,44 @@ class Request:
     def base_uri(self):
         return "*".join(filter(None, (self.service_code, self.initial_code)))
 
+    async def get_subscriber(self) -> "Subscriber":
+        """Look up the subscriber's metadata once per request."""
+        if (rv := self.subscriber) is None:
+            rv = self.subscriber = await self.app.subscriber_service(self)
+        return rv
+
+    @cached_property
+    def loaders(self) -> dict[t.Any, "DataLoader"]:
+        return {}
+
+    def get_loader(self, loader: "Loader | BatchFn") -> "DataLoader":
+        """Get the request-scoped `DataLoader` for the given `Loader` or batch
+        function."""
+        if (rv := self.loaders.get(loader)) is None:
+            from .loaders import DataLoader, Loader
+
+            ld = loader if isinstance(loader, Loader) else Loader(loader)
+            rv = self.loaders[loader] = DataLoader(ld)
+        return rv
+
 
 class App:
     router: t.Final[Router]
     name: t.Final[str]
     _initial_config: t.Final[dict[str, t.Any]]
 
-    def __init__(self, name: str = None, router: Router = None, **config):
+    def __init__(
+        self,
+        name: str = None,
+        router: Router = None,
+        sms_router: "SmsRouter" = None,
+        **config,
+    ):
         self.name = "mobilex.app" if name is None else name
         self.has_booted = False
         self.router = router or Router()
+        sms_router is None or setattr(self, "sms_router", sms_router)
+        self._startup_hooks, self._startup_lock = [], asyncio.Lock()
         self._initial_config = self.get_default_config().copy()
         config and self.configure(config)
 
@@ -97,28 +207,121 @@ class App:
         del self._initial_config
         return AppConfig(conf)
 
+    @cached_property
+    def sms_router(self) -> "SmsRouter":
+        from .sms import SmsRouter
+
+        return SmsRouter()
+
+    @cached_property
+    def translations(self) -> "Translations":
+        from .i18n import Translations
+
+        conf = self.config
+        return Translations(
+            conf.default_language, conf.languages, conf.language_page_lengths
+        )
+
     @cached_property
     def session_manager(self):
         cb = self.config.session_manager
         return cb() if callable(cb) else cb
 
+    @cached_property
+    def session_ttl_policy(self) -> TTLPolicy:
+        cb = self.config.session_ttl_policy
+        return cb() if isinstance(cb, type) else cb
+
+    @cached_property
+    def subscriber_service(self) -> "SubscriberService":
+        from .subscribers import SubscriberService
+
+        conf = self.config
+        if isinstance(cb := conf.subscriber_service or SubscriberService, type):
+            return cb(conf.subscriber_ttl, languages=conf.subscriber_languages)
+        return cb
+
+    @cached_property
+    def rate_limiter(self) -> "RateLimiter | None":
+        if limits := self.config.rate_limits:
+            from .ratelimit import RateLimiter
+
+            if shared := self.config.rate_limit_shared:
+                from .cache.redis import RedisCache
+
+                shared = self.cache
+                shared = getattr(shared, "backend", shared)
+                if not isinstance(shared, RedisCache):
+                    raise RuntimeError("shared rate limits need a redis cache backend")
+            return RateLimiter(limits, shared or None)
+
+    @cached_property
+    def load_shedder(self) -> "LoadShedder":
+        from .ratelimit import LoadShedder
+
+        conf = self.config
+        return LoadShedder(conf.max_inflight, conf.max_latency)
+
     @cached_property
     def session_backend(self):
         conf = self.config
-        return conf.session_backend(
-            self, ttl=conf.session_ttl, key_prefix=conf.session_key_prefix
+        return get_backend(conf.session_backend)(
+            self,
+            ttl=conf.session_ttl,
+            key_prefix=conf.session_key_prefix,
+            **conf.session_backend_options or {},
         )
 
     @cached_property
     def history_backend(self):
         conf = self.config
-        cls = conf.history_backend or conf.session_backend
-
-        return cls(
+        if conf.history_backend:
+            cls, opts = conf.history_backend, conf.history_backend_options
+        else:
+            cls, opts = conf.session_backend, conf.session_backend_options
+        return get_backend(cls)(
             self,
             ttl=conf.history_ttl
             or min(map(to_timedelta, (conf.session_ttl * 10, 3 * 3600))),
             key_prefix=conf.history_key_prefix,
+            **opts or {},
+        )
+
+    @cached_property
+    def cache(self):
+        conf = self.config
+        if conf.cache_backend:
+            cls, opts = conf.cache_backend, conf.cache_backend_options
+        else:
+            cls, opts = conf.session_backend, conf.session_backend_options
+        return get_backend(cls)(
+            self,
+            ttl=conf.cache_ttl,
+            key_prefix=conf.cache_key_prefix,
+            **opts or {},
+        )
+
+    @cached_property
+    def sms_provider(self) -> "BaseProvider":
+        if not (cls := self.config.sms_provider):
+            raise RuntimeError(f"{self.name!r} has no `sms_provider` configured.")
+        from .sms import get_provider
+
+        return get_provider(cls)(**self.config.sms_provider_options or {})
+
+    @cached_property
+    def outbox(self) -> "Outbox":
+        from .sms import Outbox
+
+        conf = self.config
+        return Outbox(
+            self.sms_provider,
+            self.cache,
+            batch_size=conf.sms_batch_size,
+            flush_interval=conf.sms_flush_interval,
+            rate=conf.sms_rate,
+            max_retries=conf.sms_max_retries,
+            report_ttl=conf.sms_report_ttl,
         )
 
     def configure(self, *args, **kwargs):
@@ -129,30 +332,96 @@ class App:
         self._initial_config.update(*args, **kwargs)
 
     def get_default_config(self):
-        from .cache.redis import RedisCache
-
         return ConfigDict(
             max_page_length=182,
+            max_redirects=32,
+            transliterate=False,
+            normalize_msisdns=True,
+            msisdn_region=None,
+            rate_limits=None,
+            rate_limit_shared=False,
+            max_inflight=None,
+            max_latency=None,
+            busy_response="END Service is busy. Please try again later.",
+            default_language="en",
+            languages=None,
+            language_page_lengths=None,
             session_ttl=75,
+            session_ttl_policy=TTLPolicy,
             session_key_prefix="session",
             session_class=Session,
-            session_backend=RedisCache,
+            session_backend="redis",
+            session_backend_options=None,
             session_manager=SessionManager,
             history_key_prefix="state",
             history_backend=None,
+            history_backend_options=None,
             history_class=History,
             history_ttl=None,
+            cache_backend=None,
+            cache_backend_options=None,
+            cache_key_prefix="cache",
+            cache_ttl=3600,
+            subscriber_service=None,
+            subscriber_ttl=86400,
+            subscriber_languages=None,
+            sms_provider=None,
+            sms_provider_options=None,
+            sms_sender=None,
+            sms_batch_size=None,
+            sms_flush_interval=0.05,
+            sms_rate=None,
+            sms_max_retries=3,
+            sms_report_ttl=86400,
         )
 
-    # def setup(self):
-    #     assert (
-    #         not self.has_booted
-    #     ), f"{type(self).__name__}.boot() called multiple times."
-
-    #     self.config
-    #     # self.router.run_embeded(self)
-    #     self.has_booted = True
-    #     return self
+    def on_startup(self, func: abc.Callable[["App"], t.Any]):
+        """Register a warm-up callback to be run by `startup()`."""
+        self._startup_hooks.append(func)
+        return func
+
+    async def startup(self):
+        """Warm up the app before it starts serving requests.
+
+        Resolves the config, loads the translations, opens and pings the cache
+        backends, prepares the router's screens and runs the registered warm-up
+        callbacks. Called automatically on the first request if it was not
+        called before.
+        """
+        async with self._startup_lock:
+            if self.has_booted:
+                return self
+            self.config, self.session_manager, self.translations, self.rate_limiter
+            conf = self.config
+            conf.normalize_msisdns and not conf.msisdn_region and logger.warning(
+                "normalize_msisdns is on but msisdn_region is not set: national"
+                " numbers such as 0712345678 will not be normalized"
+            )
+            backends = {self.session_backend, self.history_backend, self.cache}
+            await asyncio.gather(*(b.ping() for b in backends))
+            self.router.startup(self)
+            for func in self._startup_hooks:
+                if isawaitable(rv := func(self)):
+                    await rv
+            self.has_booted = True
+        return self
+
+    async def shutdown(self):
+        """Release the app's resources once it stops serving requests.
+
+        The counterpart of `startup()`. Sends the messages queued in the SMS
+        outbox, records the retries it gives up as failed and closes the
+        cache backends that were opened.
+        """
+        async with self._startup_lock:
+            if (outbox := self.__dict__.pop("outbox", None)) is not None:
+                await outbox.close()
+            names = ("session_backend", "history_backend", "cache")
+            for backend in [self.__dict__.pop(n) for n in names if n in self.__dict__]:
+                with suppress(NotImplementedError):
+                    await backend.close()
+            self.has_booted = False
+        return self
 
     # def include_router(self, router, name: t.Optional[str] = None):
     #     self.router = router
@@ -160,6 +429,30 @@ class App:
     async def close_session(self, request: Request, response: "Response"):
         await self.session_manager.close(request, response)
 
+    def intake_request(self, request: Request):
+        request.app, conf = self, self.config
+        if conf.normalize_msisdns:
+            request.msisdn = coerce_msisdn(request.msisdn, conf.msisdn_region)
+
+    async def admit_request(self, request: Request) -> bool:
+        """Check the request against the load shedder and the rate limits.
+
+        An admitted request is counted as in flight right away, before the
+        rate limits are checked, and must be `exit()`ed from the shedder.
+        It is released again if the rate limits reject it or fail.
+        """
+        if not (shedder := self.load_shedder).admit():
+            return False
+        shedder.enter()
+        try:
+            if (limiter := self.rate_limiter) is None or await limiter(request):
+                return True
+        except BaseException:
+            shedder.exit()
+            raise
+        shedder.exit()
+        return False
+
     async def prepare_request(self, request: Request) -> Request:
         request.app = self
         await self.session_manager.open(request)
@@ -168,9 +461,33 @@ class App:
         await self.close_session(request, response)
 
     async def __call__(self, request, *args, **kwargs):
-        await self.prepare_request(request)
-        response = await self.router(request)
-        return await self.teardown_request(request, response) or response
+        self.has_booted or await self.startup()
+        self.intake_request(request)
+        shedder, start = self.load_shedder, time.monotonic()
+        if not await self.admit_request(request):
+            return self.config.busy_response
+        try:
+            await self.prepare_request(request)
+            response = await self.router(request)
+            return await self.teardown_request(request, response) or response
+        finally:
+            shedder.exit(time.monotonic() - start)
+
+    def send_sms(self, to: str, text: str, *, sender: str = None) -> str:
+        """Queue an SMS in the outbox and return its message id."""
+        return self.outbox.send(to, text, sender=sender or self.config.sms_sender)
+
+    async def handle_sms(self, message: "InboundSms") -> str | None:
+        """Route an inbound SMS and queue the reply, if any. Returns the
+        message id of the reply."""
+        if reply := await self.sms_router(self, message):
+            return self.send_sms(message.msisdn, reply, sender=message.to)
+
+    async def handle_delivery_report(self, report: "DeliveryReport"):
+        return await self.outbox.handle_report(report)
+
+    def sms_keyword(self, *keywords: str):
+        return self.sms_router.keyword(*keywords)
 
     def screen(self, name: str, screen: type["Screen"] = None, **kwds):
         return self.router.screen(name, screen, **kwds)
@@ -50,3 +50,21 @@ class ScreenNotFoundError(LookupError):
     def __init__(self, *args, name: str = None) -> None:
         super().__init__(*(args if args else (repr(name),) if name else ()))
         self.name = name
+
+
+class RedirectError(RuntimeError):
+    def __init__(self, *args, screen: str = None, depth: int = None) -> None:
+        super().__init__(*args)
+        self.screen, self.depth = screen, depth
+
+
+class TooManyRedirectsError(RedirectError):
+    pass
+
+
+class RedirectLoopError(RedirectError):
+    pass
+
+
+class GatewayError(ValueError):
+    """Raised when a gateway request cannot be parsed."""
@@ -0,0 +1,11 @@
+from .base import BaseGateway
+from .form import FormGateway
+from .json import JsonGateway
+from .soap import SoapGateway
+
+__all__ = [
+    "BaseGateway",
+    "FormGateway",
+    "JsonGateway",
+    "SoapGateway",
+]
@@ -0,0 +1,58 @@
+import typing as t
+from collections import abc
+
+from mobilex.const import ResponseType
+from mobilex.core import Request
+from mobilex.exc import GatewayError
+from mobilex.utils.phone import coerce_msisdn
+
+if t.TYPE_CHECKING:
+    from mobilex import App
+
+
+class BaseGateway:
+    """Translates between a USSD aggregator's wire format and the app.
+
+    Subclasses implement `parse_fields()`, which extracts the raw fields
+    named in `fields` from the request body, and `render()`, which
+    serializes a `CON`/`END` reply. MSISDNs are normalized to E.164 digits,
+    using `region` for numbers without a country code.
+    """
+
+    content_type: t.ClassVar[str] = "text/plain; charset=utf-8"
+
+    #: Maps the gateway's field names to `Request` arguments.
+    fields: t.ClassVar[abc.Mapping[str, str]] = {}
+
+    region: str | None
+    raw_fields: dict[bytes, str]
+
+    def __init__(self, *, region: str = None, fields: abc.Mapping[str, str] = None):
+        self.region = region
+        fields is None or setattr(self, "fields", {**self.fields, **fields})
+        self.raw_fields = {k.encode(): v for k, v in self.fields.items()}
+
+    def parse_fields(self, body: bytes) -> dict[str, str]:
+        raise NotImplementedError(f"{type(self).__name__}.parse_fields()")
+
+    def normalize_msisdn(self, msisdn: str) -> str:
+        return coerce_msisdn(msisdn, self.region)
+
+    def parse(self, body: bytes) -> Request:
+        kwds = self.parse_fields(body)
+        if not (msisdn := kwds.pop("msisdn", None)):
+            raise GatewayError(f"{type(self).__name__}: request has no msisdn")
+        return Request(self.normalize_msisdn(msisdn), **kwds)
+
+    def render(self, request: Request, response) -> bytes:
+        raise NotImplementedError(f"{type(self).__name__}.render()")
+
+    @staticmethod
+    def split_response(response) -> tuple[bool, str]:
+        """Split a response into whether it ends the session and its text."""
+        kind, _, text = str(response).partition(" ")
+        return kind == ResponseType.END, text
+
+    async def __call__(self, app: "App", body: bytes) -> bytes:
+        request = self.parse(body)
+        return self.render(request, await app(request))
@@ -0,0 +1,29 @@
+from urllib.parse import unquote_plus
+
+from mobilex.core import Request
+
+from .base import BaseGateway
+
+
+class FormGateway(BaseGateway):
+    """Form-encoded POST callbacks answered with `CON`/`END` plain text, as
+    used by Africa's Talking and similar aggregators."""
+
+    fields = {
+        "sessionId": "session_id",
+        "serviceCode": "service_code",
+        "phoneNumber": "msisdn",
+        "text": "ussd_string",
+    }
+
+    def parse_fields(self, body: bytes) -> dict[str, str]:
+        rv, fields = {}, self.raw_fields
+        for part in body.split(b"&"):
+            name, _, value = part.partition(b"=")
+            if (key := fields.get(name)) is not None:
+                value = value.decode()
+                rv[key] = unquote_plus(value) if "%" in value or "+" in value else value
+        return rv
+
+    def render(self, request: Request, response) -> bytes:
+        return str(response).encode()
@@ -0,0 +1,35 @@
+import json
+
+from mobilex.core import Request
+
+from .base import BaseGateway
+
+
+class JsonGateway(BaseGateway):
+    """JSON callbacks answered with a JSON object holding the message and
+    whether it ends the session."""
+
+    content_type = "application/json"
+
+    fields = {
+        "sessionId": "session_id",
+        "serviceCode": "service_code",
+        "msisdn": "msisdn",
+        "ussdString": "ussd_string",
+    }
+
+    message_field = "message"
+    end_field = "end"
+
+    def parse_fields(self, body: bytes) -> dict[str, str]:
+        data, fields = json.loads(body), self.fields
+        return {
+            fields[k]: v if isinstance(v, str) else str(v)
+            for k, v in data.items()
+            if k in fields and v is not None
+        }
+
+    def render(self, request: Request, response) -> bytes:
+        end, text = self.split_response(response)
+        data = {self.message_field: text, self.end_field: end}
+        return json.dumps(data, ensure_ascii=False).encode()
@@ -0,0 +1,56 @@
+import re
+from xml.sax.saxutils import escape, unescape
+
+from mobilex.core import Request
+
+from .base import BaseGateway
+
+
+class SoapGateway(BaseGateway):
+    """SOAP-lite XML callbacks as sent by operator USSD gateways.
+
+    The body is not parsed as a document. The fields are picked out of the
+    raw bytes by their element names, whatever their namespace prefix.
+    """
+
+    content_type = "text/xml; charset=utf-8"
+
+    fields = {
+        "sessionId": "session_id",
+        "serviceCode": "service_code",
+        "msisdn": "msisdn",
+        "ussdString": "ussd_string",
+    }
+
+    envelope = (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<soapenv:Envelope xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/">'
+        "<soapenv:Body><ussdResponse>"
+        "<sessionId>{session_id}</sessionId><msisdn>{msisdn}</msisdn>"
+        "<action>{action}</action><message>{message}</message>"
+        "</ussdResponse></soapenv:Body></soapenv:Envelope>"
+    )
+
+    continue_action = "request"
+    end_action = "end"
+
+    def __init__(self, **kwds):
+        super().__init__(**kwds)
+        names = b"|".join(map(re.escape, self.raw_fields))
+        self._field_re = re.compile(rb"<(?:[\w.-]+:)?(%s)>([^<]*)</" % names)
+
+    def parse_fields(self, body: bytes) -> dict[str, str]:
+        fields = self.raw_fields
+        return {
+            fields[name]: unescape(value.decode()) if b"&" in value else value.decode()
+            for name, value in self._field_re.findall(body)
+        }
+
+    def render(self, request: Request, response) -> bytes:
+        end, text = self.split_response(response)
+        return self.envelope.format(
+            session_id=escape(str(request.session_id or "")),
+            msisdn=escape(request.msisdn),
+            action=self.end_action if end else self.continue_action,
+            message=escape(text),
+        ).encode()
@@ -0,0 +1,110 @@
+import json
+import typing as t
+from collections import abc
+from os import PathLike
+
+from .screens.base import Action, ActionSet
+from .screens.templates import Template
+
+MessagesSource = abc.Mapping[str, str] | str | PathLike
+
+
+class Catalog:
+    """The translated messages of a language.
+
+    Translated action sets and templates are built on first use and cached on
+    the catalog, so a request only does dictionary lookups. A catalog without
+    messages returns everything untranslated.
+    """
+
+    __slots__ = ("language", "messages", "page_length", "_actions", "_templates")
+
+    language: str
+    messages: abc.Mapping[str, str]
+    page_length: int | None
+
+    _max_cached: t.ClassVar[int] = 256
+
+    def __init__(
+        self,
+        language: str,
+        messages: abc.Mapping[str, str] = None,
+        *,
+        page_length: int = None,
+    ):
+        self.language, self.page_length = language, page_length
+        self.messages = {k: v for k, v in (messages or {}).items() if v}
+        self._actions, self._templates = {}, {}
+
+    @classmethod
+    def load(cls, language: str, src: MessagesSource, **kwds):
+        """Load a catalog from a mapping or the path of a JSON file of
+        messages."""
+        if not isinstance(src, abc.Mapping):
+            with open(src, encoding="utf-8") as fp:
+                src = json.load(fp)
+        return cls(language, src, **kwds)
+
+    def gettext(self, message: str) -> str:
+        return self.messages.get(message, message)
+
+    def action(self, action: Action) -> Action:
+        if (label := self.messages.get(action.label)) is None:
+            return action
+        return action._replace(label=label)
+
+    def action_set(self, actions: ActionSet) -> ActionSet:
+        if not self.messages or not actions:
+            return actions
+        elif (hit := self._actions.get(id(actions))) and hit[0] is actions:
+            return hit[1]
+        rv = ActionSet(map(self.action, actions))
+        len(self._actions) < self._max_cached or self._actions.clear()
+        self._actions[id(actions)] = actions, rv
+        return rv
+
+    def template(self, template: Template) -> Template:
+        if (msg := self.messages.get(template.source)) is None:
+            return template
+        elif (rv := self._templates.get(template.source)) is None:
+            rv = self._templates[template.source] = Template(msg)
+        return rv
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.language!r})"
+
+
+class Translations(abc.Mapping[str, Catalog]):
+    """The catalogs of all languages served by an app, loaded once."""
+
+    __slots__ = ("default", "_catalogs")
+
+    default: Catalog
+    _catalogs: dict[str, Catalog]
+
+    def __init__(
+        self,
+        default_language: str,
+        languages: abc.Mapping[str, MessagesSource] = None,
+        page_lengths: abc.Mapping[str, int] = None,
+    ):
+        page_lengths, languages = page_lengths or {}, dict(languages or {})
+        languages.setdefault(default_language, {})
+        self._catalogs = {
+            lang: Catalog.load(lang, src, page_length=page_lengths.get(lang))
+            for lang, src in languages.items()
+        }
+        self.default = self._catalogs[default_language]
+
+    def catalog(self, language: str | None) -> Catalog:
+        """The catalog of `language`, falling back to the default language."""
+        return self._catalogs.get(language) or self.default
+
+    def __getitem__(self, language: str) -> Catalog:
+        return self._catalogs[language]
+
+    def __iter__(self):
+        return iter(self._catalogs)
+
+    def __len__(self):
+        return len(self._catalogs)
@@ -0,0 +1,159 @@
+import asyncio
+import time
+import typing as t
+from collections import abc
+from datetime import timedelta
+from inspect import isawaitable
+
+from .utils import to_timedelta
+
+_K = t.TypeVar("_K", bound=abc.Hashable)
+_V = t.TypeVar("_V")
+
+BatchFn = abc.Callable[
+    [list[_K]], abc.Sequence[_V] | abc.Mapping[_K, _V] | abc.Awaitable[t.Any]
+]
+
+
+class Loader(t.Generic[_K, _V]):
+    """Describes how to fetch values for a batch of keys.
+
+    A `Loader` is shared across requests. Each request gets its own
+    `DataLoader` from it (see `Request.get_loader()`), which batches and
+    memoizes loads for the duration of that request. If `ttl` is given,
+    loaded values are also kept in an in-process tier shared by all
+    requests until they expire.
+    """
+
+    __slots__ = "batch_fn", "max_batch_size", "ttl", "maxsize", "_shared"
+
+    batch_fn: BatchFn[_K, _V]
+    _shared: dict[_K, tuple[float, _V]] | None
+
+    def __init__(
+        self,
+        batch_fn: BatchFn[_K, _V],
+        *,
+        max_batch_size: int = None,
+        ttl: float | timedelta = None,
+        maxsize: int = 1024,
+    ):
+        self.batch_fn, self.max_batch_size = batch_fn, max_batch_size
+        self.maxsize = maxsize
+        self.ttl = ttl and to_timedelta(ttl).total_seconds()
+        self._shared = {} if self.ttl else None
+
+    def get_shared(self, key: _K, default=None):
+        if (shared := self._shared) and (it := shared.get(key)):
+            if it[0] > time.monotonic():
+                return it[1]
+            shared.pop(key, None)
+        return default
+
+    def set_shared(self, items: abc.Iterable[tuple[_K, _V]]):
+        if (shared := self._shared) is not None:
+            expires = time.monotonic() + self.ttl
+            for k, v in items:
+                shared.pop(k, None)
+                shared[k] = expires, v
+            while len(shared) > self.maxsize:
+                del shared[next(iter(shared))]
+
+    def clear(self):
+        self._shared and self._shared.clear()
+
+    async def __call__(self, keys: list[_K]) -> list[_V]:
+        if isawaitable(rv := self.batch_fn(keys)):
+            rv = await rv
+        if isinstance(rv, abc.Mapping):
+            return [rv.get(k) for k in keys]
+        elif len(rv := list(rv)) != len(keys):
+            raise ValueError(
+                f"{self.batch_fn!r} returned {len(rv)} values for {len(keys)} keys"
+            )
+        return rv
+
+
+@t.overload
+def loader(batch_fn: BatchFn[_K, _V], /) -> Loader[_K, _V]:
+    ...
+
+
+@t.overload
+def loader(
+    *,
+    max_batch_size: int = None,
+    ttl: float | timedelta = None,
+    maxsize: int = 1024,
+) -> abc.Callable[[BatchFn[_K, _V]], Loader[_K, _V]]:
+    ...
+
+
+def loader(batch_fn=None, /, **options):
+    """Decorate a batch function as a `Loader`."""
+
+    def decorator(fn):
+        return Loader(fn, **options)
+
+    return decorator if batch_fn is None else decorator(batch_fn)
+
+
+class DataLoader(t.Generic[_K, _V]):
+    """Batches and memoizes loads from a `Loader` within a single request.
+
+    Keys requested in the same tick of the event loop are fetched with a
+    single call to the loader's batch function.
+    """
+
+    __slots__ = "loader", "_cache", "_queue", "_tasks"
+
+    loader: Loader[_K, _V]
+    _cache: dict[_K, asyncio.Future]
+    _queue: list[tuple[_K, asyncio.Future]]
+    _tasks: set[asyncio.Task]
+
+    def __init__(self, loader: Loader[_K, _V]):
+        self.loader, self._cache, self._queue, self._tasks = loader, {}, [], set()
+
+    def load(self, key: _K) -> abc.Awaitable[_V]:
+        if (fut := self._cache.get(key)) is None:
+            loop = asyncio.get_running_loop()
+            fut = self._cache[key] = loop.create_future()
+            if (val := self.loader.get_shared(key, fut)) is not fut:
+                fut.set_result(val)
+            else:
+                self._queue or loop.call_soon(self._dispatch)
+                self._queue.append((key, fut))
+        return fut
+
+    async def load_many(self, keys: abc.Iterable[_K]) -> list[_V]:
+        return await asyncio.gather(*map(self.load, keys))
+
+    def prime(self, key: _K, value: _V):
+        if key not in self._cache:
+            fut = self._cache[key] = asyncio.get_running_loop().create_future()
+            fut.set_result(value)
+
+    def clear(self, key: _K = None):
+        self._cache.clear() if key is None else self._cache.pop(key, None)
+
+    def _dispatch(self):
+        queue, self._queue = self._queue, []
+        size = self.loader.max_batch_size or len(queue)
+        for i in range(0, len(queue), size):
+            task = asyncio.ensure_future(self._load_batch(queue[i : i + size]))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _load_batch(self, batch: list[tuple[_K, asyncio.Future]]):
+        keys = [k for k, _ in batch]
+        try:
+            values = await self.loader(keys)
+            self.loader.set_shared(zip(keys, values))
+        except Exception as e:
+            for k, fut in batch:
+                self._cache.pop(k, None)
+                fut.done() or fut.set_exception(e)
+        else:
+            for (_, fut), val in zip(batch, values):
+                fut.done() or fut.set_result(val)
@@ -0,0 +1,233 @@
+import asyncio
+import random
+import time
+import typing as t
+from collections import OrderedDict, abc
+
+if t.TYPE_CHECKING:
+    from .cache.redis import RedisCache
+    from .core import Request
+
+
+class TokenBucket:
+    """An in-process token bucket refilled at `rate` tokens per second up to
+    `capacity` tokens."""
+
+    __slots__ = ("rate", "capacity", "_tokens", "_updated_at", "_lock")
+
+    rate: float
+    capacity: float
+
+    def __init__(self, rate: float, capacity: float = None):
+        assert rate > 0, f"rate must be positive, got {rate!r}"
+        self.rate, self.capacity = rate, rate if capacity is None else capacity
+        self._tokens, self._updated_at = self.capacity, time.monotonic()
+        self._lock = asyncio.Lock()
+
+    @property
+    def tokens(self) -> float:
+        self._refill()
+        return self._tokens
+
+    def _refill(self):
+        now, last = time.monotonic(), self._updated_at
+        self._tokens = min(self.capacity, self._tokens + (now - last) * self.rate)
+        self._updated_at = now
+
+    def consume(self, n: float = 1) -> bool:
+        """Take `n` tokens if they are available without waiting."""
+        self._refill()
+        if self._tokens >= n:
+            self._tokens -= n
+            return True
+        return False
+
+    async def acquire(self, n: float = 1) -> t.Literal[True]:
+        """Wait until `n` tokens are available and take them. Requests larger
+        than the capacity are let through once the bucket is full."""
+        n = min(n, self.capacity)
+        async with self._lock:
+            while not self.consume(n):
+                await asyncio.sleep((n - self._tokens) / self.rate)
+        return True
+
+
+class LocalBuckets:
+    """In-process token buckets keyed by an arbitrary key.
+
+    Only the `max_keys` most recently used buckets are kept. An evicted key
+    starts over with a full bucket.
+    """
+
+    __slots__ = ("rate", "burst", "max_keys", "_buckets")
+
+    rate: float
+    burst: float
+    max_keys: int
+
+    def __init__(self, rate: float, burst: float = None, *, max_keys: int = 65536):
+        assert rate > 0, f"rate must be positive, got {rate!r}"
+        self.rate, self.burst = rate, rate if burst is None else burst
+        self.max_keys, self._buckets = max_keys, OrderedDict()
+
+    def hit(self, key: t.Hashable, n: float = 1) -> bool:
+        now, buckets = time.monotonic(), self._buckets
+        if (entry := buckets.get(key)) is None:
+            tokens = self.burst
+            len(buckets) < self.max_keys or buckets.popitem(last=False)
+        else:
+            tokens, last = entry
+            tokens = min(self.burst, tokens + (now - last) * self.rate)
+            buckets.move_to_end(key)
+        if ok := tokens >= n:
+            tokens -= n
+        buckets[key] = tokens, now
+        return ok
+
+
+class RedisBuckets:
+    """Token buckets kept in Redis and shared by all the app's workers.
+
+    Each hit is a single round trip running a Lua script that refills and
+    takes from the bucket atomically, timed by the Redis server's clock.
+    """
+
+    SCRIPT: t.Final = """
+    local rate, burst, n = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+    local now = redis.call("TIME")
+    now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+    local state = redis.call("HMGET", KEYS[1], "tokens", "ts")
+    local tokens = tonumber(state[1]) or burst
+    local ts = tonumber(state[2]) or now
+    tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+    local ok = 0
+    if tokens >= n then
+        tokens, ok = tokens - n, 1
+    end
+    redis.call("HSET", KEYS[1], "tokens", tostring(tokens), "ts", tostring(now))
+    redis.call("PEXPIRE", KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+    return ok
+    """
+
+    rate: float
+    burst: float
+    backend: "RedisCache"
+
+    def __init__(self, backend: "RedisCache", rate: float, burst: float = None):
+        assert rate > 0, f"rate must be positive, got {rate!r}"
+        self.backend, self.rate = backend, rate
+        self.burst = rate if burst is None else burst
+        self._script = None
+
+    def _get_script(self):
+        store = self.backend.store
+        if (rv := self._script) is None or rv.registered_client is not store:
+            rv = self._script = store.register_script(self.SCRIPT)
+        return rv
+
+    async def hit(self, key: t.Hashable, n: float = 1) -> bool:
+        script, key = self._get_script(), self.backend.make_key(f"ratelimit|{key}")
+        return bool(await script(keys=[key], args=[self.rate, self.burst, n]))
+
+
+class RateLimiter:
+    """Limits the requests of each subscriber and of each service code.
+
+    `limits` maps a request attribute, `msisdn` or `service_code`, to its
+    `(rate, burst)` in requests per second. Every hit is first checked
+    against in-process buckets, which reject without any I/O. With a
+    `backend`, allowed hits are then checked against the cluster-wide
+    buckets in Redis. A worker never sees more of a key's traffic than the
+    whole cluster does, so a local rejection is always correct.
+    """
+
+    limits: dict[str, tuple[float, float]]
+
+    def __init__(
+        self,
+        limits: abc.Mapping[str, tuple[float, float] | float],
+        backend: "RedisCache" = None,
+    ):
+        self.limits = {
+            attr: (lim, lim) if isinstance(lim, (int, float)) else tuple(lim)
+            for attr, lim in limits.items()
+            if lim
+        }
+        self._local = {attr: LocalBuckets(*lim) for attr, lim in self.limits.items()}
+        self._shared = backend and {
+            attr: RedisBuckets(backend, *lim) for attr, lim in self.limits.items()
+        }
+
+    async def __call__(self, request: "Request") -> bool:
+        """Record a hit for `request` and return whether it is allowed."""
+        keys = []
+        for attr, buckets in self._local.items():
+            if (key := getattr(request, attr, None)) is not None:
+                if not buckets.hit(key):
+                    return False
+                keys.append((attr, f"{attr}|{key}"))
+        if shared := self._shared:
+            for attr, key in keys:
+                if not await shared[attr].hit(key):
+                    return False
+        return True
+
+
+class LoadShedder:
+    """Sheds requests while the app is overloaded.
+
+    The app is overloaded while more than `max_inflight` requests are in
+    progress, or while the moving average of request latency is above
+    `max_latency` seconds. In the latter case a growing share of requests,
+    at most `max_shed_ratio`, is shed so that the average keeps being
+    updated. The average is forgotten after `window` seconds without any
+    completed requests.
+    """
+
+    __slots__ = (
+        "max_inflight",
+        "max_latency",
+        "max_shed_ratio",
+        "window",
+        "alpha",
+        "inflight",
+        "latency",
+        "shed",
+        "_updated_at",
+    )
+
+    def __init__(
+        self,
+        max_inflight: int = None,
+        max_latency: float = None,
+        *,
+        max_shed_ratio: float = 0.9,
+        window: float = 10.0,
+        alpha: float = 0.2,
+    ):
+        self.max_inflight, self.max_latency = max_inflight, max_latency
+        self.max_shed_ratio, self.window, self.alpha = max_shed_ratio, window, alpha
+        self.inflight, self.latency, self.shed, self._updated_at = 0, 0.0, 0, 0.0
+
+    def admit(self) -> bool:
+        if (mx := self.max_inflight) is not None and self.inflight >= mx:
+            self.shed += 1
+            return False
+        if (mx := self.max_latency) is not None and self.latency > mx:
+            if time.monotonic() - self._updated_at > self.window:
+                self.latency = 0.0
+            elif random.random() < min(self.max_shed_ratio, self.latency / mx - 1):
+                self.shed += 1
+                return False
+        return True
+
+    def enter(self):
+        self.inflight += 1
+
+    def exit(self, latency: float = None):
+        """Count a request out. Without a `latency`, e.g. for a request that
+        was refused after it entered, the average is left as is."""
+        self.inflight -= 1
+        if latency is not None:
+            self.latency += self.alpha * (latency - self.latency)
+            self._updated_at = time.monotonic()
@@ -1,10 +1,12 @@
 import logging
 import typing as t
+from collections import Counter
 
 from .const import ResponseType
-from .exc import ScreenNotFoundError
+from .exc import RedirectLoopError, ScreenNotFoundError, TooManyRedirectsError
 from .responses import RedirectResponse, Response
 from .screens import CON, END, Screen, ScreenState
+from .screens.resume import RESUME_SCREEN, RESUME_STATE, ResumeScreen
 from .utils import ArgumentVector
 
 logger = logging.getLogger(__name__)
@@ -13,10 +15,22 @@ if t.TYPE_CHECKING:
     from . import App, Request, Response
 
 
+def _hop_key(state: "ScreenState", inpt):
+    key = (inpt, *state.items())
+    try:
+        hash(key)
+    except TypeError:
+        return repr(key)
+    return key
+
+
 class Router:
+    redirect_depths: Counter[int]
+
     def __init__(self, name: str = None):
         self.name = name
-        self._registry = {}
+        self._registry = {RESUME_SCREEN: ResumeScreen}
+        self.redirect_depths = Counter()
         self._entry_screen_name = self._home_screen_name = None
 
     # @property
@@ -54,6 +68,10 @@ class Router:
     def home_screen(self, name: str, screen: type[Screen] = None):
         return self.screen(name, screen, home=True)
 
+    def startup(self, app: "App"):
+        for screen in self._registry.values():
+            screen.warmup(app)
+
     def get_screen(self, name: str):
         try:
             return self._registry[name]
@@ -102,8 +120,15 @@ class Router:
 
         if session.restored:
             screen = self.get_screen(state.screen)
-            if request.args or not screen._meta.restore_sessions:
+            if request.args or not (mode := screen._meta.restore_sessions):
                 session.reset()
+            else:
+                session.reset_restored()
+                if mode == "prompt":
+                    session[RESUME_STATE] = state
+                    session.state = state = self.create_new_state(
+                        RESUME_SCREEN, self.get_screen(RESUME_SCREEN)
+                    )
 
         if session.is_new:
             name, screen = self.get_entry_screen(with_name=True)
@@ -118,38 +143,50 @@ class Router:
     async def dispatch_to_screen(
         self, request: "Request", state: "ScreenState", inpt=None, /, *args
     ):
-        screen = self.create_screen(state, request)
-
-        try:
-            res = await screen(request, inpt)
-        except Exception as e:  # pragma: no cover
-            logger.exception(e)
-            raise e
+        session, history = request.session, request.history
+        budget, seen = request.app.config.max_redirects, set()
+        depth = 0
+        while True:
+            screen = self.create_screen(state, request)
+            try:
+                res = await screen(request, inpt)
+            except Exception as e:  # pragma: no cover
+                logger.exception(e)
+                raise e
+
+            if not isinstance(res, RedirectResponse):
+                break
+            elif (depth := depth + 1) > budget:
+                raise TooManyRedirectsError(
+                    f"exceeded {budget} redirects", screen=res.to, depth=depth
+                )
 
-        if isinstance(res, RedirectResponse):
             if res.type == ResponseType.POP:
-                if not (ores := await request.history.pop(res.to)):
-                    state = request.session.state = self.create_new_state(
-                        *self.get_home_screen(with_name=True)
-                    )
-                    state.update(res.ctx)
+                if not (ores := await history.pop(res.to)):
+                    state = self.create_new_state(*self.get_home_screen(with_name=True))
                 else:
-                    state = request.session.state = self.create_new_state(
-                        ores.to, self.get_screen(ores.to)
-                    )
-                    state.update(ores.ctx), state.update(res.ctx)
-                return await self.dispatch_to_screen(request, state, *args)
+                    state = self.create_new_state(ores.to, self.get_screen(ores.to))
+                    state.update(ores.ctx)
+                state.update(res.ctx)
             else:
-                state = request.session.state = self.create_new_state(
-                    res.to, self.get_screen(res.to)
-                )
+                state = self.create_new_state(res.to, self.get_screen(res.to))
                 state.update(res.ctx)
-
-                await request.history.push(res)
+                await history.push(res)
                 res.content is None or (args := (res.content,) + args)
-                return await self.dispatch_to_screen(request, state, *args)
 
-        request.session.state = screen.state
+            inpt, args = (args[0], args[1:]) if args else (None, ())
+            if (key := _hop_key(state, inpt)) in seen:
+                raise RedirectLoopError(
+                    f"redirect cycle detected at {state.screen!r}",
+                    screen=state.screen,
+                    depth=depth,
+                )
+            seen.add(key)
+            session.state = state
+
+        request.redirects = depth
+        self.redirect_depths[depth] += 1
+        session.state = screen.state
         assert isinstance(
             res, (str, Response)
         ), "Screen must return Response object or string."
@@ -8,14 +8,20 @@ from .base import (
     ScreenType,
     UssdPayload,
 )
+from .lists import ListScreen
+from .resume import ResumeScreen
+from .templates import Template
 
 __all__ = [
     "CON",
     "END",
     "Action",
     "ActionSet",
+    "ListScreen",
+    "ResumeScreen",
     "Screen",
     "ScreenState",
     "ScreenType",
+    "Template",
     "UssdPayload",
 ]
@@ -3,17 +3,29 @@ import sys
 import typing as t
 from collections import ChainMap, UserString, abc
 from copy import copy
-from inspect import isawaitable
+from datetime import timedelta
+from functools import lru_cache, partial
+from inspect import (
+    getattr_static,
+    isawaitable,
+    iscoroutinefunction,
+    isfunction,
+    unwrap,
+)
 from logging import getLogger
-from operator import attrgetter
 from typing import Any, Iterator
+from weakref import WeakValueDictionary
 
 from .. import exc
 from ..responses import Response, redirect
+from ..utils import encoding, to_timedelta
 from ..utils.types import NamespaceDict
+from .templates import Template
 
 if t.TYPE_CHECKING:
     from mobilex import App, Request
+    from mobilex.i18n import Catalog
+    from mobilex.loaders import BatchFn, DataLoader, Loader
     from mobilex.sessions import Session
 
 
@@ -35,7 +47,77 @@ NL = "\r\n" if sys.platform == "win32" else "\n"
 
 
 class ScreenMetaOptions:
-    pass
+    """Per-class screen options and facts, computed once at class creation.
+
+    Options are declared on an inner `class Meta` and inherited from the
+    parent screen's options. The remaining facts are derived from the class
+    itself so that the request path does not have to introspect the screen.
+    A sync `init` or `render` that returns an awaitable must say so with
+    `async_init = True` or `async_render = True` on its `Meta`.
+    """
+
+    __slots__ = (
+        "restore_sessions",
+        "session_ttl",
+        "static_actions",
+        "static_nav_actions",
+        "async_init",
+        "async_render",
+        "next_page_key",
+        "prev_page_key",
+        "handlers",
+        "template",
+    )
+
+    restore_sessions: bool | t.Literal["prompt"]
+    session_ttl: timedelta | None
+    static_actions: bool
+    static_nav_actions: bool
+    async_init: bool
+    async_render: bool
+    next_page_key: str
+    prev_page_key: str
+    handlers: dict[str | abc.Callable, tuple[abc.Callable, bool | None]]
+    template: Template | None
+
+    def __init__(
+        self, cls: "ScreenType", meta: type = None, base: "ScreenMetaOptions" = None
+    ):
+        self.restore_sessions = getattr(
+            meta, "restore_sessions", base.restore_sessions if base else False
+        )
+        if (ttl := getattr(meta, "session_ttl", cls.session_ttl)) is None and base:
+            self.session_ttl = base.session_ttl
+        else:
+            self.session_ttl = ttl and to_timedelta(ttl)
+        root = next(c for c in reversed(cls.__mro__) if isinstance(c, ScreenType))
+        static, nav_static = (
+            cls.get_actions is root.get_actions,
+            cls.get_nav_actions is root.get_nav_actions,
+        )
+        self.static_actions = static and not _is_descriptor(cls, "actions")
+        self.static_nav_actions = nav_static and not _is_descriptor(cls, "nav_actions")
+        self.async_init = self._is_async(cls, meta, base, "init")
+        self.async_render = self._is_async(cls, meta, base, "render")
+        self.next_page_key = str(cls.next_page_action.key)
+        self.prev_page_key = str(cls.prev_page_action.key)
+        self.handlers = {}
+        if (tpl := getattr(meta, "template", cls.template)) is None and base:
+            self.template = base.template
+        else:
+            self.template = Template(tpl) if isinstance(tpl, str) else tpl
+
+    @staticmethod
+    def _is_async(cls, meta, base, name):
+        if (rv := getattr(meta, f"async_{name}", None)) is not None:
+            return rv
+        elif base and name not in cls.__dict__:
+            return getattr(base, f"async_{name}")
+        return iscoroutinefunction(unwrap(getattr(cls, name)))
+
+
+def _is_descriptor(cls, name):
+    return hasattr(getattr_static(cls, name, None), "__get__")
 
 
 class ScreenState(NamespaceDict):
@@ -58,54 +140,79 @@ class ScreenType(type):
     def __new__(mcls, name, bases, dct):
         super_new = super(ScreenType, mcls).__new__
         cls = super_new(mcls, name, bases, dct)
+        cls._action_set = cls._nav_action_set = cls._dispatch_table = None
+        base = getattr(cls, "_meta", None)
+        cls._meta = cls.META_OPTIONS_CLASS(cls, dct.get("Meta"), base)
         return cls
 
 
 class UssdPayload(UserString):
-    __slots__ = ()
+    __slots__ = ("_parts",)
 
-    def append(self, *objs, sep=" ", end=NL):
-        self.data += f"{sep.join((str(s) for s in objs))}{end}"
+    _parts: list[str]
+
+    @property
+    def data(self) -> str:
+        if len(parts := self._parts) > 1:
+            parts[:] = ("".join(parts),)
+        return parts[0] if parts else ""
+
+    @data.setter
+    def data(self, value: str):
+        self._parts = [value] if value else []
 
-    def paginate(self, page_size, next_page_choice, prev_page_choice, foot=""):
-        if isinstance(foot, (list, tuple, ActionSet)):
+    def append(self, *objs, sep=" ", end=NL):
+        self._parts.append(f"{sep.join((str(s) for s in objs))}{end}")
+
+    def clear(self):
+        self._parts.clear()
+
+    def paginate(
+        self,
+        page_size,
+        next_page_choice,
+        prev_page_choice,
+        foot="",
+        *,
+        transliterate=False,
+    ):
+        """Split the payload into pages of at most `page_size` GSM-7 septets.
+
+        Each page is measured in the encoding it will be sent in, so a page
+        with characters outside of GSM-7 holds fewer characters. With
+        `transliterate`, such characters are first replaced with GSM-7
+        equivalents where possible.
+        """
+        if isinstance(foot, ActionSet):
+            foot = foot.text
+        elif isinstance(foot, (list, tuple)):
             # foot_list = None  # foot[:1]+[str(next_page_choice), ]+foot[1:]
             foot = NL.join(map(str, foot))
         # else:
         #     foot_list = None
 
-        foot = foot and f"{NL}{foot}"
-        lfoot = len(foot)
-        if len(self.data.strip()) + lfoot <= page_size:
-            yield self.data.strip() + foot
+        foot, data = foot and f"{NL}{foot}", self.data.strip()
+        if transliterate:
+            foot, data = encoding.transliterate(foot), encoding.transliterate(data)
+
+        if encoding.ussd_length(data + foot) <= page_size:
+            yield data + foot
         else:
-            lnext, lprev = len(str(next_page_choice)) + len(NL), len(
-                str(prev_page_choice)
-            )
-            lnav = lnext + lprev
-            chunk, i = self.data.strip(), 0
+            nxt, prev = str(next_page_choice), str(prev_page_choice)
+            chunk, i = data, 0
             while chunk:
-                lc = len(chunk)
-                if i > 0 and lc <= lprev + page_size:
-                    yield f"{chunk}{NL}{prev_page_choice}"
+                last = i > 0 and f"{chunk}{NL}{prev}"
+                if last and encoding.ussd_length(last) <= page_size:
+                    yield last
                     chunk = None
                 else:
+                    tail = f"{NL}{prev}{NL}{nxt}" if i > 0 else f"{NL}{nxt}{NL}{foot}"
                     yv = re.sub(
                         rf"([{NL}]+[^{NL}]+[{NL}]*)$",
                         "",
-                        chunk[
-                            : (page_size - lnav if i > 0 else page_size - lfoot - lnext)
-                        ],
+                        chunk[: encoding.fit(chunk, page_size, tail)],
                     ).strip()
-                    if i > 0:
-                        yield f"{yv}{NL}{prev_page_choice}{NL}{next_page_choice}"
-                    else:
-                        # if foot_list:
-                        #     yield "%s\n%s" % (yv, "\n".join(foot_list))
-                        # else:
-                        #     yield "%s\n%s\n%s" % (yv, next_page_choice, foot)
-                        yield f"{yv}{NL}{next_page_choice}{NL}{foot}"
-
+                    yield f"{yv}{tail}"
                     chunk = chunk[len(yv) + 1 :].strip()
                 i += 1
 
@@ -113,6 +220,15 @@ class UssdPayload(UserString):
     #     return self.data.strip()
 
 
+def paginate(
+    data: str, page_size: int, next: str, prev: str, foot="", transliterate=False
+) -> abc.Iterator[str]:
+    """Paginate `data` with `UssdPayload.paginate`."""
+    return UssdPayload(data).paginate(
+        page_size, next, prev, foot, transliterate=transliterate
+    )
+
+
 class Action(t.NamedTuple):
     label: str
     handler: str | abc.Callable = None
@@ -123,13 +239,7 @@ class Action(t.NamedTuple):
     name: str = None
 
     def handle(self, screen: "Screen", value: str):
-        args, kwds = self.args or (), self.kwargs or {}
-        if (to := self.screen) is not None:
-            return redirect(to, *args, **kwds)
-        elif callable(func := self.handler or "handle"):
-            return func(screen, value, *args, **kwds)
-        elif isinstance(func, str):
-            return getattr(screen, func)(value, *args, **kwds)
+        return screen.compile_action(self)(screen, value)
 
     def __str__(self):
         return "" if self.key is None else f"{self.key:<2} {self.label}"
@@ -138,6 +248,30 @@ class Action(t.NamedTuple):
         return self.key is not None
 
 
+class CompiledAction(t.NamedTuple):
+    """An `Action` resolved against a screen class.
+
+    `is_async` is `None` when the handler could not be classified up front,
+    in which case its return value is checked on each call.
+    """
+
+    func: abc.Callable
+    args: tuple
+    kwargs: abc.Mapping
+    is_async: bool | None
+
+    def __call__(self, screen: "Screen", value: str):
+        return self.func(screen, value, *self.args, **self.kwargs)
+
+
+def _redirect_action(screen, value, to, *args, **kwds):
+    return redirect(to, *args, **kwds)
+
+
+def _call_attr(name, screen, value, *args, **kwds):
+    return getattr(screen, name)(value, *args, **kwds)
+
+
 _null_act = Action(None)
 
 
@@ -146,19 +280,42 @@ class _ActionDict(dict[str, _AT]):
 
 
 class ActionSet(abc.Set[_AT]):
-    __slots__ = ("_chain", "_src")
+    """An immutable, ordered set of actions indexed by key and by name.
+
+    Sets built from hashable actions are interned, so identical menus share
+    a single instance (and its rendered text and merges) across sessions.
+    """
+
+    __slots__ = ("_src", "_names", "_text", "_merged", "__weakref__")
+
     _src: abc.Mapping[str, _AT]
-    _chain: ChainMap[str, _AT]
+    _names: abc.Mapping[str, _AT]
+    _text: str | None
+    _merged: dict[int, tuple["ActionSet", "ActionSet"]]
+
+    _interned: t.ClassVar[WeakValueDictionary] = WeakValueDictionary()
+    _max_merged: t.ClassVar[int] = 64
 
     def __new__(cls, it: abc.Iterable[_AT] = ()):
-        self = object.__new__(cls)
-        self._src = _ActionDict(
+        if type(it) is cls:
+            return it
+        src = _ActionDict(
             it._src
             if isinstance(it, ActionSet)
             else it
             if isinstance(it, _ActionDict)
             else cls._parse_src(it)
         )
+        try:
+            ikey = cls, tuple(src.values())
+            if (self := cls._interned.get(ikey)) is not None:
+                return self
+        except TypeError:
+            ikey = None
+        self = object.__new__(cls)
+        self._src, self._text, self._merged = src, None, {}
+        self._names = {a.name: a for a in src.values() if a.name is not None}
+        ikey is None or cls._interned.setdefault(ikey, self)
         return self
 
     @classmethod
@@ -178,6 +335,13 @@ class ActionSet(abc.Set[_AT]):
     def _to_key(cls, obj):
         return str(obj.key if isinstance(obj, Action) else obj)
 
+    @property
+    def text(self) -> str:
+        """The menu text of the actions, one per line."""
+        if (rv := self._text) is None:
+            rv = self._text = NL.join(map(str, self))
+        return rv
+
     def __ror__(self, x: object):
         if not isinstance(x, abc.Iterable):
             return NotImplemented
@@ -188,7 +352,16 @@ class ActionSet(abc.Set[_AT]):
             if not isinstance(x, abc.Iterable):
                 return NotImplemented
             x = self.__class__(x)
-        return self.__class__(_ActionDict(self._src | x._src))
+        if not x._src or x is self:
+            return self
+        elif not self._src:
+            return x
+        elif (hit := self._merged.get(id(x))) is not None and hit[0] is x:
+            return hit[1]
+        rv = self.__class__(_ActionDict(self._src | x._src))
+        len(self._merged) < self._max_merged or self._merged.clear()
+        self._merged[id(x)] = x, rv
+        return rv
 
     def __contains__(self, x: object) -> bool:
         return self._to_key(x) in self._src
@@ -208,15 +381,24 @@ class ActionSet(abc.Set[_AT]):
     def get(self, key, default: _DT = None):
         return self._src.get(self._to_key(key), default)
 
+    def get_by_name(self, name: str, default: _DT = None):
+        return self._names.get(name, default)
+
     def keys(self):
         return self._src.keys()
 
-    # def names(self):
-    #     return self._src.maps[1].keys()
+    def names(self):
+        return self._names.keys()
+
+
+async def _async_action_set(actions: abc.Awaitable[abc.Iterable[Action]]):
+    return ActionSet(await actions)
 
 
 class Screen(t.Generic[T], metaclass=ScreenType):
-    # META_OPTIONS_CLASS = ScreenMetaOptions
+    META_OPTIONS_CLASS: t.ClassVar[type[ScreenMetaOptions]] = ScreenMetaOptions
+
+    __slots__ = ("request", "app", "session", "state", "payload", "_acts")
 
     CON = CON
 
@@ -224,18 +406,26 @@ class Screen(t.Generic[T], metaclass=ScreenType):
 
     exit_code = CON
 
+    session_ttl: t.ClassVar[t.Optional[float | timedelta]] = None
+
+    template: t.ClassVar[t.Optional[str]] = None
+
     init: t.ClassVar[t.Optional[t.Callable]] = None
     validate: t.ClassVar[t.Optional[t.Callable]] = None
 
     request: "Request"
-    app: "App" = property(attrgetter("request.app"))
-    session: "Session" = property(attrgetter("request.session"))
+    app: "App"
+    session: "Session"
     state: ScreenState
+    payload: UssdPayload
 
     _meta: t.ClassVar[ScreenMetaOptions]
     _payload_class: type[UssdPayload] = UssdPayload
     _state_class: type[ScreenState] = ScreenState
-    _has_actions: bool = False
+    _acts: ActionSet | None
+    _action_set: t.ClassVar[t.Optional["ActionSet"]] = None
+    _nav_action_set: t.ClassVar[t.Optional["ActionSet"]] = None
+    _dispatch_table: t.ClassVar[t.Optional[dict[str, CompiledAction]]] = None
 
     actions = None
 
@@ -253,7 +443,7 @@ class Screen(t.Generic[T], metaclass=ScreenType):
     prev_page_action = Action("Back", key="0")
 
     def __init__(self, state):
-        self.state = state
+        self.state, self._acts = state, None
         self.payload = self._payload_class("")
 
     @t.overload
@@ -273,8 +463,60 @@ class Screen(t.Generic[T], metaclass=ScreenType):
     def get_nav_actions(self):
         return self.nav_actions or ()
 
+    @classmethod
+    def warmup(cls, app: "App"):
+        """Prepare per-class artefacts ahead of the first request."""
+        if cls._meta.static_actions:
+            cls._action_set = ActionSet(cls.actions or ())
+        if cls._meta.static_nav_actions:
+            cls._nav_action_set = ActionSet(cls.nav_actions or ())
+        if cls._action_set is not None and cls._nav_action_set is not None:
+            acts = (*cls._nav_action_set, *cls._action_set)
+            cls._dispatch_table = {str(a.key): cls.compile_action(a) for a in acts}
+            cls._dispatch_table[None] = cls.compile_action(_null_act)
+        for catalog in app.translations.values():
+            cls._action_set and catalog.action_set(cls._action_set)
+            cls._nav_action_set and catalog.action_set(cls._nav_action_set)
+            cls._meta.template and catalog.template(cls._meta.template)
+
+    @classmethod
+    def resolve_handler(cls, handler: str | abc.Callable):
+        """Resolve an action handler to a `(func, is_async)` pair where `func`
+        takes the screen as its first argument.
+
+        Results are cached per class for handler names and module or class
+        level functions only, so that handlers created per request, e.g.
+        closures, are not kept alive.
+        """
+        if not isinstance(handler, str):
+            if not isfunction(handler):
+                return handler, None
+            elif "<locals>" in handler.__qualname__:
+                return handler, iscoroutinefunction(handler)
+        if (rv := cls._meta.handlers.get(handler)) is None:
+            func = handler
+            if isinstance(handler, str):
+                func = getattr_static(cls, handler, None)
+                isfunction(func) or (func := partial(_call_attr, handler))
+            is_async = iscoroutinefunction(func) if isfunction(func) else None
+            rv = cls._meta.handlers[handler] = func, is_async
+        return rv
+
+    @classmethod
+    def compile_action(cls, action: Action) -> CompiledAction:
+        args, kwds = action.args or (), action.kwargs or {}
+        if (to := action.screen) is not None:
+            return CompiledAction(_redirect_action, (to, *args), kwds, False)
+        func, is_async = cls.resolve_handler(action.handler or "handle")
+        return CompiledAction(func, args, kwds, is_async)
+
     def get_action_set(self):
-        return ActionSet(self.get_actions())
+        own = getattr(self, "__dict__", ())
+        if (rv := self._action_set) is not None and "actions" not in own:
+            return rv
+        elif isawaitable(acts := self.get_actions()):
+            return _async_action_set(acts)
+        return ActionSet(acts)
 
     # def get_pagination_action_set(self):
     #     return ActionSet(self.get_pagination_actions())
@@ -286,13 +528,34 @@ class Screen(t.Generic[T], metaclass=ScreenType):
     #     return self.prev_page_action or _null_action
 
     def get_nav_action_set(self):
+        own = getattr(self, "__dict__", ())
+        if (rv := self._nav_action_set) is not None and "nav_actions" not in own:
+            return rv
         return ActionSet(self.get_nav_actions())
 
     async def handle(self, inpt):
-        self._has_actions and self.print("Error! Invalid choice.")
+        self._acts and self.print(self.gettext("Error! Invalid choice."))
+
+    def get_catalog(self) -> "Catalog":
+        """The message catalog of the session's language, or that of the
+        subscriber if it was looked up."""
+        lang = self.session.language
+        if lang is None and (sub := self.request.subscriber) is not None:
+            lang = sub.language
+        return self.app.translations.catalog(lang)
+
+    def gettext(self, message: str) -> str:
+        return self.get_catalog().gettext(message)
+
+    def get_template_context(self) -> abc.Mapping[str, t.Any]:
+        ctx = {"screen": self, "state": self.state, "session": self.session}
+        ctx["menu"] = self._acts.text if self._acts else ""
+        return ChainMap(ctx, self.state)
 
     async def render(self):
-        pass
+        if (tpl := self._meta.template) is not None:
+            tpl = self.get_catalog().template(tpl)
+            self.print(tpl.render(self.get_template_context()))
 
     # async def handle_exception(self, e, inpt=None):
     #     if inpt is not None and isinstance(e, exc.ValidationError):
@@ -303,13 +566,13 @@ class Screen(t.Generic[T], metaclass=ScreenType):
 
     async def _async_init(self, inpt=None):
         rv = self.init(inpt)
-        if isawaitable(rv):
+        if self._meta.async_init:
             rv = await rv
         return rv
 
     async def _async_render(self):
         rv = self.render()
-        if isawaitable(rv):
+        if self._meta.async_render:
             rv = await rv
         return rv
 
@@ -325,6 +588,18 @@ class Screen(t.Generic[T], metaclass=ScreenType):
     #         rv = await rv
     #     return rv
 
+    async def _async_dispatch(self, key, inpt, acts, nav_acts):
+        table = self._dispatch_table
+        if table and acts is self._action_set and nav_acts is self._nav_action_set:
+            func = table.get(key) or table[None]
+        else:
+            act = (nav_acts | acts).get(key, _null_act)
+            func = self.compile_action(act)
+        rv = func(self, inpt)
+        if func.is_async or (func.is_async is None and isawaitable(rv)):
+            rv = await rv
+        return rv
+
     async def _async_handle_exception(self, e, inpt=None):
         rv = self.handle_exception(e, inpt)
         if isawaitable(rv):
@@ -334,8 +609,20 @@ class Screen(t.Generic[T], metaclass=ScreenType):
     def abort(self, *args, **kwargs):
         raise exc.ValidationError(*args, **kwargs)
 
+    def send_sms(self, text: str, to: str = None, **kwds) -> str:
+        """Queue an SMS to `to`, or the subscriber, without waiting for it to
+        be sent. Returns its message id."""
+        return self.app.send_sms(to or self.request.msisdn, text, **kwds)
+
+    def loader(self, loader: "Loader | BatchFn") -> "DataLoader":
+        """Get the request-scoped `DataLoader` for `loader`."""
+        return self.request.get_loader(loader)
+
+    def _bind(self, request: "Request"):
+        self.request, self.app, self.session = request, request.app, request.session
+
     async def __call__(self, request: "Request", input: str = None):
-        self.request = request
+        self._bind(request)
         rv, pages, i = None, self.state.get("_pages", []), 0
         current_page = self.state.get("_current_page", 0)
         key = input if input is None else f"{input}".strip()
@@ -345,26 +632,27 @@ class Screen(t.Generic[T], metaclass=ScreenType):
                 rv = await self._async_init(input)
             self.state.__initialized__ = True
 
-        next, prev = self.next_page_action, self.prev_page_action
-        if is_next := key and key == next.key:
+        meta, next, prev = self._meta, self.next_page_action, self.prev_page_action
+        if is_next := key and key == meta.next_page_key:
             if current_page < len(pages) - 1:
                 self.state._current_page = i = current_page + 1
                 rv = self.state._action
-        elif key == prev.key and current_page > 0:
+        elif key == meta.prev_page_key and current_page > 0:
             self.state._current_page = i = current_page - 1
             rv = self.state._action
 
         if rv is None:
             acts, nav_acts = self.get_action_set(), self.get_nav_action_set()
-            self._has_actions = not not acts
+            if isawaitable(acts):
+                acts = await acts
+            self._acts = acts
             if not (key is None or is_next):
-                act = acts.get(key) or nav_acts.get(key) or _null_act
-                if isawaitable(rv := act.handle(self, input)):
-                    rv = await rv
+                rv = await self._async_dispatch(key, input, acts, nav_acts)
 
+            catalog = self.get_catalog()
+            self._acts = acts = catalog.action_set(acts)
             if rv is None:
-                if isawaitable(rv := self.render()):
-                    rv = await rv
+                rv = await self._async_render()
 
             if isinstance(rv, Response):
                 return rv
@@ -372,11 +660,22 @@ class Screen(t.Generic[T], metaclass=ScreenType):
             if rv is None:
                 rv = self.exit_code
 
-            payload = self.payload
-            acts and payload.append(*acts, sep=NL)
-            nav_acts = [] if rv == self.END else nav_acts
-            mx_page_len = request.app.config.max_page_length - 4
-            pages = list(payload.paginate(mx_page_len, next, prev, nav_acts))
+            payload, tpl = self.payload, meta.template
+            acts and not (tpl and "menu" in tpl.fields) and payload.append(acts.text)
+            foot = "" if rv == self.END else catalog.action_set(nav_acts).text
+            conf = request.app.config
+            args = (
+                payload.data,
+                (catalog.page_length or conf.max_page_length) - 4,
+                str(catalog.action(next)),
+                str(catalog.action(prev)),
+                foot,
+                conf.transliterate,
+            )
+            if tpl is None:
+                pages = list(paginate(*args))
+            else:
+                pages = list(catalog.template(tpl).paginate(paginate, *args))
             self.state._action, self.state._pages = rv, pages
             self.state._current_page = i = 1 if is_next and len(pages) > 1 else 0
 
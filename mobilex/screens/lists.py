@@ -0,0 +1,69 @@
+import typing as t
+from collections import abc
+
+from .base import Action, ActionSet, Screen, T
+
+if t.TYPE_CHECKING:
+    from mobilex import Request
+
+
+class ListScreen(Screen[T]):
+    """A menu screen whose items are pulled from a paginated source.
+
+    Subclasses provide the items by implementing `fetch(offset, limit)`, which
+    should seek straight to `offset` in its source (e.g. `OFFSET`/`LIMIT` or a
+    slice). Only the items on the current page are fetched on each hop and only the page cursor is kept in the state.
+    Items are numbered by their position in the source, so a number from
+    another page can still be selected directly. The pages of items are
+    turned with `next_items_action` and `prev_items_action`, whose keys
+    differ from those used to page through overflowing text.
+    """
+
+    __slots__ = ("_page",)
+
+    page_size: t.ClassVar[int] = 5
+    next_items_action: t.ClassVar[Action] = Action("Next", key="98")
+    prev_items_action: t.ClassVar[Action] = Action("Prev", key="97")
+
+    _page: ActionSet
+
+    async def fetch(self, offset: int, limit: int) -> abc.Sequence[T]:
+        """Return up to `limit` items of the source starting at `offset`."""
+        raise NotImplementedError(
+            "subclasses of ListScreen must provide a fetch() method"
+        )
+
+    def get_item_action(self, item: T, key: int) -> Action:
+        if isinstance(item, Action):
+            return item._replace(key=key)
+        return Action(str(item), key=key)
+
+    def get_actions(self):
+        return self._page
+
+    def get_nav_actions(self):
+        state, paging = self.state, []
+        state._has_more and paging.append(self.next_items_action)
+        state._cursor and paging.append(self.prev_items_action)
+        keys = {a.key for a in paging}
+        return [*paging, *(a for a in super().get_nav_actions() if a.key not in keys)]
+
+    async def __call__(self, request: "Request", input: str = None):
+        self._bind(request)
+        state, size = self.state, self.page_size
+        cursor, key = state.get("_cursor", 0), input and f"{input}".strip()
+        if key == str(self.next_items_action.key) and state.get("_has_more"):
+            cursor, input = cursor + size, None
+        elif key == str(self.prev_items_action.key) and cursor > 0:
+            cursor, input = max(cursor - size, 0), None
+
+        items = await self.fetch(cursor, size + 1)
+        state._cursor, state._has_more = cursor, len(items) > size
+        page = [
+            self.get_item_action(it, i) for i, it in enumerate(items[:size], cursor + 1)
+        ]
+        if input and key.isdigit() and not cursor < (i := int(key)) <= cursor + size:
+            if i > 0 and (items := await self.fetch(i - 1, 1)):
+                page.append(self.get_item_action(items[0], i))
+        self._page = ActionSet(page)
+        return await super().__call__(request, input)
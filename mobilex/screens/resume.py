@@ -0,0 +1,34 @@
+from ..responses import redirect
+from .base import Action, Screen
+
+RESUME_SCREEN = "__resume__"
+
+RESUME_STATE = "__resume_state__"
+
+
+class ResumeScreen(Screen):
+    """Asks the subscriber whether to continue a restored session.
+
+    Shown for restored sessions that were left on a screen declaring
+    `restore_sessions = "prompt"`. Register a screen named `RESUME_SCREEN` on
+    the router to customize it.
+    """
+
+    actions = [
+        Action("Continue", "resume"),
+        Action("Start over", "restart"),
+    ]
+
+    nav_actions = []
+
+    def resume(self, *args):
+        state = self.session.pop(RESUME_STATE)
+        data = {k: v for k, v in state.items() if k[:1] != "_" and k != "screen"}
+        return redirect(state.screen, **data)
+
+    def restart(self, *args):
+        self.session.pop(RESUME_STATE, None)
+        return redirect(0)
+
+    def render(self):
+        self.print(self.gettext("Continue where you left off?"))
@@ -0,0 +1,106 @@
+import re
+import typing as t
+from collections import abc
+from string import Formatter
+
+_formatter = Formatter()
+
+_first_re = re.compile(r"[^.[]*")
+_rest_re = re.compile(r"\.([^.[]+)|\[([^\]]+)\]")
+
+
+def _split_field_name(name: str):
+    """Split a field name like `a.b[0]` into `"a"` and its `(is_attr, key)`
+    lookups, as `str.format` does."""
+    first = _first_re.match(name).group()
+    rest, pos = [], len(first)
+    while pos < len(name):
+        if (m := _rest_re.match(name, pos)) is None:
+            raise ValueError(f"invalid field name {name!r}")
+        attr, key = m.groups()
+        if attr is not None:
+            rest.append((True, attr))
+        else:
+            rest.append((False, int(key) if key.isdigit() else key))
+        pos = m.end()
+    return first, rest
+
+
+class _Field(t.NamedTuple):
+    name: str
+    first: str
+    rest: tuple[tuple[bool, t.Any], ...]
+    conversion: str | None
+    spec: str
+
+    def resolve(self, context: abc.Mapping[str, t.Any]):
+        obj = context[self.first]
+        for is_attr, key in self.rest:
+            obj = getattr(obj, key) if is_attr else obj[key]
+        if self.conversion:
+            obj = _formatter.convert_field(obj, self.conversion)
+        return format(obj, self.spec)
+
+
+class Template:
+    """A `str.format` style screen template compiled once into its static
+    fragments and field lookups.
+
+    Fields are resolved from the render context, e.g. `{amount}` from the
+    screen state or `{session.name}`, and support attribute and index access,
+    conversions and format specs. Positional fields such as `{}` or `{0}`
+    are rejected. A template without fields renders to a constant text, and
+    the pages of the payloads it is rendered into are split once and cached
+    on the template.
+    """
+
+    __slots__ = ("source", "fields", "_parts", "text", "_pages")
+
+    source: str
+    fields: frozenset[str]
+    text: str | None
+
+    max_pages: t.ClassVar[int] = 16
+
+    def __init__(self, source: str):
+        self.source, parts, fields = source, [], []
+        for literal, name, spec, conv in _formatter.parse(source):
+            literal and parts.append(literal)
+            if name is not None:
+                first, rest = _split_field_name(name)
+                if not first or first.isdigit():
+                    raise ValueError(
+                        f"positional field {{{name}}} in template {source!r},"
+                        f" use a named field instead"
+                    )
+                field = _Field(name, first, tuple(rest), conv, spec or "")
+                parts.append(field)
+                fields.append(first)
+        self._parts = tuple(parts)
+        self.fields = frozenset(fields)
+        self.text = "".join(parts) if not fields else None
+        self._pages = {} if self.text is not None else None
+
+    @property
+    def is_static(self) -> bool:
+        return self.text is not None
+
+    def render(self, context: abc.Mapping[str, t.Any]) -> str:
+        if (rv := self.text) is not None:
+            return rv
+        return "".join(
+            p if isinstance(p, str) else p.resolve(context) for p in self._parts
+        )
+
+    def paginate(self, paginate: abc.Callable[..., abc.Iterable[str]], *args):
+        """Split a payload rendered from this template into pages with
+        `paginate(*args)`. The pages are cached if the template is static."""
+        if (cache := self._pages) is None:
+            return tuple(paginate(*args))
+        elif (rv := cache.get(args)) is None:
+            len(cache) < self.max_pages or cache.clear()
+            rv = cache[args] = tuple(paginate(*args))
+        return rv
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.source!r})"
@@ -4,9 +4,10 @@ import logging
 import time
 import typing as t
 from collections import abc
+from datetime import timedelta
 from hashlib import md5
 
-from mobilex.utils import to_bytes
+from mobilex.utils import to_bytes, to_timedelta
 from mobilex.utils.types import NamespaceDict
 
 if t.TYPE_CHECKING:
@@ -85,6 +86,14 @@ class Session:
     def state(self, value):
         self.data["__state__"] = value
 
+    @property
+    def language(self) -> str | None:
+        return self.data.get("__language__")
+
+    @language.setter
+    def language(self, value: str | None):
+        self.data["__language__"] = value
+
     def start_request(self, request: "Request") -> t.NoReturn:
         assert not self._is_started
         session_id = request.session_id
@@ -112,6 +121,14 @@ class Session:
     def reset_restored(self):
         self.restored = None
 
+    def __getstate__(self):
+        # The data is stored under its own key by the `SessionManager`.
+        return {k: v for k, v in self.__dict__.items() if k != "data"}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.data = NamespaceDict()
+
     def __contains__(self, key):
         return key in self.data
 
@@ -174,22 +191,36 @@ class NavId(t.NamedTuple):
 
 
 class History:
-    __slots__ = "stack", "key_prefix", "backend", "background", "__weakref__"
+    """The subscriber's navigation stack.
+
+    Entries are written with the history backend's ttl and extended together
+    once half of it has passed since they were last extended, so that they
+    outlive the session without being touched on every hop.
+    """
+
+    __slots__ = "stack", "key_prefix", "backend", "background", "session", "__weakref__"
 
     stack: list[NavId]
     backend: "BaseCache"
     background: list[abc.Awaitable]
+    session: "Session"
 
     def __new__(cls, request: "Request", session: "Session"):
         app, self = request.app, _object_new(cls)
-        self.backend, self.background = app.history_backend, []
+        self.backend, self.background, self.session = app.history_backend, [], session
         self.stack = session.setdefault("__state_stack", [NavId(None, None)])
         self.key_prefix = to_bytes(buri) + b"|" if (buri := request.base_uri) else b""
         return self
 
     async def finalize(self):
-        background = self.background
-        del self.stack, self.background
+        background, stack, session = self.background, self.stack, self.session
+        del self.stack, self.background, self.session
+        now, ttl = time.time(), self.backend.ttl.total_seconds()
+        extended_at = session.get("__history_extended_at") or session.created_at
+        if now - (extended_at or now) >= ttl / 2:
+            if keys := [self.make_key(id) for id in stack if id]:
+                background.append(self.backend.expire_many(keys))
+            session["__history_extended_at"] = now
         background and await asyncio.gather(*background)
 
     def __len__(self):
@@ -214,16 +245,93 @@ class History:
         return self.key_prefix + id.digest()
 
 
+class TTLPolicy:
+    """Decides how long a session is kept after each request.
+
+    In `sliding` mode every request extends the session by its ttl, while in
+    `absolute` mode the session expires its ttl after it was created no matter
+    how active it is. `max_age` caps the lifetime of sliding sessions. The ttl
+    defaults to the `session_ttl` config and may be overridden per screen by
+    setting `session_ttl` on the `Screen` class the session is on, or on its
+    `Meta` options.
+    """
+
+    SLIDING: t.Final = "sliding"
+    ABSOLUTE: t.Final = "absolute"
+
+    def __init__(
+        self, mode: str = SLIDING, *, max_age: float | timedelta = None
+    ) -> None:
+        assert mode in (self.SLIDING, self.ABSOLUTE), f"invalid ttl mode {mode!r}"
+        self.mode, self.max_age = mode, max_age and to_timedelta(max_age)
+
+    def get_screen_ttl(self, req: "Request", session: Session) -> timedelta | None:
+        if (state := session.state) is not None:
+            try:
+                return req.app.router.get_screen(state.screen)._meta.session_ttl
+            except LookupError:
+                return None
+
+    def __call__(self, req: "Request", session: Session) -> timedelta:
+        ttl = self.get_screen_ttl(req, session) or to_timedelta(
+            req.app.config.session_ttl
+        )
+        if self.mode == self.ABSOLUTE:
+            max_age = ttl
+        elif not (max_age := self.max_age):
+            return ttl
+        age = to_timedelta(time.time() - (session.created_at or time.time()))
+        return min(ttl, max_age - age)
+
+
 class SessionManager:
+    """Loads and stores the subscribers' sessions.
+
+    A session is stored in two parts: the `Session` itself, whose fields such
+    as `argv` and `accessed_at` change on every hop, and its `data` under a
+    key of its own. Both are read in a single round trip. The data is only
+    written when it changes, with `data_ttl_factor` times the session's ttl,
+    and is touched once it would otherwise expire before the session.
+    """
+
+    touch_unchanged: bool = True
+    data_ttl_factor: float = 2
+
     def create(self, req: "Request") -> Session:
         con = req.app.config
         return con.session_class(con.session_ttl, req.msisdn, req.session_id)
 
-    async def load(self, req: "Request") -> Session:
-        return await req.app.session_backend.get(self.make_key(req))
-
-    async def persist(self, req: "Request", session) -> None:
-        return await req.app.session_backend.set(self.make_key(req), session)
+    async def load(self, req: "Request") -> Session | None:
+        backend = req.app.session_backend
+        keys = [backend.make_key(k) for k in self.make_keys(req)]
+        (head, _), (data, ttl) = await backend.get_raw_many(keys)
+        if head is None or data is None:
+            return None
+        session, req.session_data = backend.loads(head), (data, ttl)
+        session.data = backend.loads(data)
+        return session
+
+    def get_restore_mode(self, req: "Request", screen: str):
+        try:
+            return req.app.router.get_screen(screen)._meta.restore_sessions
+        except LookupError:
+            return False
+
+    async def persist(self, req: "Request", session):
+        backend, (key, data_key) = req.app.session_backend, self.make_keys(req)
+        if (ttl := req.app.session_ttl_policy(req, session)) <= timedelta(0):
+            return await asyncio.gather(backend.delete(key), backend.delete(data_key))
+        session.ttl = secs = ttl.total_seconds()
+        data_ttl = secs * self.data_ttl_factor
+        items = [(backend.make_key(key), backend.dumps(session), secs)]
+        data, stored = backend.dumps(session.data), req.session_data
+        if not (self.touch_unchanged and stored and stored[0] == data):
+            items.append((backend.make_key(data_key), data, data_ttl))
+        elif stored[1] is not None and stored[1] < secs:
+            return await asyncio.gather(
+                backend.set_raw_many(items), backend.touch(data_key, data_ttl)
+            )
+        return await backend.set_raw_many(items)
 
     async def open(self, request: "Request"):
         session = await self.load(request) or self.create(request)
@@ -242,5 +350,8 @@ class SessionManager:
         )
         await asyncio.gather(*(x for x in tasks if isinstance(x, abc.Awaitable)))
 
+    def make_keys(self, req: "Request") -> tuple[str, str]:
+        return (key := self.make_key(req)), f"{key}|data"
+
     def make_key(self, req: "Request"):
         return f"{req.base_uri}|{req.msisdn}"
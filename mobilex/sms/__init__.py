@@ -0,0 +1,18 @@
+from .messages import DeliveryReport, InboundSms, OutboundSms, SendResult, Status
+from .outbox import Outbox
+from .providers import PROVIDERS, BaseProvider, FakeProvider, get_provider
+from .router import SmsRouter
+
+__all__ = [
+    "PROVIDERS",
+    "BaseProvider",
+    "DeliveryReport",
+    "FakeProvider",
+    "InboundSms",
+    "Outbox",
+    "OutboundSms",
+    "SendResult",
+    "SmsRouter",
+    "Status",
+    "get_provider",
+]
@@ -0,0 +1,57 @@
+import time
+import typing as t
+from uuid import uuid4
+
+
+def _make_id() -> str:
+    return uuid4().hex
+
+
+class Status:
+    QUEUED: t.Final = "queued"
+    SENT: t.Final = "sent"
+    DELIVERED: t.Final = "delivered"
+    FAILED: t.Final = "failed"
+
+
+class OutboundSms(t.NamedTuple):
+    to: str
+    text: str
+    sender: str = None
+    id: str = None
+    attempts: int = 0
+
+    @classmethod
+    def create(cls, to: str, text: str, sender: str = None):
+        return cls(to, text, sender, _make_id())
+
+
+class InboundSms(t.NamedTuple):
+    msisdn: str
+    text: str
+    to: str = None
+    id: str = None
+
+
+class SendResult(t.NamedTuple):
+    """The outcome of sending one message to a provider.
+
+    `retry` marks transient failures that may succeed if sent again.
+    """
+
+    message_id: str
+    ok: bool
+    provider_id: str = None
+    error: str = None
+    retry: bool = False
+
+
+class DeliveryReport(t.NamedTuple):
+    provider_id: str
+    status: str
+    error: str = None
+    timestamp: float = None
+
+    @classmethod
+    def create(cls, provider_id: str, status: str, error: str = None):
+        return cls(provider_id, status, error, time.time())
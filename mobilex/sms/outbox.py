@@ -0,0 +1,160 @@
+import asyncio
+import logging
+import typing as t
+from collections import deque
+from contextlib import suppress
+from datetime import timedelta
+
+from mobilex.ratelimit import TokenBucket
+from mobilex.utils import to_timedelta
+
+from .messages import DeliveryReport, OutboundSms, SendResult, Status
+
+if t.TYPE_CHECKING:
+    from mobilex.cache.base import BaseCache
+
+    from .providers import BaseProvider
+
+
+logger = logging.getLogger(__name__)
+
+
+class Outbox:
+    """Queues outbound messages and sends them to the provider in batches.
+
+    `send()` only enqueues a message, so screens never wait for the provider.
+    A background task lingers for `flush_interval` seconds to fill a batch,
+    then sends up to `batch_size` messages per provider call. Calls are paced
+    by `rate` messages per second. Transient failures are retried up to
+    `max_retries` times with exponential backoff.
+
+    The status of each message is kept in `backend`, along with the provider
+    message id, so that delivery reports can be matched to it.
+    """
+
+    provider: "BaseProvider"
+    backend: "BaseCache"
+
+    def __init__(
+        self,
+        provider: "BaseProvider",
+        backend: "BaseCache",
+        *,
+        batch_size: int = None,
+        flush_interval: float = 0.05,
+        rate: float | TokenBucket = None,
+        max_retries: int = 3,
+        retry_backoff: float = 1.0,
+        report_ttl: float | timedelta = 86400,
+    ):
+        self.provider, self.backend = provider, backend
+        self.batch_size = min(
+            batch_size or provider.max_batch_size, provider.max_batch_size
+        )
+        self.flush_interval, self.max_retries = flush_interval, max_retries
+        self.retry_backoff, self.report_ttl = retry_backoff, to_timedelta(report_ttl)
+        self.rate = TokenBucket(rate) if isinstance(rate, (int, float)) else rate
+        self._queue: deque[OutboundSms] = deque()
+        self._task: asyncio.Task | None = None
+        self._retries: dict[str, asyncio.TimerHandle] = {}
+        self._draining, self._wakeup = False, asyncio.Event()
+
+    def __len__(self):
+        return len(self._queue)
+
+    def send(self, to: str, text: str, *, sender: str = None) -> str:
+        """Queue a message and return its id."""
+        msg = OutboundSms.create(to, text, sender)
+        self._enqueue(msg)
+        return msg.id
+
+    def _enqueue(self, msg: OutboundSms):
+        self._queue.append(msg)
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def _retry(self, msg: OutboundSms):
+        self._retries.pop(msg.id, None)
+        self._enqueue(msg)
+
+    async def _run(self):
+        try:
+            while self._queue:
+                if len(self._queue) < self.batch_size and not self._draining:
+                    with suppress(asyncio.TimeoutError):
+                        await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+                while self._queue:
+                    n = min(len(self._queue), self.batch_size)
+                    await self._send([self._queue.popleft() for _ in range(n)])
+        finally:
+            self._task = None
+
+    async def _send(self, batch: list[OutboundSms]):
+        self.rate and await self.rate.acquire(len(batch))
+        try:
+            results = await self.provider.send_batch(batch)
+        except Exception as e:
+            logger.exception(e)
+            results = [SendResult(m.id, False, error=str(e), retry=True) for m in batch]
+
+        writes, loop = [], asyncio.get_running_loop()
+        found = {res.message_id: res for res in results}
+        for msg in batch:
+            if (res := found.get(msg.id)) is None:
+                logger.warning(f"no send result for message {msg.id!r}")
+                res = SendResult(msg.id, False, error="no result from provider")
+            if res.ok:
+                writes.append(self._record(msg.id, Status.SENT, res.provider_id))
+            elif res.retry and msg.attempts < self.max_retries:
+                msg = msg._replace(attempts=msg.attempts + 1)
+                delay = self.retry_backoff * 2 ** (msg.attempts - 1)
+                self._retries[msg.id] = loop.call_later(delay, self._retry, msg)
+            else:
+                writes.append(self._record(msg.id, Status.FAILED, error=res.error))
+        await asyncio.gather(*writes)
+
+    async def _record(self, message_id, status, provider_id=None, error=None):
+        ttl, entry = self.report_ttl, {"status": status, "error": error}
+        if provider_id is not None:
+            entry["provider_id"] = provider_id
+            await self.backend.set(f"sms-ref|{provider_id}", message_id, ttl=ttl)
+        await self.backend.set(f"sms|{message_id}", entry, ttl=ttl)
+
+    async def status(self, message_id: str) -> dict | None:
+        """The recorded status of a message, or `None` while it is queued."""
+        return await self.backend.get(f"sms|{message_id}")
+
+    async def handle_report(self, report: DeliveryReport) -> str | None:
+        """Record a delivery report and return the id of its message."""
+        key = f"sms-ref|{report.provider_id}"
+        if (message_id := await self.backend.get(key)) is not None:
+            await self._record(
+                message_id, report.status, report.provider_id, report.error
+            )
+        return message_id
+
+    async def flush(self):
+        """Send all queued messages without waiting to fill batches.
+
+        Retries that are still waiting on their backoff are not sent.
+        """
+        self._draining = True
+        self._wakeup.set()
+        try:
+            while (task := self._task) is not None:
+                await task
+        finally:
+            self._draining = False
+            self._wakeup.clear()
+
+    async def close(self):
+        """Flush the queue and close the provider. Messages still waiting to
+        be retried are recorded as failed."""
+        await self.flush()
+        writes = []
+        for message_id, handle in self._retries.items():
+            handle.cancel()
+            writes.append(self._record(message_id, Status.FAILED, error="closed"))
+        self._retries.clear()
+        await asyncio.gather(*writes)
+        await self.provider.close()
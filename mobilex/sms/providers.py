@@ -0,0 +1,68 @@
+import typing as t
+from collections import abc
+from functools import cache
+
+from mobilex.utils import import_string
+
+from .messages import DeliveryReport, OutboundSms, SendResult, Status, _make_id
+
+PROVIDERS = {
+    "fake": "mobilex.sms.providers:FakeProvider",
+}
+
+
+class BaseProvider:
+    """Sends batches of outbound messages through an SMS gateway."""
+
+    max_batch_size: t.ClassVar[int] = 100
+
+    async def send_batch(self, messages: abc.Sequence[OutboundSms]) -> list[SendResult]:
+        raise NotImplementedError(f"{type(self).__name__}.send_batch()")
+
+    async def close(self):
+        pass
+
+
+class FakeProvider(BaseProvider):
+    """A local provider that records the batches it is given.
+
+    Messages to numbers in `fail` are rejected and those to numbers in
+    `flaky` fail with a retryable error the first time they are sent.
+    """
+
+    def __init__(
+        self,
+        *,
+        fail: abc.Iterable[str] = (),
+        flaky: abc.Iterable[str] = (),
+        max_batch_size: int = None,
+    ):
+        self.fail, self.flaky = set(fail), set(flaky)
+        self.batches: list[list[OutboundSms]] = []
+        self.sent: dict[str, OutboundSms] = {}
+        max_batch_size and setattr(self, "max_batch_size", max_batch_size)
+
+    async def send_batch(self, messages: abc.Sequence[OutboundSms]) -> list[SendResult]:
+        self.batches.append(list(messages))
+        rv = []
+        for msg in messages:
+            if msg.to in self.fail:
+                rv.append(SendResult(msg.id, False, error="rejected"))
+            elif msg.to in self.flaky and not msg.attempts:
+                rv.append(SendResult(msg.id, False, error="unavailable", retry=True))
+            else:
+                self.sent[pid := _make_id()] = msg
+                rv.append(SendResult(msg.id, True, pid))
+        return rv
+
+    def report(self, provider_id: str, status: str = Status.DELIVERED):
+        """Make a delivery report for a message sent by this provider."""
+        assert provider_id in self.sent, f"unknown message {provider_id!r}"
+        return DeliveryReport.create(provider_id, status)
+
+
+@cache
+def get_provider(name: str | type[BaseProvider]) -> type[BaseProvider]:
+    if not isinstance(name, str):
+        return name
+    return import_string(PROVIDERS.get(name, name))
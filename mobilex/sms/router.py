@@ -0,0 +1,56 @@
+import typing as t
+from collections import abc
+from inspect import iscoroutinefunction
+
+from .messages import InboundSms
+
+if t.TYPE_CHECKING:
+    from mobilex import App
+
+Handler = abc.Callable[["App", InboundSms, list[str]], t.Any]
+
+
+class SmsRouter:
+    """Dispatches inbound messages to handlers by their first word.
+
+    Keywords are matched case-insensitively. Messages without a matching
+    keyword go to the `default` handler, if any. A handler is called with the
+    app, the message and the remaining words, and may return the text of a
+    reply.
+    """
+
+    def __init__(self, name: str = None):
+        self.name = name
+        self._registry: dict[str, tuple[Handler, bool]] = {}
+        self._default: tuple[Handler, bool] | None = None
+
+    def keyword(self, *keywords: str, handler: Handler = None):
+        def decorator(func: Handler):
+            entry = func, iscoroutinefunction(func)
+            for kw in keywords or (None,):
+                if kw is None:
+                    self._default = entry
+                else:
+                    kw = kw.strip().upper()
+                    assert kw not in self._registry, f"duplicate keyword {kw!r}"
+                    self._registry[kw] = entry
+            return func
+
+        return decorator if handler is None else decorator(handler)
+
+    def default(self, handler: Handler):
+        return self.keyword(handler=handler)
+
+    def resolve(self, text: str) -> tuple[Handler, bool, list[str]] | None:
+        word, *args = (text or "").split() or ("",)
+        if (entry := self._registry.get(word.upper())) is None:
+            if (entry := self._default) is None:
+                return None
+            args = [word, *args] if word else args
+        return *entry, args
+
+    async def __call__(self, app: "App", message: InboundSms) -> str | None:
+        if (match := self.resolve(message.text)) is not None:
+            func, is_async, args = match
+            rv = func(app, message, args)
+            return await rv if is_async else rv
@@ -0,0 +1,62 @@
+import typing as t
+from datetime import timedelta
+
+from mobilex.utils import to_timedelta
+from mobilex.utils.phone import parse_msisdn
+
+if t.TYPE_CHECKING:
+    from .cache.base import BaseCache
+    from .core import Request
+
+
+class Subscriber(t.NamedTuple):
+    msisdn: str
+    country: str = None
+    carrier: str = None
+    language: str = None
+
+
+class SubscriberService:
+    """Looks up subscriber metadata and caches it in the app's cache backend.
+
+    The default `lookup()` derives the country and carrier offline from the
+    number. Subclass it to pull the metadata, e.g. the language preference,
+    from an external system.
+    """
+
+    key_prefix: t.ClassVar[str] = "subscriber"
+
+    def __init__(self, ttl: float | timedelta = 86400, *, languages=None):
+        self.ttl = to_timedelta(ttl)
+        self.languages: dict[str, str] = dict(languages or {})
+
+    def make_key(self, msisdn: str):
+        return f"{self.key_prefix}|{msisdn}"
+
+    async def lookup(self, msisdn: str) -> Subscriber:
+        if (num := parse_msisdn(msisdn)) is None:
+            return Subscriber(msisdn)
+
+        import phonenumbers
+        from phonenumbers import carrier
+
+        country = phonenumbers.region_code_for_number(num)
+        return Subscriber(
+            msisdn,
+            country,
+            carrier.name_for_number(num, "en") or None,
+            self.languages.get(country),
+        )
+
+    async def get(self, backend: "BaseCache", msisdn: str) -> Subscriber:
+        key = self.make_key(msisdn)
+        if (rv := await backend.get(key)) is None:
+            rv = await self.lookup(msisdn)
+            await backend.set(key, rv, ttl=self.ttl)
+        return rv
+
+    async def update(self, backend: "BaseCache", subscriber: Subscriber):
+        await backend.set(self.make_key(subscriber.msisdn), subscriber, ttl=self.ttl)
+
+    async def __call__(self, request: "Request") -> Subscriber:
+        return await self.get(request.app.cache, request.msisdn)
@@ -2,6 +2,7 @@ import re
 import typing as t
 from collections import abc
 from datetime import timedelta
+from importlib import import_module
 
 _ussd_split_re = r"\*(?=(?:[^\"]*\"[^\"]*\")*[^\"]*$)"
 
@@ -16,6 +17,16 @@ def to_timedelta(
     return val if isinstance(val, timedelta) else (val or 0) * resolution
 
 
+def import_string(path: str):
+    """Import an object from a `"package.module:attr"` or
+    `"package.module.attr"` path."""
+    mod, _, attr = path.rpartition(":") if ":" in path else path.rpartition(".")
+    try:
+        return getattr(import_module(mod), attr)
+    except AttributeError as e:
+        raise ImportError(f"module {mod!r} has no attribute {attr!r}") from e
+
+
 def split_argstr(s):
     return re.split(_ussd_split_re, s) if s else ()
 
@@ -29,7 +40,7 @@ class ArgumentVector(list[str]):
         *,
         service_code=None,
         argstr: str = None,
-        base_code=None
+        base_code=None,
     ):
         if argstr is not None:
             if base_code and argstr.startswith(base_code):
@@ -0,0 +1,119 @@
+"""Length accounting for the encodings used on USSD bearers.
+
+Handsets receive USSD text either in the GSM 03.38 7-bit default alphabet or,
+when the text has a character outside of it, in UCS-2. Page limits are
+expressed in GSM-7 septets, so a UCS-2 page holds less than half as many
+characters.
+"""
+
+import typing as t
+import unicodedata
+from functools import lru_cache
+
+GSM7: t.Final = "gsm7"
+UCS2: t.Final = "ucs2"
+
+GSM7_BASIC: t.Final = frozenset(
+    "@£$¥èéùìòÇ\nØø\rÅåΔ_ΦΓΛΩΠΨΣΘΞÆæßÉ !\"#¤%&'()*+,-./0123456789:;<=>?"
+    "¡ABCDEFGHIJKLMNOPQRSTUVWXYZÄÖÑÜ§¿abcdefghijklmnopqrstuvwxyzäöñüà"
+)
+
+GSM7_EXTENDED: t.Final = frozenset("\f^{}\\[~]|€")
+
+_GSM7 = GSM7_BASIC | GSM7_EXTENDED
+_GSM7_EXT = tuple(GSM7_EXTENDED)
+
+_translit_table = str.maketrans(
+    {
+        **dict.fromkeys("‘’‚‛′`´", "'"),
+        **dict.fromkeys("“”„‟″«»", '"'),
+        **dict.fromkeys("‐‑‒–—―−", "-"),
+        **dict.fromkeys("\xa0\u2002\u2003\u2009\u200a\u202f", " "),
+        **dict.fromkeys("\u200b\u200c\u200d\ufeff", None),
+        "…": "...",
+        "•": "*",
+        "·": ".",
+        "×": "x",
+        "©": "(c)",
+        "®": "(R)",
+        "™": "TM",
+    }
+)
+
+
+def is_gsm7(s: str) -> bool:
+    return _GSM7.issuperset(s)
+
+
+def gsm7_length(s: str) -> int | None:
+    """The number of septets `s` takes in GSM-7 or `None` if it cannot be
+    encoded in GSM-7. Extension table characters take two septets."""
+    if _GSM7.issuperset(s):
+        return len(s) + sum(map(s.count, _GSM7_EXT))
+
+
+def ucs2_length(s: str) -> int:
+    """The number of UCS-2 code units `s` takes. Characters outside of the
+    BMP take two."""
+    return len(s) if s.isascii() else len(s.encode("utf-16-le")) // 2
+
+
+def ucs2_capacity(septets: int) -> int:
+    """The number of UCS-2 code units that fit in the space of `septets`."""
+    return septets * 7 // 16
+
+
+def detect_encoding(s: str) -> str:
+    return GSM7 if _GSM7.issuperset(s) else UCS2
+
+
+def ussd_length(s: str) -> int:
+    """The length of `s` in GSM-7 septets when sent in the cheapest encoding
+    it fits in."""
+    if (rv := gsm7_length(s)) is None:
+        rv = -(-ucs2_length(s) * 16 // 7)
+    return rv
+
+
+def fit(s: str, size: int, reserve: str = "") -> int:
+    """The number of leading characters of `s` that fit in a page of `size`
+    septets, along with `reserve`.
+
+    The page switches to UCS-2 at the first character outside of GSM-7 and
+    the remaining space is counted in UCS-2 from there on.
+    """
+    if (septets := gsm7_length(reserve)) is None:
+        septets = size + 1
+    units, cap = ucs2_length(reserve), ucs2_capacity(size)
+    for i, c in enumerate(s):
+        u = 1 if c <= "\uffff" else 2
+        if septets <= size:
+            if c in GSM7_BASIC:
+                septets += 1
+            elif c in GSM7_EXTENDED:
+                septets += 2
+            else:
+                septets = size + 1
+        if (units := units + u) > cap and septets > size:
+            return i
+    return len(s)
+
+
+@lru_cache(1024)
+def _transliterate_char(c: str) -> str:
+    if c in _GSM7:
+        return c
+    elif (rv := c.translate(_translit_table)) != c:
+        return rv
+    rv = "".join(
+        x for x in unicodedata.normalize("NFKD", c) if not unicodedata.combining(x)
+    )
+    return rv if rv and _GSM7.issuperset(rv) else c
+
+
+def transliterate(s: str) -> str:
+    """Replace characters outside of GSM-7 with close GSM-7 equivalents where
+    there is one, e.g. typographic quotes, dashes and accented letters."""
+    if _GSM7.issuperset(s):
+        return s
+    return "".join(map(_transliterate_char, s))
@@ -0,0 +1,51 @@
+"""MSISDN normalization backed by `phonenumbers`, with the parsed results
+cached since gateways send the same few subscribers over and over."""
+
+import typing as t
+from functools import lru_cache
+
+if t.TYPE_CHECKING:
+    from phonenumbers import PhoneNumber
+
+
+@lru_cache(65536)
+def parse_msisdn(number: str, region: str = None) -> t.Optional["PhoneNumber"]:
+    """Parse `number`, returning `None` if it is not a valid phone number.
+
+    Numbers without a `+` are parsed as national numbers of `region`, or as
+    international numbers if no region is given, so without a region a
+    national number such as `0712345678` does not parse. Invalid numbers are
+    cached too, so they are not parsed again.
+    """
+    import phonenumbers
+
+    src = number if region or number.startswith("+") else f"+{number}"
+    try:
+        num = phonenumbers.parse(src, region)
+    except phonenumbers.NumberParseException:
+        return None
+    return num if phonenumbers.is_valid_number(num) else None
+
+
+@lru_cache(65536)
+def _format(number: str, region: str = None) -> str | None:
+    if (num := parse_msisdn(number, region)) is not None:
+        import phonenumbers
+
+        return phonenumbers.format_number(num, phonenumbers.PhoneNumberFormat.E164)[1:]
+
+
+def normalize_msisdn(number: str, region: str = None) -> str:
+    """Normalize `number` to its E.164 digits without the leading `+`.
+
+    Raises `ValueError` if `number` is not a valid phone number.
+    """
+    if (rv := _format(number, region)) is None:
+        raise ValueError(f"invalid phone number {number!r}")
+    return rv
+
+
+def coerce_msisdn(number: str, region: str = None) -> str:
+    """Like `normalize_msisdn()` but returns `number` as is if it is not a
+    valid phone number."""
+    return _format(number, region) or number
@@ -0,0 +1,104 @@
+import time
+from unittest.mock import patch
+
+import pytest
+
+from mobilex.cache.dict import DictCache
+
+
+async def test_DictCache():
+    cache = DictCache(None, key_prefix="x")
+    assert await cache.get("a") is None
+    assert await cache.set("a", {"a": 1})
+    assert await cache.get("a") == {"a": 1}
+    assert not await cache.add("a", 2)
+    assert await cache.add("b", 2)
+    await cache.set("ab", 3)
+    await cache.set("c", 4)
+
+    assert sorted(await cache.keys("a*")) == [b"x||a", b"x||ab"]
+    assert sorted(await cache.keys("*b")) == [b"x||ab", b"x||b"]
+    assert len(await cache.keys()) == 4
+
+    assert await cache.delete("a") == 1
+    assert await cache.delete("a") == 0
+    assert await cache.keys("a*") == [b"x||ab"]
+    assert cache.stats["hits"] == 1 and cache.stats["misses"] == 1
+
+
+async def test_DictCache_ttl():
+    cache = DictCache(None, ttl=10)
+    await cache.set("a", 1)
+    await cache.set("b", 2, ttl=60)
+    now = time.monotonic()
+    with patch("time.monotonic", return_value=now + 30):
+        assert await cache.get("a") is None
+        assert await cache.get("b") == 2
+        assert await cache.keys() == [b"|b"]
+    assert cache.stats["expirations"] == 1
+
+
+async def test_DictCache_eviction():
+    cache = DictCache(None, max_entries=3)
+    for i in range(4):
+        await cache.set(i, i)
+    await cache.get(1)
+    await cache.set(4, 4)
+    assert [await cache.get(i) for i in range(5)] == [None, 1, None, 3, 4]
+    assert cache.stats["evictions"] == 2
+
+    cache = DictCache(None, max_bytes=100, serialize=False)
+    await cache.set("a", "x" * 60)
+    await cache.set("b", "y" * 60)
+    assert await cache.get("a") is None
+    assert cache.nbytes <= 100
+
+    cache = DictCache(None, max_bytes=200, serialize=False)
+    await cache.set("a", [c * 60 for c in "wxyz"])
+    assert await cache.get("a") is None and cache.nbytes == 0
+
+
+async def test_DictCache_no_serialize():
+    cache = DictCache(None, serialize=False)
+    value = {"a": [1]}
+    await cache.set("a", value)
+    rv = await cache.get("a")
+    assert rv == value and rv is not value
+    rv["a"].append(2)
+    assert await cache.get("a") == {"a": [1]}
+
+    cache = DictCache(None, serialize=False, copy=False)
+    await cache.set("a", value)
+    assert await cache.get("a") is value
+
+
+async def test_DictCache_expire_many():
+    cache = DictCache(None, ttl=10)
+    await cache.set("a", 1)
+    await cache.set("b", 2)
+    assert await cache.expire_many(["a", "c"], 60) == 1
+    assert await cache.touch("b", 60)
+    assert not await cache.touch("c")
+    now = time.monotonic()
+    with patch("time.monotonic", return_value=now + 30):
+        assert await cache.get("a") == 1
+        assert await cache.get("b") == 2
+
+
+async def test_DictCache_keys_index():
+    cache = DictCache(None)
+    for i in range(200):
+        await cache.set(f"k{i:03}", i)
+    assert len(await cache.keys("k*")) == 200
+    for i in range(0, 200, 2):
+        await cache.delete(f"k{i:03}")
+    await cache.set("k000", 0)
+    await cache.set("a", 0)
+    expected = sorted([b"|k000", *(f"|k{i:03}".encode() for i in range(1, 200, 2))])
+    assert await cache.keys("k*") == expected
+    assert len(cache._sorted) <= 2 * len(cache.store) + 64
+    assert await cache.keys("k00*") == [
+        b"|k000",
+        *(b"|k00%d" % i for i in (1, 3, 5, 7, 9)),
+    ]
+    assert await cache.keys("k00") == [] and await cache.keys("k001") == [b"|k001"]
@@ -0,0 +1,54 @@
+import asyncio
+import time
+from unittest.mock import patch
+
+from mobilex import App, Request
+from mobilex.cache.dict import DictCache
+from mobilex.cache.memoize import memoize
+from mobilex.screens import Action, Screen
+
+
+async def test_memoize():
+    calls = []
+
+    @memoize(ttl=60, stale_ttl=10)
+    async def menu(n):
+        calls.append(n)
+        await asyncio.sleep(0)
+        return [n] * n
+
+    assert await asyncio.gather(menu(2), menu(2), menu(3)) == [[2, 2], [2, 2], [3] * 3]
+    assert await menu(2) == [2, 2]
+    assert calls == [2, 3]
+
+    now = time.time()
+    with patch("time.time", return_value=now + 30):
+        assert await menu(2) == [2, 2]
+        await asyncio.sleep(0.01)
+        assert calls == [2, 3, 2]
+
+    with patch("time.time", return_value=now + 120):
+        assert await menu(3) == [3] * 3
+        assert calls == [2, 3, 2, 3]
+
+
+async def test_memoize_screen(app: App):
+    app.configure(cache_backend=DictCache)
+    calls = []
+
+    @app.entry_screen("index")
+    class Index(Screen):
+        @memoize
+        async def get_actions(self):
+            calls.append(self)
+            return [Action("One"), Action("Two")]
+
+    res_1 = await app(Request("123", session_id="1"))
+    res_2 = await app(Request("456", session_id="2"))
+    assert res_1 == res_2
+    assert res_1.startswith("CON 1  One")
+    assert len(calls) == 1
+
+    Index.get_actions.cache_clear()
+    assert await app(Request("789", session_id="3")) == res_1
+    assert len(calls) == 1
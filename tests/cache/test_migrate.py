@@ -0,0 +1,109 @@
+import asyncio
+import json
+import pickle
+
+from mobilex.cache.dict import DictCache
+from mobilex.cache.migrate import main, migrate
+from mobilex.cache.redis import RedisCache
+from mobilex.cache.shm import SharedMemoryCache
+from mobilex.cache.sqlite import SQLiteCache
+
+
+async def test_raw_many(tmp_path):
+    for cache in (
+        DictCache(None, key_prefix="x", serialize=False),
+        RedisCache(None, key_prefix="x"),
+        SQLiteCache(None, str(tmp_path / "db.sqlite3"), key_prefix="x"),
+        SharedMemoryCache(None, str(tmp_path / "shm.cache"), key_prefix="x"),
+    ):
+        await cache.set("a", {"a": 1}, ttl=60)
+        keys = [k async for batch in cache.scan(count=1) for k in batch]
+        assert keys == [b"x||a"]
+        [(raw, ttl), missing] = await cache.get_raw_many([b"x||a", b"x||b"])
+        assert pickle.loads(raw) == {"a": 1} and 59 < ttl <= 60
+        assert missing == (None, None)
+        assert await cache.set_raw_many([(b"x||b", raw, 30)]) == 1
+        assert await cache.get("b") == {"a": 1}
+
+
+async def test_sqlite_raw_many_chunks(tmp_path):
+    cache = SQLiteCache(None, str(tmp_path / "db.sqlite3"), sweep_interval=0)
+    items = [(cache.make_key(i), pickle.dumps(i), 60) for i in range(2000)]
+    assert await cache.set_raw_many(items) == 2000
+    found = await cache.get_raw_many([k for k, *_ in items] + [b"|none"])
+    assert [pickle.loads(v) for v, _ in found[:-1]] == list(range(2000))
+    assert found[-1] == (None, None)
+    await cache.close()
+
+
+async def test_migrate(tmp_path):
+    src = DictCache(None, key_prefix="old")
+    dst = SQLiteCache(None, str(tmp_path / "db.sqlite3"), serializer=json)
+    for i in range(25):
+        await src.set(f"s{i}", {"i": i}, ttl=10 + i)
+    await src.set("bad", object())
+
+    reports = []
+    stats = await migrate(
+        src, dst, batch_size=10, progress=reports.append, progress_interval=0
+    )
+    assert (stats.scanned, stats.copied, stats.skipped, stats.failed) == (26, 25, 0, 1)
+    assert reports[-1] is stats and len(reports) == 4
+    assert await dst.get("s3") == {"i": 3}
+    assert sorted(await dst.keys()) == sorted(f"|s{i}".encode() for i in range(25))
+    [(_, ttl)] = await dst.get_raw_many([b"|s20"])
+    assert 29 < ttl <= 30
+
+    stats = await migrate(src, DictCache(None), pattern="s1*", dry_run=True)
+    assert stats.copied == 11
+    await dst.close()
+
+
+def test_migrate_cli(tmp_path, capsys):
+    src, dst = str(tmp_path / "src.sqlite3"), str(tmp_path / "dst.sqlite3")
+
+    async def setup():
+        cache = SQLiteCache(None, src, key_prefix="app")
+        await cache.set("a", [1, 2])
+        await cache.close()
+
+    async def check():
+        cache = SQLiteCache(None, dst, key_prefix="app", serializer=json)
+        assert await cache.get("a") == [1, 2]
+        await cache.close()
+
+    asyncio.run(setup())
+    argv = ["--source", "sqlite", "--source-location", src, "--source-prefix", "app"]
+    argv += ["--target", "sqlite", "--target-location", dst, "--target-prefix", "app"]
+    argv += ["--target-serializer", "json", "--target-option", "sweep_interval=0"]
+    assert main(argv) == 0
+    assert "scanned 1, copied 1" in capsys.readouterr().err
+    asyncio.run(check())
+
+
+def test_migrate_cli_sessions(tmp_path, capsys):
+    from mobilex.sessions import Session
+
+    src, dst = str(tmp_path / "src.sqlite3"), str(tmp_path / "dst.sqlite3")
+    session = Session(60, "254712345678", "s1")
+    session.argv = ["1", "2"]
+
+    async def setup():
+        cache = SQLiteCache(None, src, key_prefix="app")
+        await cache.set("254712345678", session, ttl=60)
+        await cache.set("254712345678|data", {"state": {"n": 1}}, ttl=120)
+        await cache.close()
+
+    async def check():
+        cache = SQLiteCache(None, dst, key_prefix="app")
+        rv = await cache.get("254712345678")
+        assert rv == session and rv.argv == ["1", "2"] and rv.ttl == 60
+        assert await cache.get("254712345678|data") == {"state": {"n": 1}}
+        await cache.close()
+
+    asyncio.run(setup())
+    argv = ["--source", "sqlite", "--source-location", src, "--source-prefix", "app"]
+    argv += ["--target", "sqlite", "--target-location", dst, "--target-prefix", "app"]
+    assert main(argv) == 0
+    assert "copied 2, skipped 0, failed 0" in capsys.readouterr().err
+    asyncio.run(check())
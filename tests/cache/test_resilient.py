@@ -0,0 +1,110 @@
+import asyncio
+from unittest.mock import patch
+
+from mobilex import App, Request
+from mobilex.cache.dict import DictCache
+from mobilex.cache.resilient import CircuitBreaker, ResilientCache
+from mobilex.screens import Action, Screen
+
+
+class FlakyCache(DictCache):
+    mode = None
+
+    async def _read(self):
+        if self.mode == "slow":
+            await asyncio.sleep(1)
+        elif self.mode == "down":
+            raise ConnectionError("backend is down")
+
+    def _write(self):
+        if self.mode:
+            raise ConnectionError("backend is down")
+
+    async def get(self, key):
+        await self._read()
+        return await super().get(key)
+
+    async def get_raw_many(self, keys):
+        await self._read()
+        return await super().get_raw_many(keys)
+
+    async def set(self, key, value, ttl=None):
+        self._write()
+        return await super().set(key, value, ttl)
+
+    async def set_raw_many(self, items):
+        self._write()
+        return await super().set_raw_many(items)
+
+
+def test_CircuitBreaker():
+    breaker = CircuitBreaker(2, 10)
+    assert breaker.allow() and not breaker.record_failure()
+    assert breaker.record_failure() and breaker.state == breaker.OPEN
+    assert not breaker.allow()
+
+    with patch("time.monotonic", return_value=breaker._opened_at + 11):
+        assert breaker.state == breaker.HALF_OPEN
+        assert breaker.allow() and not breaker.allow()
+        assert breaker.record_failure() and not breaker.allow()
+
+    with patch("time.monotonic", return_value=breaker._opened_at + 11):
+        assert breaker.allow()
+        breaker.record_success()
+    assert breaker.state == breaker.CLOSED and breaker.allow()
+
+
+async def test_resilient_sessions():
+    opts = dict(backend=FlakyCache, timeout=0.05, failure_threshold=2)
+    app = App(session_backend="resilient", session_backend_options=opts)
+    backend: ResilientCache = app.session_backend
+    flaky: FlakyCache = backend.backend
+
+    @app.entry_screen("index")
+    class Index(Screen):
+        actions = [Action("Next", screen="next")]
+
+    @app.screen("next")
+    class Next(Screen):
+        def render(self):
+            self.print("Next")
+
+    await app(Request("123", session_id="1"))
+    assert flaky.store and not backend.fallback.store
+
+    flaky.mode = "slow"
+    res = await app(Request("123", ussd_string="1", session_id="1"))
+    assert res.startswith("CON Next")  # the fallback missed, but no hang
+    assert backend.stats["timeouts"] == 1 and backend.fallback.store
+
+    flaky.mode = "down"
+    await app(Request("456", session_id="2"))
+    assert backend.is_degraded and backend.stats["opened"] == 1
+    res = await app(Request("456", ussd_string="1", session_id="2"))
+    assert res.startswith("CON Next") and backend.stats["errors"] == 1
+
+    flaky.mode, backend.breaker.reset_timeout = None, 0
+    res = await app(Request("456", ussd_string="1*0", session_id="2"))
+    assert not backend.is_degraded and res.startswith("CON 1  Next")
+    assert await backend.get(
+        app.session_manager.make_key(Request("456", session_id="2"))
+    )
+
+
+async def test_resilient_fallback_precedence():
+    cache = ResilientCache(None, backend=FlakyCache, failure_threshold=1)
+    await cache.set("a", "v1")
+    cache.backend.mode = "down"
+    await cache.set("a", "v2")
+    await cache.set("b", "only-in-fallback")
+    assert cache.is_degraded
+
+    keys = [k async for batch in cache.scan() for k in batch]
+    assert sorted(set(keys)) == [b"|a", b"|b"]
+    [(a, _), (b, _)] = await cache.get_raw_many([b"|a", b"|b"])
+    assert (cache.loads(a), cache.loads(b)) == ("v2", "only-in-fallback")
+
+    cache.backend.mode, cache.breaker.reset_timeout = None, 0
+    assert await cache.get("a") == "v2"
+    await cache.set("a", "v3")
+    assert await cache.get("a") == "v3" and not await cache.fallback.get("a")
@@ -0,0 +1,102 @@
+import asyncio
+import multiprocessing as mp
+import sys
+
+import pytest
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="requires fcntl")
+
+
+@pytest.fixture
+def location(tmp_path):
+    return str(tmp_path / "test.cache")
+
+
+def _child(location):
+    from mobilex.cache.shm import SharedMemoryCache
+
+    cache = SharedMemoryCache(None, location, key_prefix="x")
+    asyncio.run(cache.set("child", {"pid": 1}))
+
+
+async def test_SharedMemoryCache(location):
+    from mobilex.cache.shm import SharedMemoryCache
+
+    cache = SharedMemoryCache(None, location, key_prefix="x", slots=64, max_probe=4)
+    other = SharedMemoryCache(None, location, key_prefix="x")
+    assert other.slots == 64
+
+    assert await cache.get("a") is None
+    assert await cache.set("a", [1, 2])
+    assert await other.get("a") == [1, 2]
+    await other.set("a", "b")
+    assert await cache.get("a") == "b"
+
+    await cache.set("ab", 1)
+    assert sorted(await other.keys("a*")) == [b"x||a", b"x||ab"]
+    assert await other.delete("a") == 1
+    assert await cache.get("a") is None
+    assert await cache.get("ab") == 1
+
+    for i in range(100):
+        await cache.set(i, i)
+    assert await cache.get(99) == 99
+
+    with pytest.raises(ValueError):
+        await cache.set("big", b"x" * cache.slot_size)
+
+    await cache.set("short", 1, ttl=-1)
+    assert await cache.get("short") is None
+    assert not await cache.touch("short")
+    await cache.set("short", 1, ttl=1)
+    assert await other.expire_many(["short", "none"], ttl=-1) == 1
+    assert await cache.get("short") is None
+
+    await cache.clear()
+    assert await cache.keys() == []
+    await cache.close()
+    await other.close()
+
+
+async def test_SharedMemoryCache_attach(location):
+    from mobilex.cache.shm import SharedMemoryCache
+
+    cache = SharedMemoryCache(None, location, slots=8, max_probe=32)
+    other = SharedMemoryCache(None, location, slots=8192, max_probe=32)
+    assert cache.max_probe == other.max_probe == other.slots == 8
+    for i in range(8):
+        await cache.set(i, i)
+    assert [await other.get(i) for i in range(8)] == list(range(8))
+    await cache.close()
+    await other.close()
+
+
+async def test_SharedMemoryCache_processes(location):
+    from mobilex.cache.shm import SharedMemoryCache
+
+    cache = SharedMemoryCache(None, location, key_prefix="x")
+    proc = mp.get_context("spawn").Process(target=_child, args=(location,))
+    proc.start()
+    proc.join(30)
+    assert proc.exitcode == 0
+    assert await cache.get("child") == {"pid": 1}
+    await cache.close()
+
+
+async def test_SharedMemoryCache_repair(location):
+    from unittest.mock import patch
+
+    from mobilex.cache import shm
+
+    cache = shm.SharedMemoryCache(None, location, slots=8, max_probe=8)
+    await cache.set("a", 1)
+    i = next(i for i in range(cache.slots) if cache._read(i)[3] == b"|a")
+    off = cache._offset(i)
+    shm._SEQ.pack_into(cache._mm, off, shm._SEQ.unpack_from(cache._mm, off)[0] + 1)
+
+    calls = []
+    with patch.object(shm.fcntl, "lockf", lambda fd, op, *a: calls.append(op)):
+        assert await cache.set("a", 2)
+    assert calls == [shm.fcntl.LOCK_EX, shm.fcntl.LOCK_UN]
+    assert await cache.get("a") == 2 and cache._lock_depth == 0
+    await cache.close()
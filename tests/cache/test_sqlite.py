@@ -0,0 +1,57 @@
+import asyncio
+
+import pytest
+
+from mobilex.cache.sqlite import SQLiteCache
+
+
+@pytest.fixture
+def location(tmp_path):
+    return str(tmp_path / "test.sqlite3")
+
+
+async def test_SQLiteCache(location):
+    cache = SQLiteCache(None, location, key_prefix="x")
+    assert await cache.get("a") is None
+    assert await asyncio.gather(*(cache.set(i, i) for i in range(10)))
+    assert await cache.get(3) == 3
+
+    await cache.set("a", {"a": 1})
+    await cache.set("ab", 2)
+    await cache.set("short", 1, ttl=-1)
+    assert await cache.get("short") is None
+    assert not await cache.touch("short")
+    await cache.set("short", 1, ttl=1)
+    assert await cache.expire_many(["short", "none"], ttl=-1) == 1
+    assert await cache.get("short") is None
+    assert sorted(await cache.keys("a*")) == [b"x||a", b"x||ab"]
+    assert await cache.delete("a") == 1
+    assert await cache.delete("a") == 0
+    await cache.set("none", None)
+    assert await cache.delete("none") == 1 and await cache.delete("none") == 0
+    pending = await asyncio.gather(cache.set("none", None), cache.delete("none"))
+    assert pending == [True, 1] and await cache.get("none") is None
+    await cache.close()
+
+    cache = SQLiteCache(None, location, key_prefix="x")
+    assert await cache.get("a") is None
+    assert await cache.get("ab") == 2
+    assert len(await cache.keys()) == 11
+
+    await cache.clear()
+    assert await cache.keys() == []
+    await cache.close()
+
+
+async def test_SQLiteCache_group_commit(location, monkeypatch):
+    cache = SQLiteCache(None, location)
+    commits = []
+    commit = cache._commit
+    monkeypatch.setattr(
+        cache, "_commit", lambda items: commits.append(items) or commit(items)
+    )
+
+    await asyncio.gather(*(cache.set(i, i) for i in range(50)))
+    assert len(commits) == 1 and len(commits[0]) == 50
+    assert await cache.get(49) == 49
+    await cache.close()
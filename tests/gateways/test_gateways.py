@@ -0,0 +1,85 @@
+import json
+
+import pytest
+
+from mobilex import App
+from mobilex.exc import GatewayError
+from mobilex.gateways import FormGateway, JsonGateway, SoapGateway
+from mobilex.screens import Action, Screen
+from mobilex.utils.phone import normalize_msisdn
+
+FORM = (
+    b"sessionId=ATU1&serviceCode=%2A384%2A1%23&phoneNumber=%2B254712345678&text=1%2A2"
+)
+JSON = json.dumps(
+    {
+        "sessionId": 101,
+        "serviceCode": "*384*1#",
+        "msisdn": "0712345678",
+        "ussdString": "1*2",
+        "extra": {"x": 1},
+    }
+).encode()
+SOAP = (
+    b'<?xml version="1.0"?><soapenv:Envelope><soapenv:Body><ns1:ussdRequest>'
+    b"<ns1:sessionId>S1</ns1:sessionId><ns1:serviceCode>*384*1#</ns1:serviceCode>"
+    b"<ns1:msisdn>254712345678</ns1:msisdn><ns1:ussdString>1*2</ns1:ussdString>"
+    b"</ns1:ussdRequest></soapenv:Body></soapenv:Envelope>"
+)
+
+GATEWAYS = [
+    (FormGateway(), FORM, "ATU1"),
+    (JsonGateway(region="KE"), JSON, "101"),
+    (SoapGateway(), SOAP, "S1"),
+]
+
+
+def test_normalize_msisdn():
+    assert normalize_msisdn("+254712345678") == "254712345678"
+    assert normalize_msisdn("254712345678") == "254712345678"
+    assert normalize_msisdn("0712345678", "KE") == "254712345678"
+    with pytest.raises(ValueError):
+        normalize_msisdn("12345")
+
+
+@pytest.mark.parametrize("gateway, body, session_id", GATEWAYS)
+def test_parse(gateway, body, session_id):
+    req = gateway.parse(body)
+    assert req.msisdn == "254712345678" and req.session_id == session_id
+    assert req.service_code == "*384*1#" and req.ussd_string == "1*2"
+
+
+def test_parse_errors():
+    assert FormGateway().parse(b"phoneNumber=123&text=").msisdn == "123"
+    with pytest.raises(GatewayError):
+        FormGateway().parse(b"sessionId=1&text=")
+
+
+async def test_render():
+    app = App(session_backend="dict")
+
+    @app.entry_screen("index")
+    class Index(Screen):
+        actions = [Action("Quit", screen="bye")]
+
+        def render(self):
+            self.print("Karibu <M-Pesa> & more")
+
+    @app.screen("bye")
+    class Bye(Screen):
+        def render(self):
+            self.print("Bye")
+            return self.END
+
+    body = b"sessionId=A&phoneNumber=254712345678&text="
+    assert (await FormGateway()(app, body)).startswith(b"CON Karibu <M-Pesa>")
+    res = await FormGateway()(app, body.replace(b"text=", b"text=1"))
+    assert res == b"END Bye"
+
+    body = json.dumps({"sessionId": "B", "msisdn": "254712345678"}).encode()
+    data = json.loads(await JsonGateway()(app, body))
+    assert data["end"] is False and data["message"].startswith("Karibu")
+
+    res = await SoapGateway()(app, SOAP.replace(b"1*2", b""))
+    assert b"<action>request</action>" in res
+    assert b"<message>Karibu &lt;M-Pesa&gt; &amp; more" in res
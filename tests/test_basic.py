@@ -53,3 +53,23 @@ async def test_basic(app: App, router: Router, session_backend_config):
 
     with pytest.raises(ScreenNotFoundError):
         router.get_screen("xyz")
+
+
+async def test_startup(app: App, router: Router):
+    calls = []
+
+    @app.entry_screen("index")
+    class Index(Screen):
+        actions = [Action("One"), Action("Two")]
+
+    @app.on_startup
+    async def warmup(app):
+        calls.append(app)
+
+    assert not app.has_booted
+    assert await app.startup() is app
+    assert app.has_booted and calls == [app]
+    assert Index._action_set is not None and Index._action_set.get("2")
+
+    await app(Request("123456"))
+    assert calls == [app]
@@ -0,0 +1,55 @@
+import json
+
+from mobilex import App, Request
+from mobilex.i18n import Catalog, Translations
+from mobilex.screens import Action, ActionSet, Screen
+from mobilex.screens.base import NL
+from mobilex.screens.templates import Template
+
+SW = {
+    "Back": "Rudi",
+    "Home": "Mwanzo",
+    "More": "Zaidi",
+    "Balance": "Salio",
+    "Your balance is {amount}": "Salio lako ni {amount}",
+    "Error! Invalid choice.": "Kosa! Chaguo si sahihi.",
+}
+
+
+def test_Catalog(tmp_path):
+    (path := tmp_path / "sw.json").write_text(json.dumps(SW))
+    trans = Translations("en", {"sw": str(path)}, {"sw": 160})
+    sw, en = trans["sw"], trans.catalog("en")
+    assert trans.catalog("fr") is en and list(trans) == ["sw", "en"]
+    assert sw.page_length == 160 and en.page_length is None
+
+    acts = ActionSet([Action("Balance"), Action("Help")])
+    assert en.action_set(acts) is acts
+    assert [a.label for a in sw.action_set(acts)] == ["Salio", "Help"]
+    assert sw.action_set(acts) is sw.action_set(acts)
+
+    tpl = Template("Your balance is {amount}")
+    assert sw.template(tpl) is sw.template(tpl)
+    assert sw.template(tpl).render({"amount": 5}) == "Salio lako ni 5"
+    assert Catalog("en").template(tpl) is tpl
+
+
+async def test_session_language():
+    app = App(session_backend="dict", languages={"sw": SW})
+
+    @app.entry_screen("index")
+    class Index(Screen):
+        actions = [
+            Action("Kiswahili", "set_language"),
+            Action("Balance", screen="index"),
+        ]
+
+        def set_language(self, inpt):
+            self.session.language = "sw"
+
+    res = await app(Request("123", session_id="1"))
+    assert res.startswith(f"CON 1  Kiswahili{NL}2  Balance{NL}0  Back")
+    res = await app(Request("123", ussd_string="1", session_id="1"))
+    assert res.startswith(f"CON 1  Kiswahili{NL}2  Salio{NL}0  Rudi{NL}00 Mwanzo")
+    res = await app(Request("123", ussd_string="1*5", session_id="1"))
+    assert res.startswith(f"CON Kosa! Chaguo si sahihi.{NL}1  Kiswahili{NL}2  Salio")
@@ -0,0 +1,29 @@
+import json
+import subprocess
+import sys
+
+_script = """
+import json, sys
+import mobilex
+pkg = sorted(sys.modules)
+from mobilex import App
+App(session_backend="dict").session_backend
+json.dump({"pkg": pkg, "app": sorted(sys.modules)}, sys.stdout)
+"""
+
+
+def _run():
+    out = subprocess.run(
+        [sys.executable, "-c", _script], capture_output=True, check=True, text=True
+    )
+    return {k: set(v) for k, v in json.loads(out.stdout).items()}
+
+
+def test_lazy_imports():
+    modules = _run()
+    assert "mobilex" in modules["pkg"]
+    assert not {"mobilex.core", "mobilex.screens", "redis"} & modules["pkg"]
+    assert "mobilex.core" in modules["app"] and "mobilex.cache.dict" in modules["app"]
+    assert not {"redis", "mobilex.cache.redis", "phonenumbers"} & modules["app"]
+    lazy = {"i18n", "loaders", "ratelimit", "sms", "subscribers"}
+    assert not {f"mobilex.{m}" for m in lazy} & modules["app"]
@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+
+from mobilex import Request
+from mobilex.loaders import DataLoader, Loader, loader
+
+
+async def test_DataLoader():
+    calls = []
+
+    @loader
+    async def load(keys):
+        calls.append(keys)
+        return [k * 2 for k in keys]
+
+    dl = DataLoader(load)
+    assert await asyncio.gather(dl.load(1), dl.load(2), dl.load(1)) == [2, 4, 2]
+    assert await dl.load_many([2, 3]) == [4, 6]
+    assert calls == [[1, 2], [3]]
+
+    fut = dl.load(4)
+    await asyncio.sleep(0)
+    assert len(dl._tasks) == 1
+    assert await fut == 8
+    await asyncio.sleep(0)
+    assert not dl._tasks
+
+
+async def test_DataLoader_errors():
+    calls = []
+
+    def load(keys):
+        calls.append(keys)
+        return {k: k for k in keys[1:]}
+
+    dl = DataLoader(Loader(load, max_batch_size=2))
+    assert await dl.load_many([1, 2, 3]) == [None, 2, None]
+    assert calls == [[1, 2], [3]]
+
+    dl = DataLoader(Loader(lambda keys: []))
+    with pytest.raises(ValueError):
+        await dl.load(1)
+
+
+async def test_Loader_ttl():
+    calls = []
+
+    @loader(ttl=60)
+    def load(keys):
+        calls.append(keys)
+        return keys
+
+    req_1, req_2 = Request("123"), Request("123")
+    assert req_1.get_loader(load) is req_1.get_loader(load)
+    assert await req_1.get_loader(load).load_many([1, 2]) == [1, 2]
+    assert await req_2.get_loader(load).load_many([2, 3]) == [2, 3]
+    assert calls == [[1, 2], [3]]
@@ -0,0 +1,118 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from mobilex import App, Request
+from mobilex.cache.redis import RedisCache
+from mobilex.ratelimit import LoadShedder, LocalBuckets, RedisBuckets
+from mobilex.screens import Screen
+
+
+def test_LocalBuckets():
+    buckets = LocalBuckets(1, 3, max_keys=2)
+    assert all(buckets.hit("a") for _ in range(3)) and not buckets.hit("a")
+    assert buckets.hit("b") and buckets.hit("c")
+    assert buckets.hit("a")  # evicted, starts over
+
+
+async def test_RedisBuckets():
+    app = App(cache_backend=RedisCache)
+    buckets = RedisBuckets(app.cache, 1, 3)
+    assert [await buckets.hit("a") for _ in range(4)] == [True] * 3 + [False]
+    assert await buckets.hit("b")
+    assert await RedisBuckets(app.cache, 1, 3).hit("a") is False
+
+
+@pytest.mark.parametrize("shared", [False, True])
+async def test_rate_limits(shared):
+    app = App(
+        session_backend="dict",
+        cache_backend=RedisCache,
+        rate_limits={"msisdn": (0.1, 2), "service_code": 100},
+        rate_limit_shared=shared,
+    )
+    app.entry_screen("index", Screen)
+    res = [await app(Request("123", service_code="*1#")) for _ in range(3)]
+    assert res[0].startswith("CON") and res[1].startswith("CON")
+    assert res[2] == app.config.busy_response
+    assert (await app(Request("456", service_code="*1#"))).startswith("CON")
+
+
+async def test_rate_limit_shared_backend():
+    app = App(session_backend="dict", rate_limits={"msisdn": 1}, rate_limit_shared=True)
+    with pytest.raises(RuntimeError):
+        await app.startup()
+
+
+async def test_load_shedding():
+    app = App(session_backend="dict", max_inflight=2, max_latency=0.05)
+    started = asyncio.Event()
+
+    @app.entry_screen("index")
+    class Index(Screen):
+        async def render(self):
+            started.set()
+            await asyncio.sleep(0.1)
+
+    tasks = [asyncio.create_task(app(Request(f"{i}"))) for i in range(2)]
+    await started.wait()
+    assert await app(Request("3")) == app.config.busy_response
+    assert all(r.startswith("CON") for r in await asyncio.gather(*tasks))
+
+    shedder = app.load_shedder
+    assert shedder.inflight == 0 and shedder.shed == 1 and shedder.latency > 0.01
+    shedder.latency = 1
+    with patch("random.random", return_value=0.5):
+        assert not shedder.admit()
+    with patch("time.monotonic", return_value=shedder._updated_at + 11):
+        assert shedder.admit() and shedder.latency == 0
+
+
+async def test_admission_counts_inflight():
+    app = App(session_backend="dict", max_inflight=2)
+
+    async def limiter(request):
+        await asyncio.sleep(0)
+        return request.msisdn != "0"
+
+    app.__dict__["rate_limiter"], shedder = limiter, app.load_shedder
+    reqs = [app.admit_request(Request(f"{i}")) for i in range(1, 5)]
+    assert await asyncio.gather(*reqs) == [True, True, False, False]
+    assert shedder.inflight == 2
+    shedder.exit(), shedder.exit()
+    assert not await app.admit_request(Request("0")) and shedder.inflight == 0
+    assert shedder.latency == 0
+
+
+async def test_admission_limiter_error():
+    app = App(session_backend="dict", max_inflight=1)
+
+    async def limiter(request):
+        raise ConnectionError("redis is down")
+
+    app.__dict__["rate_limiter"], shedder = limiter, app.load_shedder
+    for _ in range(3):
+        with pytest.raises(ConnectionError):
+            await app.admit_request(Request("1"))
+    assert shedder.inflight == 0 and shedder.admit()
+
+
+def test_shared_limits_resilient_cache():
+    app = App(
+        session_backend="dict",
+        cache_backend="resilient",
+        rate_limits={"msisdn": (1, 1)},
+        rate_limit_shared=True,
+    )
+    assert app.rate_limiter._shared["msisdn"].backend is app.cache.backend
+
+
+def test_LoadShedder_ratio():
+    shedder = LoadShedder(max_latency=0.1, max_shed_ratio=0.5)
+    shedder.enter()
+    shedder.exit(1.0)
+    with patch("random.random", return_value=0.6):
+        assert shedder.admit()
+    with patch("random.random", return_value=0.4):
+        assert not shedder.admit()
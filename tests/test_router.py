@@ -0,0 +1,76 @@
+import pytest
+
+from mobilex import App, Request
+from mobilex.exc import RedirectLoopError, TooManyRedirectsError
+from mobilex.responses import redirect
+from mobilex.router import Router
+from mobilex.screens import Screen
+
+
+async def test_redirect_loop(app: App, router: Router):
+    @app.entry_screen("a")
+    class A(Screen):
+        async def render(self):
+            return redirect("b")
+
+    @app.screen("b")
+    class B(Screen):
+        async def render(self):
+            return redirect("a")
+
+    with pytest.raises(RedirectLoopError):
+        await app(Request("123456"))
+
+
+class Token:
+    """Unequal tokens whose hashes collide."""
+
+    def __init__(self, n):
+        self.n = n
+
+    def __hash__(self):
+        return 1
+
+    def __eq__(self, other):
+        return isinstance(other, Token) and self.n == other.n
+
+
+async def test_redirect_hash_collision(app: App, router: Router):
+    @app.entry_screen("index")
+    class Index(Screen):
+        async def render(self):
+            if (n := getattr(self.state.get("token"), "n", 0)) < 3:
+                return redirect("index", token=Token(n + 1))
+            self.print("Done")
+
+    assert (await app(Request("123456"))).startswith("CON Done")
+
+
+@pytest.mark.parametrize("max_redirects_config", [3])
+async def test_max_redirects(app: App, router: Router, max_redirects_config):
+    @app.entry_screen("index")
+    class Index(Screen):
+        async def render(self):
+            if (hops := self.state.get("hops", 0)) < 10:
+                return redirect("index", hops=hops + 1)
+            self.print("Done")
+
+    with pytest.raises(TooManyRedirectsError):
+        await app(Request("123456"))
+
+
+async def test_redirect_depth(app: App, router: Router):
+    @app.entry_screen("index")
+    class Index(Screen):
+        async def render(self):
+            return redirect("end")
+
+    @app.screen("end")
+    class End(Screen):
+        async def render(self):
+            self.print("Done")
+
+    res = await app(req := Request("123456"))
+    assert res.startswith("CON Done")
+    assert req.redirects == 1
+    assert router.redirect_depths[1] == 1
@@ -0,0 +1,293 @@
+import pytest
+
+from mobilex.screens import UssdPayload
+from mobilex.screens.base import NL
+
+
+def test_UssdPayload():
+    payload = UssdPayload("")
+    assert payload.data == "" and not payload
+
+    payload.append("Hello", "world")
+    payload.append(1, 2, sep=",", end="")
+    assert payload.data == f"Hello world{NL}1,2"
+    assert payload == f"Hello world{NL}1,2"
+
+    payload.append("!")
+    assert str(payload) == f"Hello world{NL}1,2!{NL}"
+
+    payload.clear()
+    assert payload.data == ""
+
+
+async def test_ListScreen(app, router):
+    from mobilex import Request
+    from mobilex.responses import redirect
+    from mobilex.screens import ListScreen, Screen
+
+    fetched = []
+
+    @app.entry_screen("index")
+    class Index(ListScreen[int]):
+        page_size = 3
+
+        async def fetch(self, offset, limit):
+            fetched.append((offset, limit))
+            return range(10, 20)[offset : offset + limit]
+
+        def handle(self, inpt):
+            return redirect("end", picked=self.get_actions().get(inpt).label)
+
+    @app.screen("end")
+    class End(Screen):
+        def render(self):
+            self.print(f"Picked {self.state.picked}")
+            return self.END
+
+    res = await app(Request("123", ussd_string="", session_id="1"))
+    assert res.startswith(f"CON 1  10{NL}2  11{NL}3  12{NL}98 Next")
+    assert fetched == [(0, 4)]
+
+    res = await app(req := Request("123", ussd_string="98", session_id="1"))
+    assert res.startswith(f"CON 4  13{NL}5  14{NL}6  15{NL}98 Next{NL}97 Prev")
+    assert req.session.state._cursor == 3
+    assert fetched[-1] == (3, 4)
+
+    res = await app(Request("123", ussd_string="98*97", session_id="1"))
+    assert res.startswith(f"CON 1  10{NL}")
+
+    res = await app(Request("123", ussd_string="98*97*9", session_id="1"))
+    assert res == f"END Picked 18"
+
+
+async def test_ListScreen_text_paging(app, router):
+    from mobilex import Request
+    from mobilex.screens import ListScreen
+
+    @app.entry_screen("index")
+    class Index(ListScreen[str]):
+        page_size = 4
+
+        async def fetch(self, offset, limit):
+            return [f"{'item ' * 10}{i}" for i in range(offset, offset + limit)]
+
+    res = await app(Request("123", ussd_string="", session_id="1"))
+    assert "99 More" in res and "98 Next" in res and "item 3" not in res
+    res = await app(req := Request("123", ussd_string="99", session_id="1"))
+    assert "item 3" in res and req.session.state._cursor == 0
+    res = await app(req := Request("123", ussd_string="99*98", session_id="1"))
+    assert req.session.state._cursor == 4
+
+
+def test_ScreenMetaOptions():
+    from datetime import timedelta
+
+    from mobilex.screens import Screen
+
+    class A(Screen):
+        class Meta:
+            restore_sessions = "prompt"
+            session_ttl = 120
+
+        async def render(self):
+            pass
+
+    class B(A):
+        def init(self, inpt):
+            pass
+
+        def get_actions(self):
+            return ()
+
+    class C(B):
+        session_ttl = 30
+
+    assert Screen._meta.async_render and not Screen._meta.restore_sessions
+    assert Screen._meta.static_actions and Screen._meta.next_page_key == "99"
+    assert A._meta.restore_sessions == B._meta.restore_sessions == "prompt"
+    assert A._meta.session_ttl == B._meta.session_ttl == timedelta(seconds=120)
+    assert C._meta.session_ttl == timedelta(seconds=30)
+    assert A._meta.static_actions and not B._meta.static_actions
+    assert B._meta.async_render and not B._meta.async_init
+
+
+async def test_awaitable_render(app):
+    from mobilex import Request
+    from mobilex.screens import Screen
+
+    async def _render(screen):
+        screen.print("Wrapped")
+
+    @app.entry_screen("index")
+    class Index(Screen):
+        class Meta:
+            async_render = True
+
+        def render(self):
+            return _render(self)
+
+    assert Index._meta.async_render and not Index._meta.async_init
+    assert (await app(Request("123"))).startswith("CON Wrapped")
+
+
+async def test_compiled_dispatch(app):
+    from mobilex import Request
+    from mobilex.responses import redirect
+    from mobilex.screens import Action, Screen
+
+    @app.entry_screen("index")
+    class Index(Screen):
+        actions = [
+            Action("Sync", "pick", args=("sync",)),
+            Action("Async", "apick", args=("async",)),
+            Action("Done", screen="done"),
+        ]
+
+        def pick(self, inpt, how):
+            self.print(f"Picked {inpt} {how}")
+
+        async def apick(self, inpt, how):
+            return redirect("done", how=how)
+
+    @app.screen("done")
+    class Done(Screen):
+        def render(self):
+            self.print("Done", self.state.get("how"))
+            return self.END
+
+    await app.startup()
+    table = Index._dispatch_table
+    assert table["1"].is_async is False and table["2"].is_async is True
+    assert table["0"].args == (-1,) and table[None].is_async is True
+
+    await app(Request("123", session_id="1"))
+    res = await app(Request("123", ussd_string="1", session_id="1"))
+    assert res.startswith("CON Picked 1 sync")
+    res = await app(Request("123", ussd_string="1*2", session_id="1"))
+    assert res == "END Done async"
+
+    def make_handler():
+        async def handler(screen, inpt):
+            pass
+
+        return handler
+
+    handler = make_handler()
+    assert Index.resolve_handler(handler) == (handler, True)
+    assert handler not in Index._meta.handlers and "pick" in Index._meta.handlers
+
+
+async def test_instance_actions(app):
+    from mobilex import Request
+    from mobilex.screens import Action, Screen
+
+    @app.entry_screen("index")
+    class Index(Screen):
+        @property
+        def actions(self):
+            n = self.state.get("n", 0)
+            return [Action(f"Visit {n}", "pick"), Action("Other", screen="other")]
+
+        def pick(self, inpt):
+            self.state.n = self.state.get("n", 0) + 1
+
+    @app.screen("other")
+    class Other(Screen):
+        actions = [Action("Class", "pick")]
+
+        def __init__(self, state):
+            super().__init__(state)
+            self.actions = [Action(f"Instance {state.get('n', 0)}", "bump")]
+
+        def pick(self, inpt):
+            self.state.n = -1
+
+        def bump(self, inpt):
+            self.state.n = self.state.get("n", 0) + 10
+
+    await app.startup()
+    assert not Index._meta.static_actions and Index._dispatch_table is None
+    assert Other._meta.static_actions and Other._dispatch_table is not None
+
+    assert (await app(Request("1", session_id="1"))).startswith("CON 1  Visit 0")
+    await app(Request("1", ussd_string="1", session_id="1"))
+    res = await app(Request("1", ussd_string="1*1", session_id="1"))
+    assert res.startswith("CON 1  Visit 1")
+    res = await app(Request("1", ussd_string="1*1*2", session_id="1"))
+    assert res.startswith("CON 1  Instance 0")
+    await app(Request("1", ussd_string="1*1*2*1", session_id="1"))
+    res = await app(Request("1", ussd_string="1*1*2*1*1", session_id="1"))
+    assert res.startswith("CON 1  Instance 10")
+
+
+def test_ActionSet():
+    import pickle
+
+    from mobilex.screens import Action, ActionSet
+
+    acts = ActionSet([Action("One", name="one"), Action("Two", key="9")])
+    nav = ActionSet([Action("Back", key="0", screen=-1)])
+    assert ActionSet([Action("One", name="one"), Action("Two", key="9")]) is acts
+    assert ActionSet(acts) is acts and pickle.loads(pickle.dumps(acts)) is acts
+    assert acts.get_by_name("one") is acts["1"] and list(acts.names()) == ["one"]
+    assert acts.text == f"1  One{NL}9  Two"
+
+    merged = nav | acts
+    assert merged is nav | acts and list(merged.keys()) == ["0", "1", "9"]
+    assert acts | () is acts and ActionSet() | acts is acts
+
+    unhashable = ActionSet([Action("Pay", kwargs={"amount": 1})])
+    assert ActionSet([Action("Pay", kwargs={"amount": 1})]) is not unhashable
+    assert unhashable["1"].kwargs == {"amount": 1}
+
+
+def test_Template():
+    from mobilex.screens import Template
+
+    tpl = Template("Pay {amount:,} to {user.name!r}? {{ok}}")
+    assert not tpl.is_static and tpl.fields == {"amount", "user"}
+    user = type("User", (), {"name": "Ann"})
+    assert tpl.render({"amount": 1500, "user": user}) == "Pay 1,500 to 'Ann'? {ok}"
+
+    tpl = Template("Welcome")
+    assert tpl.is_static and tpl.render({}) == "Welcome"
+
+    tpl = Template("{items[0].name} {prices[tea]}")
+    assert tpl.fields == {"items", "prices"}
+    assert tpl.render({"items": [user], "prices": {"tea": 5}}) == "Ann 5"
+
+    for source in ("Pay {}", "Pay {0}", "Pay {0.name}"):
+        with pytest.raises(ValueError, match="positional field"):
+            Template(source)
+
+    calls, static = [], Template("Welcome")
+    paginate = lambda *args: calls.append(args) or [args[0]]
+    assert static.paginate(paginate, "Welcome", 160) == ("Welcome",)
+    assert static.paginate(paginate, "Welcome", 160) == ("Welcome",)
+    tpl.paginate(paginate, "Ann 5", 160), tpl.paginate(paginate, "Ann 5", 160)
+    assert len(calls) == 3
+
+
+async def test_template_screen(app):
+    from mobilex import Request
+    from mobilex.screens import Action, Screen
+
+    @app.entry_screen("index")
+    class Index(Screen):
+        template = "Hi {session.msisdn}, pick one:{NL}{menu}Balance: {balance}"
+        actions = [Action("One", screen="index")]
+
+        def init(self, inpt):
+            self.state.update(balance=10, NL=NL)
+
+    class Base(Screen):
+        class Meta:
+            template = "Base"
+
+    class Child(Base):
+        pass
+
+    assert Child._meta.template is Base._meta.template
+    assert Index._meta.template.fields == {"session", "NL", "menu", "balance"}
+    res = await app(Request("123", session_id="1"))
+    assert res.startswith(f"CON Hi 123, pick one:{NL}1  OneBalance: 10{NL}")
@@ -0,0 +1,169 @@
+import time
+from unittest.mock import patch
+
+import pytest
+
+from mobilex import App, Request
+from mobilex.cache.dict import DictCache
+from mobilex.cache.redis import RedisCache
+from mobilex.screens import Action, Screen
+from mobilex.screens.resume import RESUME_STATE
+from mobilex.sessions import TTLPolicy
+
+
+@pytest.mark.parametrize("session_backend_config", [DictCache, RedisCache])
+async def test_touch_unchanged(app: App, session_backend_config):
+    @app.entry_screen("index")
+    class Index(Screen):
+        actions = [Action("One", screen="one")]
+
+    @app.screen("one")
+    class One(Screen):
+        def render(self):
+            self.print("One")
+
+    backend = app.session_backend
+    with patch.object(
+        backend, "set_raw_many", wraps=backend.set_raw_many
+    ) as set_, patch.object(backend, "touch", wraps=backend.touch) as touch:
+        written = lambda: [len(c.args[0]) for c in set_.call_args_list]
+        await app(Request("123", session_id="1"))
+        await app(Request("123", ussd_string="1", session_id="1"))
+        assert written() == [2, 2] and touch.call_count == 0
+
+        res = await app(Request("123", ussd_string="1*9", session_id="1"))
+        assert res.startswith("CON One") and written() == [2, 2, 1]
+        res = await app(Request("123", ussd_string="1*9*0", session_id="1"))
+        assert res.startswith("CON 1  One") and written() == [2, 2, 1, 2]
+        assert touch.call_count == 0
+
+        app.session_manager.data_ttl_factor = 1
+        await app(Request("123", ussd_string="1*9*0*9", session_id="1"))
+        res = await app(Request("123", ussd_string="1*9*0*9*9", session_id="1"))
+        assert res.startswith("CON Error!") and written()[-2:] == [2, 1]
+        assert touch.call_count == 1
+
+
+@pytest.mark.parametrize("history_ttl_config", [60])
+@pytest.mark.parametrize("history_backend_config", [DictCache, RedisCache])
+async def test_history_expire(app: App, history_backend_config, history_ttl_config):
+    @app.entry_screen("index")
+    class Index(Screen):
+        actions = [Action("One", screen="one")]
+
+    @app.screen("one")
+    class One(Screen):
+        pass
+
+    backend = app.history_backend
+    with patch.object(backend, "expire_many", wraps=backend.expire_many) as expire:
+        await app(Request("123", session_id="1"))
+        await app(Request("123", ussd_string="1", session_id="1"))
+        await app(Request("123", ussd_string="1*9", session_id="1"))
+        assert expire.call_count == 0
+        with patch("time.time", return_value=time.time() + 31):
+            await app(Request("123", ussd_string="1*9*9", session_id="1"))
+            assert expire.call_count == 1
+            await app(Request("123", ussd_string="1*9*9*9", session_id="1"))
+            assert expire.call_count == 1
+        assert await backend.expire_many(expire.call_args.args[0]) == 1
+
+
+@pytest.mark.parametrize("session_backend_config", [DictCache])
+async def test_ttl_policy(app: App, session_backend_config):
+    @app.entry_screen("index")
+    class Index(Screen):
+        actions = [Action("Pay", screen="pay")]
+
+    @app.screen("pay")
+    class Pay(Screen):
+        session_ttl = 300
+
+    def stored_ttl(req):
+        entry = backend.store[backend.make_key(app.session_manager.make_key(req))]
+        return entry.expires_at - time.monotonic()
+
+    backend = app.session_backend
+    await app(req := Request("123", session_id="1"))
+    assert 70 < stored_ttl(req) <= 75 and req.session.ttl == 75
+    await app(req := Request("123", ussd_string="1", session_id="1"))
+    assert 295 < stored_ttl(req) <= 300 and req.session.ttl == 300
+
+
+async def test_ttl_policy_absolute():
+    policy = TTLPolicy(TTLPolicy.ABSOLUTE)
+    app = App(session_backend=DictCache, session_ttl=60, session_ttl_policy=policy)
+    app.entry_screen("index", Screen)
+
+    await app(req := Request("123", session_id="1"))
+    with patch("time.time", return_value=time.time() + 50):
+        assert 9 < policy(req, req.session).total_seconds() <= 10
+        await app(req := Request("123", session_id="1"))
+        assert req.session.ttl <= 10
+
+    with patch("time.time", return_value=time.time() + 70):
+        await app(Request("123", session_id="1"))
+        assert await app.session_backend.keys() == []
+
+    policy = TTLPolicy(max_age=100)
+    assert policy(req, req.session).total_seconds() == 60
+
+
+@pytest.mark.parametrize("session_backend_config", [DictCache, RedisCache])
+async def test_resume_session(app: App, session_backend_config):
+    inits = []
+
+    @app.entry_screen("index")
+    class Index(Screen):
+        actions = [Action("Pay", screen="pay"), Action("Help", screen="help")]
+
+    @app.screen("pay")
+    class Pay(Screen):
+        class Meta:
+            restore_sessions = True
+
+        actions = [Action("Confirm", screen="done")]
+
+        def render(self):
+            self.print("Pay")
+
+    @app.screen("help")
+    class Help(Pay):
+        class Meta:
+            restore_sessions = "prompt"
+
+        def init(self, inpt):
+            inits.append(self.state.get("topic"))
+            self.state.topic = "billing"
+
+        def render(self):
+            self.print("Help")
+
+    @app.screen("done")
+    class Done(Screen):
+        def render(self):
+            self.print("Done")
+            return self.END
+
+    await app(Request("123", session_id="1"))
+    await app(Request("123", ussd_string="1", session_id="1"))
+    res = await app(Request("123", session_id="2"))
+    assert res.startswith("CON Pay")
+
+    res = await app(Request("123", ussd_string="1", session_id="2"))
+    assert res.startswith("END Done")
+    assert len(await app.session_backend.keys()) == 2
+    res = await app(Request("123", session_id="3"))
+    assert not res.startswith("CON Pay")
+
+    await app(Request("123", ussd_string="2", session_id="3"))
+    res = await app(Request("123", session_id="4"))
+    assert res.startswith("CON Continue where you left off?")
+    res = await app(Request("123", ussd_string="1", session_id="4"))
+    assert res.startswith("CON Help") and inits == [None, "billing"]
+
+    res = await app(Request("123", session_id="5"))
+    assert res.startswith("CON Continue where you left off?")
+    res = await app(req := Request("123", ussd_string="2", session_id="5"))
+    assert res.startswith("CON 1  Pay")
+    assert RESUME_STATE not in req.session.data and inits == [None, "billing"]
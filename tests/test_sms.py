@@ -0,0 +1,127 @@
+import asyncio
+import time
+
+from mobilex import App, Request
+from mobilex.ratelimit import TokenBucket
+from mobilex.screens import Screen
+from mobilex.sms import FakeProvider, InboundSms, SmsRouter, Status
+
+
+def make_app(**provider_options):
+    return App(
+        session_backend="dict",
+        sms_provider=FakeProvider,
+        sms_provider_options=provider_options,
+        sms_batch_size=3,
+        sms_flush_interval=0.01,
+        sms_max_retries=1,
+    )
+
+
+async def test_outbox_batches():
+    app = make_app()
+
+    @app.entry_screen("index")
+    class Index(Screen):
+        def render(self):
+            self.state.sms = self.send_sms("Receipt: paid 100")
+            self.print("Paid")
+            return self.END
+
+    await app(req := Request("123", session_id="1"))
+    ids = [app.send_sms(f"{i}", f"Hi {i}") for i in range(4)]
+    assert len(app.outbox) == 5 and await app.outbox.status(ids[0]) is None
+
+    await app.outbox.flush()
+    provider = app.sms_provider
+    assert [len(b) for b in provider.batches] == [3, 2]
+    assert provider.batches[0][0].to == "123"
+
+    msg_id = req.session.state.sms
+    status = await app.outbox.status(msg_id)
+    assert status["status"] == Status.SENT
+
+    report = provider.report(status["provider_id"])
+    assert await app.handle_delivery_report(report) == msg_id
+    assert (await app.outbox.status(msg_id))["status"] == Status.DELIVERED
+
+
+async def test_outbox_retries():
+    app = make_app(fail=["1"], flaky=["2", "3"])
+    app.outbox.retry_backoff = 0.01
+    ids = [app.send_sms(to, "Hi") for to in "123"]
+    await app.outbox.flush()
+    assert (await app.outbox.status(ids[0]))["status"] == Status.FAILED
+    assert await app.outbox.status(ids[1]) is None
+
+    await asyncio.sleep(0.05)
+    await app.outbox.flush()
+    assert (await app.outbox.status(ids[1]))["status"] == Status.SENT
+    assert [len(b) for b in app.sms_provider.batches] == [3, 2]
+    await app.outbox.close()
+
+
+async def test_sms_router():
+    app = make_app()
+    router = app.sms_router
+
+    @app.sms_keyword("BAL", "balance")
+    async def balance(app, msg, args):
+        return f"Your balance is 100 {' '.join(args)}".strip()
+
+    @router.default
+    def fallback(app, msg, args):
+        return None if msg.text == "ignore" else f"Unknown: {args}"
+
+    assert await router(app, InboundSms("123", "bal KES")) == "Your balance is 100 KES"
+    assert await router(app, InboundSms("123", "Balance")) == "Your balance is 100"
+    assert (
+        await router(app, InboundSms("123", "hi there")) == "Unknown: ['hi', 'there']"
+    )
+    assert await app.handle_sms(InboundSms("123", "ignore")) is None
+
+    assert await SmsRouter()(app, InboundSms("123", "hi")) is None
+    reply = await app.handle_sms(InboundSms("123", "bal", to="4040"))
+    await app.outbox.flush()
+    assert app.sms_provider.batches[0][0].sender == "4040"
+    assert (await app.outbox.status(reply))["status"] == Status.SENT
+
+
+async def test_TokenBucket():
+    bucket = TokenBucket(100, 5)
+    assert all(bucket.consume() for _ in range(5)) and not bucket.consume()
+    start = time.monotonic()
+    await bucket.acquire(5)
+    assert 0.03 < time.monotonic() - start < 0.5
+
+
+class LossyProvider(FakeProvider):
+    async def send_batch(self, messages):
+        return (await super().send_batch(messages))[:-1]
+
+
+async def test_outbox_unmatched_and_closed():
+    app = make_app()
+    app.__dict__["sms_provider"] = LossyProvider(flaky=["1"])
+    app.outbox.retry_backoff = 10
+    ids = [app.send_sms(to, "Hi") for to in "123"]
+    await app.outbox.flush()
+    assert (await app.outbox.status(ids[1]))["status"] == Status.SENT
+    assert (await app.outbox.status(ids[2]))["status"] == Status.FAILED
+
+    assert await app.outbox.status(ids[0]) is None
+    await app.outbox.close()
+    assert (await app.outbox.status(ids[0]))["status"] == Status.FAILED
+
+
+async def test_shutdown_sends_queued():
+    app = make_app(flaky=["2"])
+    app.outbox.flush_interval, app.outbox.retry_backoff = 10, 10
+    ids = [app.send_sms(to, "Hi") for to in "12"]
+    await asyncio.sleep(0)
+    provider, outbox, cache = app.sms_provider, app.outbox, app.cache
+    assert not provider.batches and len(outbox) == 2
+
+    await app.shutdown()
+    assert [m.to for m in provider.batches[0]] == ["1", "2"]
+    assert not outbox._retries and "cache" not in app.__dict__
@@ -0,0 +1,55 @@
+from unittest.mock import patch
+
+from mobilex import App, Request
+from mobilex.screens import Screen
+from mobilex.subscribers import Subscriber, SubscriberService
+
+
+async def test_msisdn_normalization():
+    app = App(session_backend="dict", msisdn_region="KE")
+
+    @app.entry_screen("index")
+    class Index(Screen):
+        def render(self):
+            self.print("Visits", self.session.get("visits", 0))
+            self.session["visits"] = self.session.get("visits", 0) + 1
+
+    for msisdn in ("+254712345678", "254712345678", "0712345678"):
+        await app(req := Request(msisdn))
+        assert req.msisdn == "254712345678"
+    assert req.session["visits"] == 3
+    await app(req := Request("12345"))
+    assert req.msisdn == "12345"
+
+
+async def test_msisdn_region_required(caplog):
+    await App(session_backend="dict", msisdn_region="KE").startup()
+    assert "msisdn_region" not in caplog.text
+
+    app = App(session_backend="dict")
+    app.entry_screen("index", Screen)
+    await app.startup()
+    assert "msisdn_region is not set" in caplog.text
+    await app(req := Request("0712345678"))
+    assert req.msisdn == "0712345678"
+
+
+async def test_subscriber_service():
+    app = App(session_backend="dict", subscriber_languages={"KE": "sw"})
+    app.entry_screen("index", Screen)
+    service = app.subscriber_service
+
+    with patch.object(service, "lookup", wraps=service.lookup) as lookup:
+        await app(req := Request("+254712345678"))
+        sub = await req.get_subscriber()
+        assert sub == Subscriber("254712345678", "KE", "Safaricom", "sw")
+        assert await req.get_subscriber() is sub
+
+        await app(req := Request("254712345678"))
+        assert await req.get_subscriber() == sub
+        assert lookup.call_count == 1
+
+    assert await service.lookup("12345") == Subscriber("12345")
+    assert isinstance(
+        App(subscriber_service=service).subscriber_service, SubscriberService
+    )
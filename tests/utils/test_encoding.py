@@ -0,0 +1,46 @@
+from mobilex.screens import UssdPayload
+from mobilex.utils import encoding
+
+
+def test_lengths():
+    assert encoding.gsm7_length("Hello @ £5") == 10
+    assert encoding.gsm7_length("[x]€") == 7
+    assert encoding.gsm7_length("“x”") is None
+    assert encoding.ucs2_length("ok😀") == 4
+    assert encoding.ussd_length("abc") == 3
+    assert encoding.ussd_length("“abc”") == 12
+    assert encoding.detect_encoding("abc") == encoding.GSM7
+    assert encoding.detect_encoding("abc😀") == encoding.UCS2
+
+
+def test_fit():
+    assert encoding.fit("a" * 100, 20) == 20
+    assert encoding.fit("a" * 100, 20, "b" * 5) == 15
+    assert encoding.fit("[" * 100, 20) == 10
+    assert encoding.fit("“" + "a" * 100, 182) == 79
+    assert encoding.fit("a" * 50 + "“" + "a" * 100, 182) == 79
+    assert encoding.fit("a" * 100 + "“", 90) == 90
+
+
+def test_transliterate():
+    assert encoding.transliterate("plain") == "plain"
+    assert encoding.transliterate("“Habari” — ’ndugu…") == '"Habari" - \'ndugu...'
+    assert encoding.transliterate("Ĉu ŝi?") == "Cu si?"
+    assert encoding.transliterate("Bei 😀") == "Bei 😀"
+
+
+def test_paginate_encoding():
+    lines = [f"{i}. Bidhaa nzuri" for i in range(1, 21)]
+
+    payload = UssdPayload("\n".join(lines))
+    pages = list(payload.paginate(182, "99 More", "0 Back"))
+    assert all(encoding.ussd_length(p) <= 182 for p in pages)
+
+    payload = UssdPayload("\n".join(f"{s} “x”" for s in lines))
+    wide = list(payload.paginate(182, "99 More", "0 Back"))
+    assert len(wide) > len(pages)
+    assert all(encoding.ussd_length(p) <= 182 for p in wide)
+
+    narrow = list(payload.paginate(182, "99 More", "0 Back", transliterate=True))
+    assert all(encoding.is_gsm7(p) and len(p) <= 182 for p in narrow)
+    assert len(narrow) < len(wide)